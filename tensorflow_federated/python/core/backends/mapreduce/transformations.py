@@ -892,13 +892,8 @@ def _prepare_for_rebinding(comp):
 
 def _check_for_missed_binding(comp, newly_bound_lambda):
   """Raises if `newly_bound_lambda` has unbound references not in `comp`."""
-  # TODO(b/135608876): Consider whether this pattern is sufficiently pervasive
-  # to warrant symbol other than `get_map_of_unbound_references`, even if it
-  # has the same underlying implementation.
-  unbound_references_in_comp = transformation_utils.get_map_of_unbound_references(
-      comp)[comp]
-  new_lambda_unbound = transformation_utils.get_map_of_unbound_references(
-      newly_bound_lambda)[newly_bound_lambda]
+  unbound_references_in_comp = comp.unbound_references
+  new_lambda_unbound = newly_bound_lambda.unbound_references
   newly_unbound_references = new_lambda_unbound.difference(
       unbound_references_in_comp)
   if newly_unbound_references:
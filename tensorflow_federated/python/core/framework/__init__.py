@@ -13,6 +13,7 @@
 # limitations under the License.
 """Libraries for extending the TensorFlow Federated core library."""
 
+from tensorflow_federated.python.core.impl.computation_impl import mark_associative
 from tensorflow_federated.python.core.impl.computation_serialization import deserialize_computation
 from tensorflow_federated.python.core.impl.computation_serialization import serialize_computation
 from tensorflow_federated.python.core.impl.context_stack.context_base import Context
@@ -40,6 +41,7 @@ from tensorflow_federated.python.core.impl.executors.federating_executor import
 from tensorflow_federated.python.core.impl.executors.reference_resolving_executor import ReferenceResolvingExecutor
 from tensorflow_federated.python.core.impl.executors.remote_executor import RemoteExecutor
 from tensorflow_federated.python.core.impl.executors.thread_delegating_executor import ThreadDelegatingExecutor
+from tensorflow_federated.python.core.impl.executors.thread_delegating_executor import WorkerPool
 from tensorflow_federated.python.core.impl.executors.transforming_executor import TransformingExecutor
 from tensorflow_federated.python.core.impl.tree_to_cc_transformations import TFParser
 from tensorflow_federated.python.core.impl.types.type_analysis import contains as type_contains
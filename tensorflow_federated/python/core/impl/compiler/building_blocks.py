@@ -15,7 +15,10 @@
 
 import abc
 import enum
-from typing import Any, Iterable, List, Optional, Tuple, Type
+import hashlib
+import itertools
+from typing import (Any, Callable, FrozenSet, Iterable, List, Optional, Tuple,
+                    Type)
 import zlib
 
 from tensorflow_federated.proto.v0 import computation_pb2 as pb
@@ -29,6 +32,52 @@ from tensorflow_federated.python.core.impl.types import type_analysis
 from tensorflow_federated.python.core.impl.types import type_serialization
 
 
+_FINGERPRINT_SIZE = 32
+
+
+def _get_fingerprint(kind: str, *parts) -> bytes:
+  """Returns a digest of `kind` and `parts`.
+
+  Each of `parts` is length-prefixed before it is hashed, so that different
+  sequences of parts never produce the same input to the hash function.
+
+  Args:
+    kind: A string identifying the kind of the building block.
+    *parts: Instances of `bytes`, `str`, or `None`.
+  """
+  digest = hashlib.blake2b(kind.encode('utf-8'), digest_size=_FINGERPRINT_SIZE)
+  for part in parts:
+    if part is None:
+      digest.update(b'N')
+      continue
+    if isinstance(part, str):
+      digest.update(b'S')
+      part = part.encode('utf-8')
+    else:
+      digest.update(b'B')
+    digest.update(len(part).to_bytes(8, 'little'))
+    digest.update(part)
+  return digest.digest()
+
+
+def get_children(
+    comp: 'ComputationBuildingBlock') -> List['ComputationBuildingBlock']:
+  """Returns the children of `comp`, in the order they are traversed."""
+  if comp.is_selection():
+    return [comp.source]
+  elif comp.is_struct():
+    return [value for _, value in structure.iter_elements(comp)]
+  elif comp.is_call():
+    if comp.argument is not None:
+      return [comp.function, comp.argument]
+    return [comp.function]
+  elif comp.is_lambda():
+    return [comp.result]
+  elif comp.is_block():
+    return [value for _, value in comp.locals] + [comp.result]
+  return []
+
+
 def _check_computation_oneof(
     computation_proto: pb.Computation,
     expected_computation_oneof: Optional[str],
@@ -112,6 +161,9 @@ class ComputationBuildingBlock(typed_object.TypedObject, metaclass=abc.ABCMeta):
     self._type_signature = type_signature
     self._cached_hash = None
     self._cached_proto = None
+    self._cached_fingerprint = None
+    self._cached_unbound_references = None
+    self._cached_variable_names = None
 
   @property
   def type_signature(self) -> computation_types.Type:
@@ -231,8 +283,95 @@ class ComputationBuildingBlock(typed_object.TypedObject, metaclass=abc.ABCMeta):
     """Uncached, internal version of `proto`."""
     raise NotImplementedError
 
-  # TODO(b/113112885): Add memoization after identifying a suitable externally
-  # available standard library that works in Python 2/3.
+  @property
+  def fingerprint(self) -> bytes:
+    """Returns a digest of the structure of this building block.
+
+    The fingerprint is a Merkle hash over the tree rooted at this building
+    block: the fingerprint of a building block is computed from its kind, its
+    type signature, its own attributes, and the fingerprints of its children,
+    such that building blocks with the same fingerprint serialize to the same
+    `pb.Computation`. Since the fingerprints of the children are memoized,
+    computing the fingerprints of all the building blocks in a tree takes time
+    linear in the size of the tree, and once computed, the fingerprint is
+    returned in constant time. The fingerprints are computed bottom-up, like
+    `unbound_references`, so the depth of the tree is not limited by the Python
+    recursion limit.
+    """
+    return self._get_cached_analysis('_cached_fingerprint',
+                                     lambda comp: comp._fingerprint())
+
+  def _fingerprint(self) -> bytes:
+    """Uncached, internal version of `fingerprint`."""
+    return _get_fingerprint(
+        type(self).__name__,
+        self.proto.SerializeToString(deterministic=True))
+
+  def _get_cached_analysis(
+      self, cache_attr: str,
+      analyze_fn: Callable[['ComputationBuildingBlock'], Any]) -> Any:
+    """Returns the analysis cached in `cache_attr`, computing it if needed.
+
+    The analysis is computed bottom-up by `analyze_fn`, which may assume that
+    the analysis of the children of its argument is already cached. Only the
+    building blocks whose analysis is not yet cached are visited, using an
+    explicit stack rather than recursion, so arbitrarily deep trees can be
+    analyzed.
+
+    Args:
+      cache_attr: The name of the attribute caching the analysis.
+      analyze_fn: A function computing the analysis of a building block.
+    """
+    stack = [(self, False)]
+    while stack:
+      comp, children_analyzed = stack.pop()
+      if getattr(comp, cache_attr) is not None:
+        continue
+      if children_analyzed:
+        setattr(comp, cache_attr, analyze_fn(comp))
+      else:
+        stack.append((comp, True))
+        stack.extend((child, False) for child in get_children(comp))
+    return getattr(self, cache_attr)
+
+  @property
+  def unbound_references(self) -> FrozenSet[str]:
+    """Returns the names of the references unbound in this building block.
+
+    Building blocks are immutable, so this is computed at most once for each
+    building block, from the cached results of its children. A transformation
+    which rewrites a subtree constructs new building blocks only for the
+    rewritten subtree and its ancestors, so the results cached on the
+    unmodified subtrees are reused.
+    """
+    return self._get_cached_analysis('_cached_unbound_references',
+                                     lambda comp: comp._unbound_references())
+
+  def _unbound_references(self) -> FrozenSet[str]:
+    """Uncached, internal version of `unbound_references`."""
+    return frozenset(
+        itertools.chain.from_iterable(
+            child.unbound_references for child in get_children(self)))
+
+  @property
+  def variable_names(self) -> FrozenSet[str]:
+    """Returns the variable names bound or referred to in this building block.
+
+    Like `unbound_references`, this is computed at most once for each building
+    block, from the cached results of its children.
+    """
+    return self._get_cached_analysis('_cached_variable_names',
+                                     lambda comp: comp._variable_names())
+
+  def _variable_names(self) -> FrozenSet[str]:
+    """Uncached, internal version of `variable_names`."""
+    return frozenset(
+        itertools.chain.from_iterable(
+            child.variable_names for child in get_children(self)))
+
+  def _type_signature_bytes(self) -> bytes:
+    return type_serialization.serialize_type(
+        self.type_signature).SerializeToString(deterministic=True)
 
   @abc.abstractmethod
   def __repr__(self):
@@ -245,7 +384,7 @@ class ComputationBuildingBlock(typed_object.TypedObject, metaclass=abc.ABCMeta):
 
   def __hash__(self):
     if self._cached_hash is None:
-      self._cached_hash = hash(self.proto.SerializeToString(deterministic=True))
+      self._cached_hash = hash(self.fingerprint)
     return self._cached_hash
 
 
@@ -298,6 +437,12 @@ class Reference(ComputationBuildingBlock):
         type=type_serialization.serialize_type(self.type_signature),
         reference=pb.Reference(name=self._name))
 
+  def _unbound_references(self) -> FrozenSet[str]:
+    return frozenset((self._name,))
+
+  def _variable_names(self) -> FrozenSet[str]:
+    return frozenset((self._name,))
+
   def is_reference(self):
     return True
 
@@ -401,6 +546,11 @@ class Selection(ComputationBuildingBlock):
         type=type_serialization.serialize_type(self.type_signature),
         selection=selection)
 
+  def _fingerprint(self) -> bytes:
+    index = str(self._index) if self._index is not None else None
+    return _get_fingerprint('Selection', self._type_signature_bytes(),
+                            self._source.fingerprint, self._name, index)
+
   def is_selection(self):
     return True
 
@@ -501,6 +651,12 @@ class Struct(ComputationBuildingBlock, structure.Struct):
         type=type_serialization.serialize_type(self.type_signature),
         struct=pb.Struct(element=elements))
 
+  def _fingerprint(self) -> bytes:
+    parts = [self._type_signature_bytes()]
+    for k, v in structure.iter_elements(self):
+      parts.extend([k, v.fingerprint])
+    return _get_fingerprint('Struct', *parts)
+
   def is_struct(self):
     return True
 
@@ -588,6 +744,14 @@ class Call(ComputationBuildingBlock):
     return pb.Computation(
         type=type_serialization.serialize_type(self.type_signature), call=call)
 
+  def _fingerprint(self) -> bytes:
+    if self._argument is not None:
+      argument_fingerprint = self._argument.fingerprint
+    else:
+      argument_fingerprint = None
+    return _get_fingerprint('Call', self._type_signature_bytes(),
+                            self._function.fingerprint, argument_fingerprint)
+
   def is_call(self):
     return True
 
@@ -677,6 +841,18 @@ class Lambda(ComputationBuildingBlock):
     # https://developers.google.com/protocol-buffers/docs/reference/python-generated#keyword-conflicts
     return pb.Computation(type=type_signature, **{'lambda': fn})  # pytype: disable=wrong-keyword-args
 
+  def _fingerprint(self) -> bytes:
+    return _get_fingerprint('Lambda', self._type_signature_bytes(),
+                            self._parameter_name, self._result.fingerprint)
+
+  def _unbound_references(self) -> FrozenSet[str]:
+    return self._result.unbound_references - {self._parameter_name}
+
+  def _variable_names(self) -> FrozenSet[str]:
+    if self._parameter_type is None:
+      return self._result.variable_names
+    return self._result.variable_names | {self._parameter_name}
+
   def is_lambda(self):
     return True
 
@@ -797,6 +973,26 @@ class Block(ComputationBuildingBlock):
                 'result': self._result.proto
             }))
 
+  def _fingerprint(self) -> bytes:
+    parts = [self._type_signature_bytes()]
+    for k, v in self._locals:
+      parts.extend([k, v.fingerprint])
+    parts.append(self._result.fingerprint)
+    return _get_fingerprint('Block', *parts)
+
+  def _unbound_references(self) -> FrozenSet[str]:
+    # Each local may refer to the locals bound before it.
+    references = set()
+    names = set()
+    for name, value in self._locals:
+      references.update(value.unbound_references - names)
+      names.add(name)
+    references.update(self._result.unbound_references - names)
+    return frozenset(references)
+
+  def _variable_names(self) -> FrozenSet[str]:
+    return super()._variable_names() | {name for name, _ in self._locals}
+
   def is_block(self):
     return True
 
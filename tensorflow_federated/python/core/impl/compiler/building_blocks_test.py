@@ -12,6 +12,8 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import sys
+
 from absl.testing import absltest
 import tensorflow as tf
 
@@ -343,6 +345,114 @@ class ComputationBuildingBlocksTest(absltest.TestCase):
     target.type_signature.check_assignable_from(deserialized.type_signature)
 
 
+class FingerprintTest(absltest.TestCase):
+
+  def _create_lambda(self, parameter_name='x', constant=1):
+    ref = building_blocks.Reference(parameter_name, tf.int32)
+    data = building_blocks.Data('data_{}'.format(constant), tf.int32)
+    struct = building_blocks.Struct([('a', ref), data])
+    block = building_blocks.Block([('y', struct)],
+                                  building_blocks.Selection(struct, index=0))
+    return building_blocks.Lambda(parameter_name, tf.int32, block)
+
+  def test_equal_trees_have_equal_fingerprints(self):
+    comp = self._create_lambda()
+    other_comp = self._create_lambda()
+    self.assertEqual(comp.fingerprint, other_comp.fingerprint)
+    self.assertEqual(hash(comp), hash(other_comp))
+
+  def test_deserialized_tree_has_equal_fingerprint(self):
+    comp = self._create_lambda()
+    deserialized = building_blocks.ComputationBuildingBlock.from_proto(
+        comp.proto)
+    self.assertEqual(comp.fingerprint, deserialized.fingerprint)
+
+  def test_different_trees_have_different_fingerprints(self):
+    comp = self._create_lambda()
+    self.assertNotEqual(comp.fingerprint,
+                        self._create_lambda(parameter_name='z').fingerprint)
+    self.assertNotEqual(comp.fingerprint,
+                        self._create_lambda(constant=2).fingerprint)
+    self.assertNotEqual(comp.fingerprint, comp.result.fingerprint)
+
+  def test_selection_by_name_and_index_have_different_fingerprints(self):
+    ref = building_blocks.Reference('x', [('a', tf.int32), ('b', tf.int32)])
+    by_name = building_blocks.Selection(ref, name='a')
+    by_index = building_blocks.Selection(ref, index=0)
+    self.assertNotEqual(by_name.fingerprint, by_index.fingerprint)
+
+  def test_fingerprint_is_memoized(self):
+    comp = self._create_lambda()
+    fingerprint = comp.fingerprint
+    self.assertIs(comp.fingerprint, fingerprint)
+
+  def test_fingerprint_handles_tree_deeper_than_recursion_limit(self):
+    comp = building_blocks.Data('data', tf.int32)
+    other_comp = building_blocks.Data('data', tf.int32)
+    for _ in range(2 * sys.getrecursionlimit()):
+      comp = building_blocks.Block([('x', comp)], comp)
+      other_comp = building_blocks.Block([('x', other_comp)], other_comp)
+    self.assertEqual(comp.fingerprint, other_comp.fingerprint)
+
+
+class CachedAnalysisTest(absltest.TestCase):
+
+  def test_unbound_references_excludes_bound_names(self):
+    x_ref = building_blocks.Reference('x', tf.int32)
+    y_ref = building_blocks.Reference('y', tf.int32)
+    z_ref = building_blocks.Reference('z', tf.int32)
+    block = building_blocks.Block([('y', x_ref), ('w', y_ref)],
+                                  building_blocks.Struct([y_ref, z_ref]))
+    fn = building_blocks.Lambda('x', tf.int32, block)
+
+    self.assertEqual(block.unbound_references, frozenset(['x', 'z']))
+    self.assertEqual(fn.unbound_references, frozenset(['z']))
+
+  def test_unbound_references_of_local_includes_later_locals(self):
+    y_ref = building_blocks.Reference('y', tf.int32)
+    data = building_blocks.Data('data', tf.int32)
+    block = building_blocks.Block([('x', y_ref), ('y', data)], data)
+
+    self.assertEqual(block.unbound_references, frozenset(['y']))
+
+  def test_variable_names_includes_bound_and_referenced_names(self):
+    z_ref = building_blocks.Reference('z', tf.int32)
+    data = building_blocks.Data('data', tf.int32)
+    block = building_blocks.Block([('y', data)], z_ref)
+    fn = building_blocks.Lambda('x', tf.int32, block)
+    no_arg_fn = building_blocks.Lambda(None, None, data)
+
+    self.assertEqual(fn.variable_names, frozenset(['x', 'y', 'z']))
+    self.assertEmpty(no_arg_fn.variable_names)
+
+  def test_analysis_is_reused_by_new_parents(self):
+    x_ref = building_blocks.Reference('x', tf.int32)
+    struct = building_blocks.Struct([x_ref, x_ref])
+    unbound_references = struct.unbound_references
+
+    fn = building_blocks.Lambda('x', tf.int32, struct)
+    selection = building_blocks.Selection(struct, index=0)
+
+    self.assertEmpty(fn.unbound_references)
+    self.assertEqual(selection.unbound_references, frozenset(['x']))
+    self.assertIs(struct.unbound_references, unbound_references)
+
+
+class GetChildrenTest(absltest.TestCase):
+
+  def test_returns_children_in_traversal_order(self):
+    x_ref = building_blocks.Reference('x', tf.int32)
+    data = building_blocks.Data('data', tf.int32)
+    block = building_blocks.Block([('y', data)], x_ref)
+    fn = building_blocks.Lambda('x', tf.int32, block)
+    call = building_blocks.Call(fn, data)
+
+    self.assertEqual(building_blocks.get_children(call), [fn, data])
+    self.assertEqual(building_blocks.get_children(fn), [block])
+    self.assertEqual(building_blocks.get_children(block), [data, x_ref])
+    self.assertEmpty(building_blocks.get_children(x_ref))
+
+
 class RepresentationTest(absltest.TestCase):
 
   def test_returns_string_for_block(self):
@@ -0,0 +1,197 @@
+# Copyright 2020, The TensorFlow Federated Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""A persistent, content-addressed cache of compiled computations."""
+
+import hashlib
+import os
+import tempfile
+import threading
+from typing import Optional
+
+from absl import logging
+
+from google.protobuf import message
+from tensorflow_federated import version
+from tensorflow_federated.proto.v0 import computation_pb2 as pb
+from tensorflow_federated.python.common_libs import py_typecheck
+
+_ENTRY_SUFFIX = '.pb'
+
+
+class PersistentCompilationCache(object):
+  """A size-bounded cache of compiled `pb.Computation`s stored on disk.
+
+  Entries are addressed by a digest of the deterministically serialized
+  computation to compile and the identity of the compiler, such that the same
+  cache directory can be shared by processes (for example, workers or notebook
+  sessions) which compile the same computations.
+
+  Entries are written atomically, by writing to a temporary file in the cache
+  directory and renaming it into place, so concurrent readers never observe a
+  partially written entry. When the total size of the entries exceeds
+  `max_size_bytes`, the least recently used entries are evicted, where the
+  recency of an entry is tracked by its modification time.
+
+  Note: The identity of the compiler should change whenever the output of the
+  compiler could change (for example, when upgrading TFF), otherwise stale
+  entries will be returned.
+  """
+
+  def __init__(self, cache_dir: str, max_size_bytes: int = 1 << 30):
+    """Creates a `PersistentCompilationCache`.
+
+    Args:
+      cache_dir: The path of the directory to store the entries in; created if
+        it does not exist.
+      max_size_bytes: The maximum total size in bytes of the entries in
+        `cache_dir`.
+
+    Raises:
+      TypeError: If the arguments are of the wrong types.
+      ValueError: If `max_size_bytes` is not positive.
+    """
+    py_typecheck.check_type(cache_dir, str)
+    py_typecheck.check_type(max_size_bytes, int)
+    if max_size_bytes < 1:
+      raise ValueError('Expected a positive `max_size_bytes`, found {}.'.format(
+          max_size_bytes))
+    os.makedirs(cache_dir, exist_ok=True)
+    self._cache_dir = cache_dir
+    self._max_size_bytes = max_size_bytes
+    self._lock = threading.Lock()
+    self._hits = 0
+    self._misses = 0
+    self._evictions = 0
+
+  @property
+  def hits(self) -> int:
+    return self._hits
+
+  @property
+  def misses(self) -> int:
+    return self._misses
+
+  @property
+  def evictions(self) -> int:
+    return self._evictions
+
+  @property
+  def size_bytes(self) -> int:
+    """Returns the total size in bytes of the entries in the cache."""
+    return sum(size for _, size, _ in self._list_entries())
+
+  @staticmethod
+  def get_key(computation_proto: pb.Computation, compiler_id: str) -> str:
+    """Returns the key of `computation_proto` compiled by `compiler_id`.
+
+    The key also depends on the version of TFF, so that entries written by
+    other versions of TFF are never returned.
+
+    Args:
+      computation_proto: The `pb.Computation` to compile.
+      compiler_id: A string identifying the compiler.
+    """
+    py_typecheck.check_type(computation_proto, pb.Computation)
+    py_typecheck.check_type(compiler_id, str)
+    digest = hashlib.sha256()
+    digest.update(version.__version__.encode('utf-8'))
+    digest.update(b'\0')
+    digest.update(compiler_id.encode('utf-8'))
+    digest.update(b'\0')
+    digest.update(computation_proto.SerializeToString(deterministic=True))
+    return digest.hexdigest()
+
+  def _get_path(self, key: str) -> str:
+    return os.path.join(self._cache_dir, key + _ENTRY_SUFFIX)
+
+  def _list_entries(self):
+    """Returns a list of `(mtime, size, path)` for each entry in the cache."""
+    entries = []
+    for filename in os.listdir(self._cache_dir):
+      if not filename.endswith(_ENTRY_SUFFIX):
+        continue
+      path = os.path.join(self._cache_dir, filename)
+      try:
+        stat = os.stat(path)
+      except FileNotFoundError:
+        # The entry was evicted concurrently.
+        continue
+      entries.append((stat.st_mtime, stat.st_size, path))
+    return entries
+
+  def get(self, key: str) -> Optional[pb.Computation]:
+    """Returns the compiled `pb.Computation` for `key`, or `None` if absent."""
+    path = self._get_path(key)
+    try:
+      with open(path, 'rb') as f:
+        data = f.read()
+    except FileNotFoundError:
+      with self._lock:
+        self._misses += 1
+      return None
+    computation_proto = pb.Computation()
+    try:
+      computation_proto.ParseFromString(data)
+    except message.DecodeError:
+      logging.warning('Removing corrupt compilation cache entry %s.', path)
+      try:
+        os.remove(path)
+      except FileNotFoundError:
+        pass
+      with self._lock:
+        self._misses += 1
+      return None
+    try:
+      os.utime(path)
+    except FileNotFoundError:
+      pass
+    with self._lock:
+      self._hits += 1
+    return computation_proto
+
+  def put(self, key: str, computation_proto: pb.Computation):
+    """Stores the compiled `computation_proto` for `key` in the cache."""
+    py_typecheck.check_type(computation_proto, pb.Computation)
+    data = computation_proto.SerializeToString(deterministic=True)
+    if len(data) > self._max_size_bytes:
+      logging.debug(
+          'Not caching compiled computation of %d bytes, which exceeds the '
+          'maximum cache size of %d bytes.', len(data), self._max_size_bytes)
+      return
+    fd, temp_path = tempfile.mkstemp(dir=self._cache_dir, suffix='.tmp')
+    try:
+      with os.fdopen(fd, 'wb') as f:
+        f.write(data)
+      os.replace(temp_path, self._get_path(key))
+    finally:
+      if os.path.exists(temp_path):
+        os.remove(temp_path)
+    self._evict()
+
+  def _evict(self):
+    """Evicts the least recently used entries until the cache fits."""
+    entries = sorted(self._list_entries())
+    total_size = sum(size for _, size, _ in entries)
+    for _, size, path in entries:
+      if total_size <= self._max_size_bytes:
+        break
+      try:
+        os.remove(path)
+      except FileNotFoundError:
+        # The entry was evicted concurrently.
+        pass
+      else:
+        with self._lock:
+          self._evictions += 1
+      total_size -= size
@@ -0,0 +1,150 @@
+# Copyright 2020, The TensorFlow Federated Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import os
+from unittest import mock
+
+from absl.testing import absltest
+import tensorflow as tf
+
+from tensorflow_federated.python.core.api import computation_types
+from tensorflow_federated.python.core.impl.compiler import compilation_cache
+from tensorflow_federated.python.core.impl.compiler import tensorflow_computation_factory
+
+
+def _create_computation(value):
+  proto, _ = tensorflow_computation_factory.create_constant(
+      value, computation_types.TensorType(tf.int32))
+  return proto
+
+
+class PersistentCompilationCacheTest(absltest.TestCase):
+
+  def test_get_key_is_deterministic(self):
+    proto = _create_computation(1)
+
+    key_1 = compilation_cache.PersistentCompilationCache.get_key(proto, 'a')
+    key_2 = compilation_cache.PersistentCompilationCache.get_key(proto, 'a')
+
+    self.assertEqual(key_1, key_2)
+
+  def test_get_key_depends_on_compiler_id(self):
+    proto = _create_computation(1)
+
+    key_1 = compilation_cache.PersistentCompilationCache.get_key(proto, 'a')
+    key_2 = compilation_cache.PersistentCompilationCache.get_key(proto, 'b')
+
+    self.assertNotEqual(key_1, key_2)
+
+  def test_get_key_depends_on_tff_version(self):
+    proto = _create_computation(1)
+
+    key_1 = compilation_cache.PersistentCompilationCache.get_key(proto, 'a')
+    with mock.patch.object(compilation_cache.version, '__version__',
+                           'other_version'):
+      key_2 = compilation_cache.PersistentCompilationCache.get_key(proto, 'a')
+
+    self.assertNotEqual(key_1, key_2)
+
+  def test_get_key_depends_on_computation(self):
+    key_1 = compilation_cache.PersistentCompilationCache.get_key(
+        _create_computation(1), 'a')
+    key_2 = compilation_cache.PersistentCompilationCache.get_key(
+        _create_computation(2), 'a')
+
+    self.assertNotEqual(key_1, key_2)
+
+  def test_get_returns_none_and_counts_miss(self):
+    cache = compilation_cache.PersistentCompilationCache(
+        self.create_tempdir().full_path)
+
+    self.assertIsNone(cache.get('missing'))
+    self.assertEqual(cache.hits, 0)
+    self.assertEqual(cache.misses, 1)
+
+  def test_put_and_get_returns_computation_and_counts_hit(self):
+    cache = compilation_cache.PersistentCompilationCache(
+        self.create_tempdir().full_path)
+    proto = _create_computation(1)
+
+    cache.put('key', proto)
+    result = cache.get('key')
+
+    self.assertEqual(result, proto)
+    self.assertEqual(cache.hits, 1)
+    self.assertEqual(cache.misses, 0)
+
+  def test_entries_are_shared_across_instances(self):
+    cache_dir = self.create_tempdir().full_path
+    proto = _create_computation(1)
+
+    compilation_cache.PersistentCompilationCache(cache_dir).put('key', proto)
+    result = compilation_cache.PersistentCompilationCache(cache_dir).get('key')
+
+    self.assertEqual(result, proto)
+
+  def test_put_leaves_no_temporary_files(self):
+    cache_dir = self.create_tempdir().full_path
+    cache = compilation_cache.PersistentCompilationCache(cache_dir)
+
+    cache.put('key', _create_computation(1))
+
+    self.assertEqual(os.listdir(cache_dir), ['key.pb'])
+
+  def test_put_evicts_least_recently_used_entries(self):
+    proto = _create_computation(1)
+    entry_size = len(proto.SerializeToString(deterministic=True))
+    cache_dir = self.create_tempdir().full_path
+    cache = compilation_cache.PersistentCompilationCache(
+        cache_dir, max_size_bytes=2 * entry_size)
+
+    cache.put('a', proto)
+    os.utime(os.path.join(cache_dir, 'a.pb'), (1, 1))
+    cache.put('b', proto)
+    os.utime(os.path.join(cache_dir, 'b.pb'), (2, 2))
+    cache.put('c', proto)
+
+    self.assertEqual(cache.evictions, 1)
+    self.assertLessEqual(cache.size_bytes, 2 * entry_size)
+    self.assertIsNone(cache.get('a'))
+    self.assertIsNotNone(cache.get('b'))
+    self.assertIsNotNone(cache.get('c'))
+
+  def test_put_does_not_store_computation_larger_than_cache(self):
+    cache = compilation_cache.PersistentCompilationCache(
+        self.create_tempdir().full_path, max_size_bytes=1)
+
+    cache.put('key', _create_computation(1))
+
+    self.assertIsNone(cache.get('key'))
+    self.assertEqual(cache.size_bytes, 0)
+
+  def test_get_removes_corrupt_entry(self):
+    cache_dir = self.create_tempdir().full_path
+    cache = compilation_cache.PersistentCompilationCache(cache_dir)
+    with open(os.path.join(cache_dir, 'key.pb'), 'wb') as f:
+      f.write(b'\xff\xff\xff')
+
+    self.assertIsNone(cache.get('key'))
+    self.assertEqual(cache.misses, 1)
+    self.assertEmpty(os.listdir(cache_dir))
+
+  def test_raises_value_error_with_non_positive_max_size_bytes(self):
+    with self.assertRaises(ValueError):
+      compilation_cache.PersistentCompilationCache(
+          self.create_tempdir().full_path, max_size_bytes=0)
+
+
+if __name__ == '__main__':
+  absltest.main()
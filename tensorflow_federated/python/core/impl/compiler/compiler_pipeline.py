@@ -14,10 +14,12 @@
 """A pipeline that reduces computations into an executable form."""
 import functools
 
-from typing import Callable, Any
+from typing import Callable, Any, Optional
 
 from tensorflow_federated.python.common_libs import py_typecheck
 from tensorflow_federated.python.core.api import computation_base
+from tensorflow_federated.python.core.impl import computation_impl
+from tensorflow_federated.python.core.impl.compiler import compilation_cache
 
 
 class CompilerPipeline(object):
@@ -34,16 +36,75 @@ class CompilerPipeline(object):
   backend takes the form of an instance of `tff.framework.Context`, which would
   be initialized with a `CompilerPipeline` whose `compilation_fn` accepts
   `tff.Computations` and returns CanonicalForms.
+
+  In addition to the in-process cache, the `CompilerPipeline` can optionally be
+  initialized with a `compilation_cache.PersistentCompilationCache`, in which
+  case artifacts which are instances of `computation_impl.ComputationImpl` are
+  also cached on disk and shared across processes.
   """
 
-  def __init__(self, compilation_fn: Callable[[computation_base.Computation],
-                                              Any]):
+  def __init__(self,
+               compilation_fn: Callable[[computation_base.Computation], Any],
+               persistent_cache: Optional[
+                   compilation_cache.PersistentCompilationCache] = None,
+               compiler_id: Optional[str] = None):
+    """Constructs a `CompilerPipeline`.
+
+    Args:
+      compilation_fn: A Python function that will be used to compile a
+        computation.
+      persistent_cache: An optional
+        `compilation_cache.PersistentCompilationCache` to look up and store
+        compiled computations in.
+      compiler_id: A string uniquely identifying `compilation_fn` (including
+        its version and configuration) in the `persistent_cache`. Required if
+        `persistent_cache` is specified, since the persistent cache is shared
+        across processes, where Python functions cannot be reliably told apart
+        by name.
+
+    Raises:
+      TypeError: If the arguments are of the wrong types.
+      ValueError: If `persistent_cache` is specified without a `compiler_id`.
+    """
     py_typecheck.check_callable(compilation_fn)
+    if persistent_cache is not None:
+      py_typecheck.check_type(persistent_cache,
+                              compilation_cache.PersistentCompilationCache)
+      if compiler_id is None:
+        raise ValueError(
+            'A `compiler_id` must be specified to use a persistent cache.')
+    if compiler_id is not None:
+      py_typecheck.check_type(compiler_id, str)
     self._compilation_fn = compilation_fn
+    self._persistent_cache = persistent_cache
+    self._compiler_id = compiler_id
+
+  @property
+  def persistent_cache(
+      self) -> Optional[compilation_cache.PersistentCompilationCache]:
+    return self._persistent_cache
 
   @functools.lru_cache()
   def compile(self, computation_to_compile: computation_base.Computation):
     """Generates executable for `computation_to_compile`."""
     py_typecheck.check_type(computation_to_compile,
                             computation_base.Computation)
-    return self._compilation_fn(computation_to_compile)
+    if self._persistent_cache is None or not isinstance(
+        computation_to_compile, computation_impl.ComputationImpl):
+      return self._compilation_fn(computation_to_compile)
+
+    key = self._persistent_cache.get_key(
+        computation_impl.ComputationImpl.get_proto(computation_to_compile),
+        self._compiler_id)
+    compiled_proto = self._persistent_cache.get(key)
+    if compiled_proto is not None:
+      # The compiled computation is bound to the same context stack as the
+      # computation it was compiled from.
+      return computation_impl.ComputationImpl(
+          compiled_proto,
+          computation_to_compile._context_stack)  # pylint: disable=protected-access
+    compiled = self._compilation_fn(computation_to_compile)
+    if isinstance(compiled, computation_impl.ComputationImpl):
+      self._persistent_cache.put(
+          key, computation_impl.ComputationImpl.get_proto(compiled))
+    return compiled
@@ -18,7 +18,11 @@ import tensorflow as tf
 from tensorflow_federated.python.core.api import computation_types
 from tensorflow_federated.python.core.api import computations
 from tensorflow_federated.python.core.api import intrinsics
+from tensorflow_federated.python.core.impl import computation_impl
+from tensorflow_federated.python.core.impl.compiler import compilation_cache
 from tensorflow_federated.python.core.impl.compiler import compiler_pipeline
+from tensorflow_federated.python.core.impl.context_stack import context_stack_impl
+from tensorflow_federated.python.core.impl.context_stack import context_stack_test_utils
 from tensorflow_federated.python.core.impl.types import placement_literals
 
 
@@ -48,6 +52,79 @@ class CompilerPipelineTest(absltest.TestCase):
 
     # TODO(b/113123410): Expand the test with more structural invariants.
 
+  def test_compile_computation_with_persistent_cache(self):
+
+    @computations.tf_computation(tf.int32)
+    def foo(x):
+      return x + 1
+
+    cache = compilation_cache.PersistentCompilationCache(
+        self.create_tempdir().full_path)
+    compile_count = []
+
+    def _compile(comp):
+      compile_count.append(comp)
+      return comp
+
+    compiled_foo = compiler_pipeline.CompilerPipeline(
+        _compile, persistent_cache=cache, compiler_id='test').compile(foo)
+    # A new pipeline does not share the in-process cache, so the compiled
+    # computation is loaded from the persistent cache.
+    cached_foo = compiler_pipeline.CompilerPipeline(
+        _compile, persistent_cache=cache, compiler_id='test').compile(foo)
+
+    self.assertLen(compile_count, 1)
+    self.assertEqual(cache.hits, 1)
+    self.assertEqual(cache.misses, 1)
+    self.assertEqual(
+        computation_impl.ComputationImpl.get_proto(compiled_foo),
+        computation_impl.ComputationImpl.get_proto(cached_foo))
+
+  def test_compile_computation_with_persistent_cache_keeps_context_stack(self):
+
+    @computations.tf_computation(tf.int32)
+    def foo(x):
+      return x + 1
+
+    context_stack = context_stack_impl.ContextStackImpl(
+        context_stack_test_utils.TestContext())
+    foo = computation_impl.ComputationImpl(
+        computation_impl.ComputationImpl.get_proto(foo), context_stack)
+    cache = compilation_cache.PersistentCompilationCache(
+        self.create_tempdir().full_path)
+
+    compiler_pipeline.CompilerPipeline(
+        lambda x: x, persistent_cache=cache, compiler_id='test').compile(foo)
+    cached_foo = compiler_pipeline.CompilerPipeline(
+        lambda x: x, persistent_cache=cache, compiler_id='test').compile(foo)
+
+    self.assertEqual(cache.hits, 1)
+    self.assertIs(cached_foo._context_stack, context_stack)  # pylint: disable=protected-access
+
+  def test_compile_computation_with_persistent_cache_and_new_compiler_id(self):
+
+    @computations.tf_computation(tf.int32)
+    def foo(x):
+      return x + 1
+
+    cache = compilation_cache.PersistentCompilationCache(
+        self.create_tempdir().full_path)
+
+    compiler_pipeline.CompilerPipeline(
+        lambda x: x, persistent_cache=cache, compiler_id='a').compile(foo)
+    compiler_pipeline.CompilerPipeline(
+        lambda x: x, persistent_cache=cache, compiler_id='b').compile(foo)
+
+    self.assertEqual(cache.hits, 0)
+    self.assertEqual(cache.misses, 2)
+
+  def test_raises_value_error_with_persistent_cache_and_no_compiler_id(self):
+    cache = compilation_cache.PersistentCompilationCache(
+        self.create_tempdir().full_path)
+
+    with self.assertRaises(ValueError):
+      compiler_pipeline.CompilerPipeline(lambda x: x, persistent_cache=cache)
+
 
 if __name__ == '__main__':
   absltest.main()
@@ -0,0 +1,225 @@
+# Copyright 2020, The TensorFlow Federated Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""A factory for hash-consed (interned) building blocks."""
+
+from typing import Any, Iterable, List, Optional, Tuple
+import weakref
+
+from tensorflow_federated.python.common_libs import py_typecheck
+from tensorflow_federated.python.common_libs import structure
+from tensorflow_federated.python.core.api import computation_types
+from tensorflow_federated.python.core.impl.compiler import building_blocks
+from tensorflow_federated.python.core.impl.compiler import transformation_utils
+
+
+class HashConsingFactory(object):
+  """Constructs building blocks such that identical subtrees are shared.
+
+  A `HashConsingFactory` maintains a table of canonical building blocks. Two
+  building blocks interned by the same factory are the same object if and only
+  if they are structurally identical: they are of the same kind, have the same
+  attributes and type signature (including any Python container types), and
+  their children are (recursively) the same objects. Consequently, comparing
+  interned building blocks is an identity check, and a computation which
+  repeats a subtree holds only one copy of it.
+
+  Since the children of an interned building block are themselves canonical,
+  a building block is interned in constant time, by looking it up by its kind,
+  its attributes, and the identities of its type signature and its children.
+  Computation types are interned by `computation_types`, so types which are
+  equal, including their container types, are the same object.
+
+  The table holds its building blocks weakly, so building blocks which are no
+  longer referenced outside of the factory are not kept alive by it.
+
+  Note: Interning is optional; building blocks constructed directly (or by the
+  transformations in `tree_transformations`) are not interned, and can be
+  interned after the fact with `intern`.
+  """
+
+  def __init__(self):
+    self._blocks = weakref.WeakValueDictionary()
+
+  def __len__(self) -> int:
+    """Returns the number of canonical building blocks in the table."""
+    return len(self._blocks)
+
+  def _get_key(self, comp: building_blocks.ComputationBuildingBlock) -> Any:
+    """Returns the key of `comp`, whose children must be canonical."""
+    if comp.is_reference():
+      return ('reference', comp.name, id(comp.type_signature), id(comp.context))
+    elif comp.is_selection():
+      return ('selection', id(comp.source), comp.name, comp.index)
+    elif comp.is_struct():
+      elements = tuple(
+          (name, id(value)) for name, value in structure.iter_elements(comp))
+      return ('struct', elements, id(comp.type_signature))
+    elif comp.is_call():
+      argument_id = id(comp.argument) if comp.argument is not None else None
+      return ('call', id(comp.function), argument_id)
+    elif comp.is_lambda():
+      return ('lambda', comp.parameter_name, id(comp.parameter_type),
+              id(comp.result))
+    elif comp.is_block():
+      local_symbols = tuple((name, id(value)) for name, value in comp.locals)
+      return ('block', local_symbols, id(comp.result))
+    elif comp.is_intrinsic():
+      return ('intrinsic', comp.uri, id(comp.type_signature))
+    elif comp.is_data():
+      return ('data', comp.uri, id(comp.type_signature))
+    elif comp.is_placement():
+      return ('placement', comp.uri)
+    elif comp.is_compiled_computation():
+      return ('compiled_computation', comp.fingerprint, comp.name,
+              id(comp.type_signature))
+    raise NotImplementedError(
+        'Unrecognized computation building block: {}'.format(str(comp)))
+
+  def _intern_node(
+      self, comp: building_blocks.ComputationBuildingBlock
+  ) -> transformation_utils.TransformReturnType:
+    """Interns `comp`, whose children must be canonical."""
+    key = self._get_key(comp)
+    canonical = self._blocks.get(key)
+    if canonical is None:
+      self._blocks[key] = comp
+      return comp, False
+    return canonical, canonical is not comp
+
+  def is_interned(self, comp: building_blocks.ComputationBuildingBlock) -> bool:
+    """Returns `True` if `comp` is a canonical building block of this factory.
+
+    Args:
+      comp: A `building_blocks.ComputationBuildingBlock`.
+    """
+    py_typecheck.check_type(comp, building_blocks.ComputationBuildingBlock)
+    return self._blocks.get(self._get_key(comp)) is comp
+
+  def intern(
+      self, comp: building_blocks.ComputationBuildingBlock
+  ) -> building_blocks.ComputationBuildingBlock:
+    """Returns the canonical building block structurally identical to `comp`.
+
+    Every subtree of `comp` is replaced with its canonical building block,
+    rebuilding the building blocks whose children are replaced, such that
+    identical subtrees of `comp` are shared in the result. Subtrees which are
+    already canonical are not traversed.
+
+    Args:
+      comp: A `building_blocks.ComputationBuildingBlock` to intern.
+
+    Returns:
+      The canonical `building_blocks.ComputationBuildingBlock` for `comp`.
+
+    Raises:
+      TypeError: If `comp` is not a `building_blocks.ComputationBuildingBlock`.
+    """
+    py_typecheck.check_type(comp, building_blocks.ComputationBuildingBlock)
+    # The canonical building blocks of the subtrees of `comp`, keyed by the `id`
+    # of the subtree. The subtrees are kept alive by `comp`, so their `id`s are
+    # not reused while this method runs.
+    canonical = {}
+    stack = [(comp, False)]
+    while stack:
+      node, children_interned = stack.pop()
+      if id(node) in canonical:
+        continue
+      if self.is_interned(node):
+        canonical[id(node)] = node
+        continue
+      children = building_blocks.get_children(node)
+      if not children_interned:
+        stack.append((node, True))
+        stack.extend((child, False) for child in reversed(children))
+        continue
+      interned_children = [canonical[id(child)] for child in children]
+      if any(x is not y for x, y in zip(interned_children, children)):
+        interned, _ = self._intern_node(
+            _replace_children(node, interned_children))
+      else:
+        interned, _ = self._intern_node(node)
+      canonical[id(node)] = interned
+    return canonical[id(comp)]
+
+  def create_selection(
+      self,
+      source: building_blocks.ComputationBuildingBlock,
+      name: Optional[str] = None,
+      index: Optional[int] = None) -> building_blocks.Selection:
+    """Returns an interned `building_blocks.Selection`."""
+    return self.intern(
+        building_blocks.Selection(source, name=name, index=index))
+
+  def create_struct(
+      self,
+      elements: Iterable[Any],
+      container_type: Optional[type] = None) -> building_blocks.Struct:
+    """Returns an interned `building_blocks.Struct`.
+
+    Args:
+      elements: As in `building_blocks.Struct`.
+      container_type: As in `building_blocks.Struct`.
+    """
+    return self.intern(building_blocks.Struct(elements, container_type))
+
+  def create_call(
+      self,
+      fn: building_blocks.ComputationBuildingBlock,
+      arg: Optional[building_blocks.ComputationBuildingBlock] = None
+  ) -> building_blocks.Call:
+    """Returns an interned `building_blocks.Call`."""
+    return self.intern(building_blocks.Call(fn, arg))
+
+  def create_lambda(
+      self, parameter_name: Optional[str],
+      parameter_type: Optional[computation_types.Type],
+      result: building_blocks.ComputationBuildingBlock
+  ) -> building_blocks.Lambda:
+    """Returns an interned `building_blocks.Lambda`."""
+    return self.intern(
+        building_blocks.Lambda(parameter_name, parameter_type, result))
+
+  def create_block(
+      self,
+      local_symbols: Iterable[Tuple[str,
+                                    building_blocks.ComputationBuildingBlock]],
+      result: building_blocks.ComputationBuildingBlock
+  ) -> building_blocks.Block:
+    """Returns an interned `building_blocks.Block`."""
+    return self.intern(building_blocks.Block(local_symbols, result))
+
+
+def _replace_children(
+    comp: building_blocks.ComputationBuildingBlock,
+    children: List[building_blocks.ComputationBuildingBlock]
+) -> building_blocks.ComputationBuildingBlock:
+  """Returns a copy of `comp` with `children` in place of its children."""
+  if comp.is_selection():
+    return building_blocks.Selection(
+        children[0], name=comp.name, index=comp.index)
+  elif comp.is_struct():
+    names = [name for name, _ in structure.iter_elements(comp)]
+    return building_blocks.Struct(
+        list(zip(names, children)), comp.type_signature.python_container)
+  elif comp.is_call():
+    argument = children[1] if len(children) > 1 else None
+    return building_blocks.Call(children[0], argument)
+  elif comp.is_lambda():
+    return building_blocks.Lambda(comp.parameter_name, comp.parameter_type,
+                                  children[0])
+  elif comp.is_block():
+    names = [name for name, _ in comp.locals]
+    return building_blocks.Block(list(zip(names, children[:-1])), children[-1])
+  raise NotImplementedError(
+      'Unrecognized computation building block: {}'.format(str(comp)))
@@ -0,0 +1,127 @@
+# Copyright 2020, The TensorFlow Federated Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import collections
+
+from absl.testing import absltest
+import tensorflow as tf
+
+from tensorflow_federated.python.core.api import computation_types
+from tensorflow_federated.python.core.impl.compiler import building_blocks
+from tensorflow_federated.python.core.impl.compiler import hash_consing
+
+
+def _create_called_fn(uri):
+  fn = building_blocks.Data(
+      'fn', computation_types.FunctionType(tf.int32, tf.int32))
+  return building_blocks.Call(fn, building_blocks.Data(uri, tf.int32))
+
+
+class HashConsingFactoryTest(absltest.TestCase):
+
+  def test_intern_returns_same_object_for_identical_trees(self):
+    factory = hash_consing.HashConsingFactory()
+
+    comp_1 = factory.intern(_create_called_fn('data'))
+    comp_2 = factory.intern(_create_called_fn('data'))
+
+    self.assertIs(comp_1, comp_2)
+    self.assertTrue(factory.is_interned(comp_1))
+
+  def test_intern_returns_different_objects_for_different_trees(self):
+    factory = hash_consing.HashConsingFactory()
+
+    comp_1 = factory.intern(_create_called_fn('data'))
+    comp_2 = factory.intern(_create_called_fn('other_data'))
+
+    self.assertIsNot(comp_1, comp_2)
+    self.assertIs(comp_1.function, comp_2.function)
+
+  def test_intern_shares_identical_subtrees(self):
+    factory = hash_consing.HashConsingFactory()
+    comp = building_blocks.Struct([
+        _create_called_fn('data'),
+        _create_called_fn('data'),
+    ])
+    self.assertIsNot(comp[0], comp[1])
+
+    interned = factory.intern(comp)
+
+    self.assertIs(interned[0], interned[1])
+    self.assertEqual(interned.compact_representation(),
+                     comp.compact_representation())
+    self.assertFalse(factory.is_interned(comp))
+
+  def test_intern_returns_interned_comp_unchanged(self):
+    factory = hash_consing.HashConsingFactory()
+    comp = factory.intern(_create_called_fn('data'))
+
+    self.assertIs(factory.intern(comp), comp)
+
+  def test_intern_preserves_container_types(self):
+    factory = hash_consing.HashConsingFactory()
+    comp = building_blocks.Struct([('a', _create_called_fn('data'))],
+                                  collections.OrderedDict)
+    interned_call = factory.intern(_create_called_fn('data'))
+
+    interned = factory.intern(comp)
+
+    self.assertIsNot(interned, comp)
+    self.assertIs(interned[0], interned_call)
+    self.assertIs(interned.type_signature, comp.type_signature)
+    self.assertIs(interned.type_signature.python_container,
+                  collections.OrderedDict)
+
+  def test_does_not_merge_structs_with_different_container_types(self):
+    factory = hash_consing.HashConsingFactory()
+    data = building_blocks.Data('data', tf.int32)
+
+    comp_1 = factory.create_struct([('a', data)], collections.OrderedDict)
+    comp_2 = factory.create_struct([('a', data)], dict)
+
+    self.assertIsNot(comp_1, comp_2)
+    self.assertIs(comp_1[0], comp_2[0])
+
+  def test_create_methods_return_interned_comps(self):
+    factory = hash_consing.HashConsingFactory()
+    data = building_blocks.Data('data', tf.int32)
+    ref = building_blocks.Reference('x', tf.int32)
+
+    struct = factory.create_struct([data, ref])
+    selection = factory.create_selection(struct, index=1)
+    fn = factory.create_lambda('x', tf.int32, selection)
+    call = factory.create_call(fn, data)
+    block = factory.create_block([('y', call)], struct)
+
+    for comp in [struct, selection, fn, call, block]:
+      self.assertTrue(factory.is_interned(comp))
+    self.assertIs(factory.create_struct([data, ref]), struct)
+    self.assertIs(factory.create_selection(struct, index=1), selection)
+    self.assertIs(factory.create_lambda('x', tf.int32, selection), fn)
+    self.assertIs(factory.create_call(fn, data), call)
+    self.assertIs(factory.create_block([('y', call)], struct), block)
+    self.assertIs(block.result, struct)
+
+  def test_does_not_keep_unreferenced_comps_alive(self):
+    factory = hash_consing.HashConsingFactory()
+    comp = factory.intern(_create_called_fn('data'))
+    self.assertLen(factory, 3)
+
+    del comp
+
+    self.assertEmpty(factory)
+
+
+if __name__ == '__main__':
+  absltest.main()
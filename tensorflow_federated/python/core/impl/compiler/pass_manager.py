@@ -0,0 +1,237 @@
+# Copyright 2020, The TensorFlow Federated Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""A driver for sequences of compiler passes over building blocks."""
+
+import collections
+import time
+from typing import Callable, Dict, List, Tuple
+
+from absl import logging
+
+from tensorflow_federated.python.common_libs import py_typecheck
+from tensorflow_federated.python.common_libs import structure
+from tensorflow_federated.python.core.impl.compiler import building_blocks
+from tensorflow_federated.python.core.impl.compiler import transformation_utils
+
+TransformReturnType = transformation_utils.TransformReturnType
+
+# The default maximum number of fingerprints remembered for each pass.
+_DEFAULT_MAX_FINGERPRINTS_PER_PASS = 1 << 16
+
+
+class PassManager(object):
+  """Runs compiler passes over a building block, skipping redundant work.
+
+  Passes are identified by name, and a `PassManager` remembers, across calls,
+  the fingerprints of the building blocks each pass has left unmodified:
+
+  *   A whole-tree pass (run with `run_pass`) is not rerun on a tree with the
+      fingerprint of a tree it has already left unmodified; the tree is
+      returned as is instead. A whole-tree pass which modifies a tree is rerun
+      in full every time, since its result may depend on the whole tree.
+  *   A local pass (run with `run_local_pass`) rewrites each building block
+      based only on the subtree rooted at that building block. It is applied
+      post-order like `transformation_utils.transform_postorder`, except that
+      the subtrees the pass has already left unmodified are not traversed
+      again. Since unmodified subtrees are shared between the input and the
+      output of a pass, only the subtrees changed by the intervening passes
+      are revisited when the pass is rerun.
+
+  Both assume that passes are deterministic, and produce the same results as
+  running the passes directly. Only fingerprints are remembered, not building
+  blocks, and at most `max_fingerprints_per_pass` of them for each pass, the
+  least recently used of which are forgotten first. The time spent in each
+  pass is recorded in `timings` and logged at the debug level.
+  """
+
+  def __init__(
+      self,
+      max_fingerprints_per_pass: int = _DEFAULT_MAX_FINGERPRINTS_PER_PASS):
+    """Creates a `PassManager`.
+
+    Args:
+      max_fingerprints_per_pass: The maximum number of fingerprints of
+        unmodified building blocks remembered for each pass.
+
+    Raises:
+      TypeError: If `max_fingerprints_per_pass` is not an integer.
+      ValueError: If `max_fingerprints_per_pass` is not positive.
+    """
+    py_typecheck.check_type(max_fingerprints_per_pass, int)
+    if max_fingerprints_per_pass < 1:
+      raise ValueError(
+          'Expected a positive `max_fingerprints_per_pass`, found {}.'.format(
+              max_fingerprints_per_pass))
+    self._max_fingerprints_per_pass = max_fingerprints_per_pass
+    self._unmodified: Dict[str, 'collections.OrderedDict[bytes, None]'] = (
+        collections.defaultdict(collections.OrderedDict))
+    self._timings: List[Tuple[str, float]] = []
+
+  @property
+  def timings(self) -> List[Tuple[str, float]]:
+    """Returns a list of `(pass_name, seconds)` for each pass run, in order."""
+    return list(self._timings)
+
+  def _record_timing(self, name: str, start_time: float, skipped: bool):
+    elapsed = time.perf_counter() - start_time
+    self._timings.append((name, elapsed))
+    logging.debug('Compiler pass %s took %f seconds%s.', name, elapsed,
+                  ' (skipped)' if skipped else '')
+
+  def _is_unmodified(self, name: str,
+                     comp: building_blocks.ComputationBuildingBlock) -> bool:
+    """Returns `True` iff pass `name` has left `comp` unmodified before."""
+    unmodified = self._unmodified[name]
+    fingerprint = comp.fingerprint
+    if fingerprint not in unmodified:
+      return False
+    unmodified.move_to_end(fingerprint)
+    return True
+
+  def _set_unmodified(self, name: str,
+                      comp: building_blocks.ComputationBuildingBlock):
+    """Remembers that pass `name` has left `comp` unmodified."""
+    unmodified = self._unmodified[name]
+    unmodified[comp.fingerprint] = None
+    unmodified.move_to_end(comp.fingerprint)
+    if len(unmodified) > self._max_fingerprints_per_pass:
+      unmodified.popitem(last=False)
+
+  def run_pass(
+      self, name: str, comp: building_blocks.ComputationBuildingBlock,
+      transform: Callable[[building_blocks.ComputationBuildingBlock],
+                          TransformReturnType]
+  ) -> TransformReturnType:
+    """Runs the whole-tree pass `transform` on `comp`.
+
+    Args:
+      name: The name of the pass.
+      comp: The `building_blocks.ComputationBuildingBlock` to transform.
+      transform: A function which accepts a building block and returns a
+        `(building block, bool)` tuple, as returned by the functions in
+        `tree_transformations`.
+
+    Returns:
+      The result of `transform(comp)`.
+
+    Raises:
+      TypeError: If the arguments are of the wrong types.
+    """
+    py_typecheck.check_type(name, str)
+    py_typecheck.check_type(comp, building_blocks.ComputationBuildingBlock)
+    py_typecheck.check_callable(transform)
+    start_time = time.perf_counter()
+    skipped = self._is_unmodified(name, comp)
+    if skipped:
+      result = comp, False
+    else:
+      result = transform(comp)
+      if not result[1]:
+        self._set_unmodified(name, comp)
+    self._record_timing(name, start_time, skipped)
+    return result
+
+  def run_local_pass(
+      self, name: str, comp: building_blocks.ComputationBuildingBlock,
+      transform_spec_fn: Callable[[building_blocks.ComputationBuildingBlock],
+                                  transformation_utils.TransformSpec]
+  ) -> TransformReturnType:
+    """Runs the local pass constructed by `transform_spec_fn` on `comp`.
+
+    Note: The traversal is driven by an explicit stack rather than by recursion,
+    so the depth of `comp` is not limited by the Python recursion limit.
+
+    Args:
+      name: The name of the pass.
+      comp: The `building_blocks.ComputationBuildingBlock` to transform.
+      transform_spec_fn: A function which accepts `comp` and returns a
+        `transformation_utils.TransformSpec` (such as
+        `tree_transformations.RemoveUnusedBlockLocals`). The `transform` method
+        of the spec must depend only on the building block it is applied to.
+
+    Returns:
+      The result of applying the `transform` method of the spec to `comp`
+      post-order, as in `transformation_utils.transform_postorder`.
+
+    Raises:
+      TypeError: If the arguments are of the wrong types.
+    """
+    py_typecheck.check_type(name, str)
+    py_typecheck.check_type(comp, building_blocks.ComputationBuildingBlock)
+    py_typecheck.check_callable(transform_spec_fn)
+    start_time = time.perf_counter()
+    transform_spec = transform_spec_fn(comp)
+    py_typecheck.check_type(transform_spec, transformation_utils.TransformSpec)
+
+    def _visit(comp):
+      """Skips an unmodified `comp`, or returns a generator transforming it."""
+      if self._is_unmodified(name, comp):
+        return comp, False
+      return _transform(comp)
+
+    def _transform(comp):
+      """Yields the traversals of the children of `comp`, then transforms it."""
+      if comp.is_selection():
+        source, modified = yield _visit(comp.source)
+        if modified:
+          comp = building_blocks.Selection(source, comp.name, comp.index)
+      elif comp.is_struct():
+        elements = []
+        modified = False
+        for key, value in structure.iter_elements(comp):
+          value, value_modified = yield _visit(value)
+          elements.append((key, value))
+          modified = modified or value_modified
+        if modified:
+          comp = building_blocks.Struct(elements)
+      elif comp.is_call():
+        fn, fn_modified = yield _visit(comp.function)
+        if comp.argument is not None:
+          arg, arg_modified = yield _visit(comp.argument)
+        else:
+          arg, arg_modified = (None, False)
+        modified = fn_modified or arg_modified
+        if modified:
+          comp = building_blocks.Call(fn, arg)
+      elif comp.is_lambda():
+        result, modified = yield _visit(comp.result)
+        if modified:
+          comp = building_blocks.Lambda(comp.parameter_name,
+                                        comp.parameter_type, result)
+      elif comp.is_block():
+        variables = []
+        modified = False
+        for key, value in comp.locals:
+          value, value_modified = yield _visit(value)
+          variables.append((key, value))
+          modified = modified or value_modified
+        result, result_modified = yield _visit(comp.result)
+        modified = modified or result_modified
+        if modified:
+          comp = building_blocks.Block(variables, result)
+      else:
+        modified = False
+      comp, comp_modified = transform_spec.transform(comp)
+      modified = modified or comp_modified
+      if not modified:
+        self._set_unmodified(name, comp)
+      return comp, modified
+
+    skipped = self._is_unmodified(name, comp)
+    if skipped:
+      result = comp, False
+    else:
+      result = transformation_utils.run_traversal(_transform(comp))
+    self._record_timing(name, start_time, skipped)
+    return result
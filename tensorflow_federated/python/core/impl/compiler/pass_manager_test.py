@@ -0,0 +1,181 @@
+# Copyright 2020, The TensorFlow Federated Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import sys
+
+from absl.testing import absltest
+import tensorflow as tf
+
+from tensorflow_federated.python.core.impl.compiler import building_blocks
+from tensorflow_federated.python.core.impl.compiler import pass_manager
+from tensorflow_federated.python.core.impl.compiler import test_utils
+from tensorflow_federated.python.core.impl.compiler import tree_transformations
+
+
+class _CountingRemoveUnusedBlockLocals(
+    tree_transformations.RemoveUnusedBlockLocals):
+
+  def __init__(self):
+    super().__init__()
+    self.count = 0
+
+  def transform(self, comp):
+    self.count += 1
+    return super().transform(comp)
+
+
+def _create_block_with_unused_local(variable_name):
+  data = building_blocks.Data('data', tf.int32)
+  return building_blocks.Block([(variable_name, data)], data)
+
+
+class PassManagerTest(absltest.TestCase):
+
+  def test_run_pass_returns_result_of_transform(self):
+    comp = test_utils.create_identity_block_with_dummy_data('x')
+    manager = pass_manager.PassManager()
+
+    def _transform(comp):
+      return building_blocks.Struct([comp]), True
+
+    transformed, modified = manager.run_pass('pass', comp, _transform)
+
+    self.assertTrue(modified)
+    self.assertEqual(transformed.compact_representation(),
+                     '<(let x=data in x)>')
+
+  def test_run_pass_skips_tree_with_same_fingerprint(self):
+    manager = pass_manager.PassManager()
+    calls = []
+
+    def _transform(comp):
+      calls.append(comp)
+      return comp, False
+
+    for name in ['x', 'x', 'y']:
+      comp = test_utils.create_identity_block_with_dummy_data(name)
+      manager.run_pass('pass', comp, _transform)
+
+    self.assertLen(calls, 2)
+
+  def test_run_pass_records_timings(self):
+    comp = test_utils.create_identity_block_with_dummy_data('x')
+    manager = pass_manager.PassManager()
+
+    manager.run_pass('first', comp, lambda comp: (comp, False))
+    manager.run_local_pass('second', comp,
+                           tree_transformations.MergeChainedBlocks)
+
+    self.assertEqual([name for name, _ in manager.timings], ['first', 'second'])
+    for _, seconds in manager.timings:
+      self.assertGreaterEqual(seconds, 0.0)
+
+  def test_run_local_pass_matches_transform_postorder(self):
+    comp = building_blocks.Lambda(
+        'a', tf.int32,
+        building_blocks.Struct([
+            _create_block_with_unused_local('x'),
+            test_utils.create_identity_block_with_dummy_data('y'),
+            building_blocks.Call(
+                building_blocks.Lambda('b', tf.int32,
+                                       _create_block_with_unused_local('z')),
+                building_blocks.Reference('a', tf.int32)),
+        ]))
+    manager = pass_manager.PassManager()
+
+    transformed, modified = manager.run_local_pass(
+        'remove_unused_block_locals', comp,
+        lambda _: tree_transformations.RemoveUnusedBlockLocals())
+    expected, expected_modified = (
+        tree_transformations.remove_unused_block_locals(comp))
+
+    self.assertEqual(modified, expected_modified)
+    self.assertEqual(transformed.compact_representation(),
+                     expected.compact_representation())
+
+  def test_run_local_pass_does_not_revisit_unmodified_subtrees(self):
+    unmodified_subtree = building_blocks.Struct([
+        test_utils.create_identity_block_with_dummy_data('x'),
+        test_utils.create_identity_block_with_dummy_data('y'),
+    ])
+    comp = building_blocks.Struct([unmodified_subtree])
+    manager = pass_manager.PassManager()
+    transform_spec = _CountingRemoveUnusedBlockLocals()
+    manager.run_local_pass('remove_unused_block_locals', comp,
+                           lambda _: transform_spec)
+    self.assertGreater(transform_spec.count, 0)
+
+    transform_spec = _CountingRemoveUnusedBlockLocals()
+    changed_comp = building_blocks.Struct(
+        [unmodified_subtree,
+         _create_block_with_unused_local('z')])
+    transformed, modified = manager.run_local_pass(
+        'remove_unused_block_locals', changed_comp, lambda _: transform_spec)
+
+    self.assertTrue(modified)
+    self.assertEqual(transformed.compact_representation(),
+                     '<<(let x=data in x),(let y=data in y)>,data>')
+    # Only the new block and the outer struct are visited; the subtrees which
+    # were left unmodified by the first run (including `data`) are not.
+    self.assertEqual(transform_spec.count, 2)
+
+  def test_run_local_pass_handles_tree_deeper_than_recursion_limit(self):
+    comp = building_blocks.Data('data', tf.int32)
+    for i in range(2 * sys.getrecursionlimit()):
+      local = building_blocks.Data('local_{}'.format(i), tf.int32)
+      comp = building_blocks.Block([('x', local)], comp)
+    manager = pass_manager.PassManager()
+
+    transformed, modified = manager.run_local_pass(
+        'remove_unused_block_locals', comp,
+        lambda _: tree_transformations.RemoveUnusedBlockLocals())
+
+    self.assertTrue(modified)
+    self.assertEqual(transformed.compact_representation(), 'data')
+
+  def test_run_pass_forgets_least_recently_used_fingerprints(self):
+    manager = pass_manager.PassManager(max_fingerprints_per_pass=1)
+    calls = []
+
+    def _transform(comp):
+      calls.append(comp)
+      return comp, False
+
+    for name in ['x', 'y', 'x']:
+      comp = test_utils.create_identity_block_with_dummy_data(name)
+      manager.run_pass('pass', comp, _transform)
+
+    self.assertLen(calls, 3)
+
+  def test_run_pass_reruns_transform_which_modified_tree(self):
+    comp = test_utils.create_identity_block_with_dummy_data('x')
+    manager = pass_manager.PassManager()
+    calls = []
+
+    def _transform(comp):
+      calls.append(comp)
+      return building_blocks.Struct([comp]), True
+
+    manager.run_pass('pass', comp, _transform)
+    manager.run_pass('pass', comp, _transform)
+
+    self.assertLen(calls, 2)
+
+  def test_raises_value_error_with_nonpositive_max_fingerprints(self):
+    with self.assertRaises(ValueError):
+      pass_manager.PassManager(max_fingerprints_per_pass=0)
+
+
+if __name__ == '__main__':
+  absltest.main()
@@ -255,6 +255,65 @@ def create_binary_operator_with_upcast(
   return _tensorflow_comp(tensorflow, type_signature)
 
 
+def create_stacked_sum(operand_type: computation_types.Type,
+                       count: int) -> ProtoAndType:
+  """Returns a tensorflow computation summing `count` values in a single call.
+
+  The returned computation has the type signature `(<T, T, T, ...> -> T)`, where
+  `T` is `operand_type` and the length of the parameter is `count`. Each tensor
+  leaf of the result is computed by stacking the corresponding leaves of all
+  the operands and reducing them with a single `tf.reduce_sum`.
+
+  Args:
+    operand_type: A `computation_types.Type` of the values to sum; must contain
+      only named tuples and tensor types, all with fully defined shapes and
+      numeric dtypes.
+    count: A positive integer, the number of values to sum.
+
+  Raises:
+    TypeError: If the constraints of `operand_type` are violated or `count` is
+      not an integer.
+    ValueError: If `count` is not positive.
+  """
+  if (operand_type is None or
+      not type_analysis.is_generic_op_compatible_type(operand_type)):
+    raise TypeError(
+        'The type {} contains a type other than `computation_types.TensorType` '
+        'and `computation_types.StructType`; this is disallowed in the '
+        'generic operators.'.format(operand_type))
+  if not type_analysis.contains_only(
+      operand_type, lambda t: t.is_struct() or
+      (t.shape.is_fully_defined() and type_analysis.is_numeric_dtype(t.dtype))):
+    raise TypeError(
+        'Expected a type with only fully defined tensor shapes and numeric '
+        'dtypes, found {}.'.format(operand_type))
+  py_typecheck.check_type(count, int)
+  if count < 1:
+    raise ValueError('Expected a positive `count`, found {}.'.format(count))
+  parameter_type = computation_types.StructType([operand_type] * count)
+
+  def _stacked_sum(*operands):
+    return tf.reduce_sum(tf.stack(operands), axis=0)
+
+  with tf.Graph().as_default() as graph:
+    parameter_value, parameter_binding = tensorflow_utils.stamp_parameter_in_graph(
+        'x', parameter_type, graph)
+    operands = list(parameter_value)
+    if operand_type.is_tensor():
+      result_value = _stacked_sum(*operands)
+    else:
+      result_value = structure.map_structure(_stacked_sum, *operands)
+    result_type, result_binding = tensorflow_utils.capture_result_from_graph(
+        result_value, graph)
+
+  type_signature = computation_types.FunctionType(parameter_type, result_type)
+  tensorflow = pb.TensorFlow(
+      graph_def=serialization_utils.pack_graph_def(graph.as_graph_def()),
+      parameter=parameter_binding,
+      result=result_binding)
+  return _tensorflow_comp(tensorflow, type_signature)
+
+
 def create_empty_tuple() -> ProtoAndType:
   """Returns a tensorflow computation returning an empty tuple.
 
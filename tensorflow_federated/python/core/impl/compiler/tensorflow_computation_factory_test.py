@@ -223,6 +223,61 @@ class CreateBinaryOperatorWithUpcastTest(parameterized.TestCase):
     self.assertEqual(actual_result, expected_result)
 
 
+class CreateStackedSumTest(parameterized.TestCase):
+
+  # pyformat: disable
+  @parameterized.named_parameters(
+      ('int', computation_types.TensorType(tf.int32), [1, 2, 3], 6),
+      ('float', computation_types.TensorType(tf.float32),
+       [1.0, 2.25, 3.5], 6.75),
+      ('single_operand', computation_types.TensorType(tf.float32),
+       [1.0], 1.0),
+      ('vector', computation_types.TensorType(tf.int32, [2]),
+       [[1, 2], [3, 4]], [4, 6]),
+      ('unnamed_tuple', computation_types.StructType([tf.int32, tf.float32]),
+       [[1, 1.0], [2, 2.25]],
+       structure.Struct([(None, 3), (None, 3.25)])),
+      ('named_tuple',
+       computation_types.StructType([('a', tf.int32), ('b', tf.float32)]),
+       [[1, 1.0], [2, 2.25], [3, 3.5]],
+       structure.Struct([('a', 6), ('b', 6.75)])),
+  )
+  # pyformat: enable
+  def test_returns_computation(self, type_signature, operands,
+                               expected_result):
+    proto, _ = tensorflow_computation_factory.create_stacked_sum(
+        type_signature, len(operands))
+
+    self.assertIsInstance(proto, pb.Computation)
+    actual_type = type_serialization.deserialize_type(proto.type)
+    expected_type = computation_types.FunctionType(
+        [type_signature] * len(operands), type_signature)
+    expected_type.check_assignable_from(actual_type)
+    actual_result = test_utils.run_tensorflow(proto, operands)
+    if isinstance(expected_result, list):
+      self.assertCountEqual(actual_result, expected_result)
+    else:
+      self.assertEqual(actual_result, expected_result)
+
+  @parameterized.named_parameters(
+      ('none_type', None, 3),
+      ('none_count', computation_types.TensorType(tf.int32), None),
+      ('federated_type', type_factory.at_server(tf.int32), 3),
+      ('sequence_type', computation_types.SequenceType(tf.int32), 3),
+      ('undefined_shape', computation_types.TensorType(tf.int32, [None]), 3),
+      ('string', computation_types.TensorType(tf.string), 3),
+      ('bool', computation_types.TensorType(tf.bool), 3),
+  )
+  def test_raises_type_error(self, type_signature, count):
+    with self.assertRaises(TypeError):
+      tensorflow_computation_factory.create_stacked_sum(type_signature, count)
+
+  def test_raises_value_error_with_zero_count(self):
+    with self.assertRaises(ValueError):
+      tensorflow_computation_factory.create_stacked_sum(
+          computation_types.TensorType(tf.int32), 0)
+
+
 class CreateEmptyTupleTest(absltest.TestCase):
 
   def test_returns_computation(self):
@@ -17,6 +17,7 @@ import abc
 import collections
 import itertools
 import operator
+import types
 import typing
 from typing import Callable, Set, Tuple
 
@@ -25,6 +26,48 @@ from tensorflow_federated.python.common_libs import structure
 from tensorflow_federated.python.core.impl.compiler import building_blocks
 
 
+def _is_leaf(comp: building_blocks.ComputationBuildingBlock) -> bool:
+  return (comp.is_compiled_computation() or comp.is_data() or
+          comp.is_intrinsic() or comp.is_placement() or comp.is_reference())
+
+
+def run_traversal(traversal):
+  """Runs a traversal of an AST using an explicit stack instead of recursion.
+
+  The traversals are written as generators: each generator
+  traverses one building block, and rather than recursing into a child of the
+  building block, it yields the traversal of the child and receives its result
+  (the value returned by the generator of the child). As the generators are
+  driven from a single loop, the depth of the AST is limited only by memory,
+  rather than by the Python recursion limit, and no Python stack frame is
+  created for the leaves of the AST.
+
+  Args:
+    traversal: Either a generator, as described above, or the result of the
+      traversal, if the traversal did not need to visit any children.
+
+  Returns:
+    The value returned by `traversal`.
+  """
+  if not isinstance(traversal, types.GeneratorType):
+    return traversal
+  stack = [traversal]
+  value = None
+  while stack:
+    try:
+      child = stack[-1].send(value)
+    except StopIteration as e:
+      stack.pop()
+      value = e.value
+      continue
+    if isinstance(child, types.GeneratorType):
+      stack.append(child)
+      value = None
+    else:
+      value = child
+  return value
+
+
 def transform_postorder(comp, transform):
   """Traverses `comp` recursively postorder and replaces its constituents.
 
@@ -42,6 +85,9 @@ def transform_postorder(comp, transform):
   Therefore, `f` is transformed into `f'`, next `x` into `x'` and finally,
   `Call(f',x')` is transformed at the end.
 
+  Note: The traversal is driven by an explicit stack rather than by recursion,
+  so the depth of `comp` is not limited by the Python recursion limit.
+
   Args:
     comp: A `computation_building_block.ComputationBuildingBlock` to traverse
       and transform bottom-up.
@@ -64,58 +110,66 @@ def transform_postorder(comp, transform):
       that is currently not recognized.
   """
   py_typecheck.check_type(comp, building_blocks.ComputationBuildingBlock)
-  if (comp.is_compiled_computation() or comp.is_data() or comp.is_intrinsic() or
-      comp.is_placement() or comp.is_reference()):
-    return transform(comp)
-  elif comp.is_selection():
-    source, source_modified = transform_postorder(comp.source, transform)
-    if source_modified:
-      comp = building_blocks.Selection(source, comp.name, comp.index)
-    comp, comp_modified = transform(comp)
-    return comp, comp_modified or source_modified
-  elif comp.is_struct():
-    elements = []
-    elements_modified = False
-    for key, value in structure.iter_elements(comp):
-      value, value_modified = transform_postorder(value, transform)
-      elements.append((key, value))
-      elements_modified = elements_modified or value_modified
-    if elements_modified:
-      comp = building_blocks.Struct(elements)
-    comp, comp_modified = transform(comp)
-    return comp, comp_modified or elements_modified
-  elif comp.is_call():
-    fn, fn_modified = transform_postorder(comp.function, transform)
-    if comp.argument is not None:
-      arg, arg_modified = transform_postorder(comp.argument, transform)
+
+  def _visit(comp):
+    """Transforms a leaf `comp`, or returns a generator transforming it."""
+    if _is_leaf(comp):
+      return transform(comp)
+    return _transform(comp)
+
+  def _transform(comp):
+    """Yields the traversals of the children of `comp`, then transforms it."""
+    if comp.is_selection():
+      source, source_modified = yield _visit(comp.source)
+      if source_modified:
+        comp = building_blocks.Selection(source, comp.name, comp.index)
+      comp, comp_modified = transform(comp)
+      return comp, comp_modified or source_modified
+    elif comp.is_struct():
+      elements = []
+      elements_modified = False
+      for key, value in structure.iter_elements(comp):
+        value, value_modified = yield _visit(value)
+        elements.append((key, value))
+        elements_modified = elements_modified or value_modified
+      if elements_modified:
+        comp = building_blocks.Struct(elements)
+      comp, comp_modified = transform(comp)
+      return comp, comp_modified or elements_modified
+    elif comp.is_call():
+      fn, fn_modified = yield _visit(comp.function)
+      if comp.argument is not None:
+        arg, arg_modified = yield _visit(comp.argument)
+      else:
+        arg, arg_modified = (None, False)
+      if fn_modified or arg_modified:
+        comp = building_blocks.Call(fn, arg)
+      comp, comp_modified = transform(comp)
+      return comp, comp_modified or fn_modified or arg_modified
+    elif comp.is_lambda():
+      result, result_modified = yield _visit(comp.result)
+      if result_modified:
+        comp = building_blocks.Lambda(comp.parameter_name, comp.parameter_type,
+                                      result)
+      comp, comp_modified = transform(comp)
+      return comp, comp_modified or result_modified
+    elif comp.is_block():
+      variables = []
+      variables_modified = False
+      for key, value in comp.locals:
+        value, value_modified = yield _visit(value)
+        variables.append((key, value))
+        variables_modified = variables_modified or value_modified
+      result, result_modified = yield _visit(comp.result)
+      if variables_modified or result_modified:
+        comp = building_blocks.Block(variables, result)
+      comp, comp_modified = transform(comp)
+      return comp, comp_modified or variables_modified or result_modified
     else:
-      arg, arg_modified = (None, False)
-    if fn_modified or arg_modified:
-      comp = building_blocks.Call(fn, arg)
-    comp, comp_modified = transform(comp)
-    return comp, comp_modified or fn_modified or arg_modified
-  elif comp.is_lambda():
-    result, result_modified = transform_postorder(comp.result, transform)
-    if result_modified:
-      comp = building_blocks.Lambda(comp.parameter_name, comp.parameter_type,
-                                    result)
-    comp, comp_modified = transform(comp)
-    return comp, comp_modified or result_modified
-  elif comp.is_block():
-    variables = []
-    variables_modified = False
-    for key, value in comp.locals:
-      value, value_modified = transform_postorder(value, transform)
-      variables.append((key, value))
-      variables_modified = variables_modified or value_modified
-    result, result_modified = transform_postorder(comp.result, transform)
-    if variables_modified or result_modified:
-      comp = building_blocks.Block(variables, result)
-    comp, comp_modified = transform(comp)
-    return comp, comp_modified or variables_modified or result_modified
-  else:
-    raise NotImplementedError(
-        'Unrecognized computation building block: {}'.format(str(comp)))
+      raise NotImplementedError(
+          'Unrecognized computation building block: {}'.format(str(comp)))
+
+  return run_traversal(_visit(comp))
 
 
 TransformReturnType = Tuple[building_blocks.ComputationBuildingBlock, bool]
@@ -156,66 +210,67 @@ def transform_preorder(
 
   py_typecheck.check_type(comp, building_blocks.ComputationBuildingBlock)
   py_typecheck.check_callable(transform)
-  inner_comp, modified = transform(comp)
-  if modified:
-    return inner_comp, modified
-  if (inner_comp.is_compiled_computation() or inner_comp.is_data() or
-      inner_comp.is_intrinsic() or inner_comp.is_placement() or
-      inner_comp.is_reference()):
-    return inner_comp, modified
-  elif inner_comp.is_lambda():
-    transformed_result, result_modified = transform_preorder(
-        inner_comp.result, transform)
-    if not (modified or result_modified):
-      return inner_comp, False
-    return building_blocks.Lambda(inner_comp.parameter_name,
-                                  inner_comp.parameter_type,
-                                  transformed_result), True
-  elif inner_comp.is_struct():
-    elements_modified = False
-    elements = []
-    for name, val in structure.iter_elements(inner_comp):
-      result, result_modified = transform_preorder(val, transform)
-      elements_modified = elements_modified or result_modified
-      elements.append((name, result))
-    if not (modified or elements_modified):
-      return inner_comp, False
-    return building_blocks.Struct(elements), True
-  elif inner_comp.is_selection():
-    transformed_source, source_modified = transform_preorder(
-        inner_comp.source, transform)
-    if not (modified or source_modified):
-      return inner_comp, False
-    return building_blocks.Selection(transformed_source, inner_comp.name,
-                                     inner_comp.index), True
-  elif inner_comp.is_call():
-    transformed_fn, fn_modified = transform_preorder(inner_comp.function,
-                                                     transform)
-    if inner_comp.argument is not None:
-      transformed_arg, arg_modified = transform_preorder(
-          inner_comp.argument, transform)
+
+  def _visit(comp):
+    """Transforms `comp`, or returns a generator transforming its children."""
+    inner_comp, modified = transform(comp)
+    if modified or _is_leaf(inner_comp):
+      return inner_comp, modified
+    return _transform_children(inner_comp)
+
+  def _transform_children(inner_comp):
+    """Yields the traversals of the children of `inner_comp`."""
+    if inner_comp.is_lambda():
+      transformed_result, result_modified = yield _visit(inner_comp.result)
+      if not result_modified:
+        return inner_comp, False
+      return building_blocks.Lambda(inner_comp.parameter_name,
+                                    inner_comp.parameter_type,
+                                    transformed_result), True
+    elif inner_comp.is_struct():
+      elements_modified = False
+      elements = []
+      for name, val in structure.iter_elements(inner_comp):
+        result, result_modified = yield _visit(val)
+        elements_modified = elements_modified or result_modified
+        elements.append((name, result))
+      if not elements_modified:
+        return inner_comp, False
+      return building_blocks.Struct(elements), True
+    elif inner_comp.is_selection():
+      transformed_source, source_modified = yield _visit(inner_comp.source)
+      if not source_modified:
+        return inner_comp, False
+      return building_blocks.Selection(transformed_source, inner_comp.name,
+                                       inner_comp.index), True
+    elif inner_comp.is_call():
+      transformed_fn, fn_modified = yield _visit(inner_comp.function)
+      if inner_comp.argument is not None:
+        transformed_arg, arg_modified = yield _visit(inner_comp.argument)
+      else:
+        transformed_arg = None
+        arg_modified = False
+      if not (fn_modified or arg_modified):
+        return inner_comp, False
+      return building_blocks.Call(transformed_fn, transformed_arg), True
+    elif inner_comp.is_block():
+      transformed_variables = []
+      values_modified = False
+      for key, value in inner_comp.locals:
+        transformed_value, value_modified = yield _visit(value)
+        transformed_variables.append((key, transformed_value))
+        values_modified = values_modified or value_modified
+      transformed_result, result_modified = yield _visit(inner_comp.result)
+      if not (values_modified or result_modified):
+        return inner_comp, False
+      return building_blocks.Block(transformed_variables,
+                                   transformed_result), True
     else:
-      transformed_arg = None
-      arg_modified = False
-    if not (modified or fn_modified or arg_modified):
-      return inner_comp, False
-    return building_blocks.Call(transformed_fn, transformed_arg), True
-  elif inner_comp.is_block():
-    transformed_variables = []
-    values_modified = False
-    for key, value in inner_comp.locals:
-      transformed_value, value_modified = transform_preorder(value, transform)
-      transformed_variables.append((key, transformed_value))
-      values_modified = values_modified or value_modified
-    transformed_result, result_modified = transform_preorder(
-        inner_comp.result, transform)
-    if not (modified or values_modified or result_modified):
-      return inner_comp, False
-    return building_blocks.Block(transformed_variables,
-                                 transformed_result), True
-  else:
-    raise NotImplementedError(
-        'Unrecognized computation building block: {}'.format(str(inner_comp)))
+      raise NotImplementedError(
+          'Unrecognized computation building block: {}'.format(
+              str(inner_comp)))
+
+  return run_traversal(_visit(comp))
 
 
 def transform_postorder_with_symbol_bindings(comp, transform, symbol_tree):
@@ -276,38 +331,33 @@ def transform_postorder_with_symbol_bindings(comp, transform, symbol_tree):
                     'be callable.')
   identifier_seq = itertools.count(start=1)
 
-  def _transform_postorder_with_symbol_bindings_switch(comp, transform_fn,
-                                                       ctxt_tree,
-                                                       identifier_sequence):
-    """Recursive helper function delegated to after binding comp_id sequence."""
-    if (comp.is_compiled_computation() or comp.is_data() or
-        comp.is_intrinsic() or comp.is_placement() or comp.is_reference()):
-      return _traverse_leaf(comp, transform_fn, ctxt_tree, identifier_sequence)
+  def _visit(comp):
+    """Transforms a leaf `comp`, or returns a generator transforming it."""
+    if _is_leaf(comp):
+      return _traverse_leaf(comp)
     elif comp.is_selection():
-      return _traverse_selection(comp, transform, ctxt_tree,
-                                 identifier_sequence)
+      return _traverse_selection(comp)
     elif comp.is_struct():
-      return _traverse_tuple(comp, transform, ctxt_tree, identifier_sequence)
+      return _traverse_tuple(comp)
     elif comp.is_call():
-      return _traverse_call(comp, transform, ctxt_tree, identifier_sequence)
+      return _traverse_call(comp)
     elif comp.is_lambda():
-      return _traverse_lambda(comp, transform, ctxt_tree, identifier_sequence)
+      return _traverse_lambda(comp)
     elif comp.is_block():
-      return _traverse_block(comp, transform, ctxt_tree, identifier_sequence)
+      return _traverse_block(comp)
     else:
       raise NotImplementedError(
           'Unrecognized computation building block: {}'.format(str(comp)))
 
-  def _traverse_leaf(comp, transform, context_tree, identifier_seq):
+  def _traverse_leaf(comp):
     """Helper function holding traversal logic for leaf nodes."""
     _ = next(identifier_seq)
-    return transform(comp, context_tree)
+    return transform(comp, symbol_tree)
 
-  def _traverse_selection(comp, transform, context_tree, identifier_seq):
+  def _traverse_selection(comp):
     """Helper function holding traversal logic for selection nodes."""
     _ = next(identifier_seq)
-    source, source_modified = _transform_postorder_with_symbol_bindings_switch(
-        comp.source, transform, context_tree, identifier_seq)
+    source, source_modified = yield _visit(comp.source)
     if source_modified:
       # Normalize selection to index based on the type signature of the
       # original source. The new source may not have names present.
@@ -317,77 +367,70 @@ def transform_postorder_with_symbol_bindings(comp, transform, symbol_tree):
         index = structure.name_to_index_map(
             comp.source.type_signature)[comp.name]
       comp = building_blocks.Selection(source, index=index)
-    comp, comp_modified = transform(comp, context_tree)
+    comp, comp_modified = transform(comp, symbol_tree)
     return comp, comp_modified or source_modified
 
-  def _traverse_tuple(comp, transform, context_tree, identifier_seq):
+  def _traverse_tuple(comp):
     """Helper function holding traversal logic for tuple nodes."""
     _ = next(identifier_seq)
     elements = []
     elements_modified = False
     for key, value in structure.iter_elements(comp):
-      value, value_modified = _transform_postorder_with_symbol_bindings_switch(
-          value, transform, context_tree, identifier_seq)
+      value, value_modified = yield _visit(value)
       elements.append((key, value))
       elements_modified = elements_modified or value_modified
     if elements_modified:
       comp = building_blocks.Struct(elements)
-    comp, comp_modified = transform(comp, context_tree)
+    comp, comp_modified = transform(comp, symbol_tree)
     return comp, comp_modified or elements_modified
 
-  def _traverse_call(comp, transform, context_tree, identifier_seq):
+  def _traverse_call(comp):
     """Helper function holding traversal logic for call nodes."""
     _ = next(identifier_seq)
-    fn, fn_modified = _transform_postorder_with_symbol_bindings_switch(
-        comp.function, transform, context_tree, identifier_seq)
+    fn, fn_modified = yield _visit(comp.function)
     if comp.argument is not None:
-      arg, arg_modified = _transform_postorder_with_symbol_bindings_switch(
-          comp.argument, transform, context_tree, identifier_seq)
+      arg, arg_modified = yield _visit(comp.argument)
     else:
       arg, arg_modified = (None, False)
     if fn_modified or arg_modified:
       comp = building_blocks.Call(fn, arg)
-    comp, comp_modified = transform(comp, context_tree)
+    comp, comp_modified = transform(comp, symbol_tree)
     return comp, comp_modified or fn_modified or arg_modified
 
-  def _traverse_lambda(comp, transform, context_tree, identifier_seq):
+  def _traverse_lambda(comp):
     """Helper function holding traversal logic for lambda nodes."""
     comp_id = next(identifier_seq)
-    context_tree.drop_scope_down(comp_id)
-    context_tree.ingest_variable_binding(name=comp.parameter_name, value=None)
-    result, result_modified = _transform_postorder_with_symbol_bindings_switch(
-        comp.result, transform, context_tree, identifier_seq)
-    context_tree.walk_to_scope_beginning()
+    symbol_tree.drop_scope_down(comp_id)
+    symbol_tree.ingest_variable_binding(name=comp.parameter_name, value=None)
+    result, result_modified = yield _visit(comp.result)
+    symbol_tree.walk_to_scope_beginning()
     if result_modified:
       comp = building_blocks.Lambda(comp.parameter_name, comp.parameter_type,
                                     result)
-    comp, comp_modified = transform(comp, context_tree)
-    context_tree.pop_scope_up()
+    comp, comp_modified = transform(comp, symbol_tree)
+    symbol_tree.pop_scope_up()
     return comp, comp_modified or result_modified
 
-  def _traverse_block(comp, transform, context_tree, identifier_seq):
+  def _traverse_block(comp):
     """Helper function holding traversal logic for block nodes."""
     comp_id = next(identifier_seq)
-    context_tree.drop_scope_down(comp_id)
+    symbol_tree.drop_scope_down(comp_id)
     variables = []
     variables_modified = False
     for key, value in comp.locals:
-      value, value_modified = _transform_postorder_with_symbol_bindings_switch(
-          value, transform, context_tree, identifier_seq)
-      context_tree.ingest_variable_binding(name=key, value=value)
+      value, value_modified = yield _visit(value)
+      symbol_tree.ingest_variable_binding(name=key, value=value)
       variables.append((key, value))
       variables_modified = variables_modified or value_modified
-    result, result_modified = _transform_postorder_with_symbol_bindings_switch(
-        comp.result, transform, context_tree, identifier_seq)
-    context_tree.walk_to_scope_beginning()
+    result, result_modified = yield _visit(comp.result)
+    symbol_tree.walk_to_scope_beginning()
     if variables_modified or result_modified:
       comp = building_blocks.Block(variables, result)
-    comp, comp_modified = transform(comp, context_tree)
-    context_tree.pop_scope_up()
+    comp, comp_modified = transform(comp, symbol_tree)
+    symbol_tree.pop_scope_up()
     return comp, comp_modified or variables_modified or result_modified
 
-  return _transform_postorder_with_symbol_bindings_switch(
-      comp, transform, symbol_tree, identifier_seq)
+  return run_traversal(_visit(comp))
 
 
 class SymbolTree(object):
@@ -1099,22 +1142,14 @@ def get_count_of_references_to_variables(comp):
 
 
 def get_unique_names(comp):
-  """Returns the unique names bound or referred to in `comp`."""
-  py_typecheck.check_type(comp, building_blocks.ComputationBuildingBlock)
-  names = set()
+  """Returns the unique names bound or referred to in `comp`.
 
-  def _update(comp):
-    if comp.is_block():
-      names.update([name for name, _ in comp.locals])
-    elif comp.is_lambda():
-      if comp.parameter_type is not None:
-        names.add(comp.parameter_name)
-    elif isinstance(comp, building_blocks.Reference):
-      names.add(comp.name)
-    return comp, False
-
-  transform_postorder(comp, _update)
-  return names
+  The names are cached on the building blocks in `comp` (see
+  `building_blocks.ComputationBuildingBlock.variable_names`), so subsequent
+  calls on `comp` or on trees sharing subtrees with `comp` are cheap.
+  """
+  py_typecheck.check_type(comp, building_blocks.ComputationBuildingBlock)
+  return set(comp.variable_names)
 
 
 def has_unique_names(comp):
@@ -1161,27 +1196,26 @@ class BuildingBlockKeyedMapping(collections.abc.MutableMapping):
   """Dictlike structure keyed by `building_blocks.ComputationBuildingBlocks`."""
 
   def __init__(self):
-    self._comps = []
+    self._comps = {}
     self._mapping = {}
 
   def __delitem__(self, comp: building_blocks.ComputationBuildingBlock):
     del self._mapping[id(comp)]
-    self._comps.remove(comp)
+    del self._comps[id(comp)]
 
   def __getitem__(self, comp: building_blocks.ComputationBuildingBlock):
     comp_id = id(comp)
     return self._mapping[comp_id]
 
   def __iter__(self):
-    return (x for x in self._comps)
+    return iter(self._comps.values())
 
   def __len__(self):
     return len(self._mapping)
 
   def __setitem__(self, comp: building_blocks.ComputationBuildingBlock,
                   value: Set[str]):
-    if comp not in self._comps:
-      self._comps.append(comp)
+    self._comps[id(comp)] = comp
     self._mapping[id(comp)] = value
 
 
@@ -1194,6 +1228,10 @@ def get_map_of_unbound_references(
   references, so it is safe to use `comp` as the key for this `dict` even though
   a given compuation may appear in many positions in the AST.
 
+  The unbound references are cached on the building blocks in `comp` (see
+  `building_blocks.ComputationBuildingBlock.unbound_references`), so they are
+  only computed for the building blocks which have not been analyzed before.
+
   Args:
     comp: The computation building block to parse.
 
@@ -1206,33 +1244,7 @@ def get_map_of_unbound_references(
   references = BuildingBlockKeyedMapping()
 
   def _update(comp):
-    """Updates the Python dict of references."""
-    if comp.is_reference():
-      references[comp] = set((comp.name,))
-    elif comp.is_block():
-      references[comp] = set()
-      names = []
-      for name, variable in comp.locals:
-        elements = references[variable]
-        references[comp].update([e for e in elements if e not in names])
-        names.append(name)
-      elements = references[comp.result]
-      references[comp].update([e for e in elements if e not in names])
-    elif comp.is_call():
-      elements = references[comp.function].copy()
-      if comp.argument is not None:
-        elements.update(references[comp.argument])
-      references[comp] = elements
-    elif comp.is_lambda():
-      elements = references[comp.result]
-      references[comp] = set([e for e in elements if e != comp.parameter_name])
-    elif comp.is_selection():
-      references[comp] = references[comp.source]
-    elif comp.is_struct():
-      elements = [references[e] for e in comp]
-      references[comp] = set(itertools.chain.from_iterable(elements))
-    else:
-      references[comp] = set()
+    references[comp] = set(comp.unbound_references)
     return comp, False
 
   transform_postorder(comp, _update)
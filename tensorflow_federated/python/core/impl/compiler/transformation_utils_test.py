@@ -12,6 +12,8 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import sys
+
 from absl.testing import absltest
 from absl.testing import parameterized
 import tensorflow as tf
@@ -115,6 +117,15 @@ def _construct_trivial_instance_of_all_computation_building_blocks():
   return cbb_list
 
 
+def _construct_deep_chain_of_blocks(depth):
+  """Constructs `depth` nested blocks, deeper than the recursion limit."""
+  comp = building_blocks.Data('data', tf.int32)
+  for i in range(depth):
+    local = building_blocks.Data('local_{}'.format(i), tf.int32)
+    comp = building_blocks.Block([('x', local)], comp)
+  return comp
+
+
 def _get_number_of_nodes_via_transform_postorder(comp, predicate=None):
   """Returns the number of nodes in `comp` matching `predicate`."""
   py_typecheck.check_type(comp, building_blocks.ComputationBuildingBlock)
@@ -324,6 +335,42 @@ class TransformationUtilsTest(parameterized.TestCase):
 
     self.assertEqual(leaf_name_order, list(postorder_nodes))
 
+  def test_transform_postorder_handles_ast_deeper_than_recursion_limit(self):
+    depth = 2 * sys.getrecursionlimit()
+    deep_ast = _construct_deep_chain_of_blocks(depth)
+
+    self.assertEqual(
+        _get_number_of_nodes_via_transform_postorder(deep_ast), 2 * depth + 1)
+
+    def transform(comp):
+      if comp.is_data() and comp.uri == 'data':
+        return building_blocks.Data('other_data', tf.int32), True
+      return comp, False
+
+    transformed, modified = transformation_utils.transform_postorder(
+        deep_ast, transform)
+
+    self.assertTrue(modified)
+    for _ in range(depth):
+      self.assertTrue(transformed.is_block())
+      transformed = transformed.result
+    self.assertEqual(transformed.uri, 'other_data')
+
+  def test_transform_preorder_handles_ast_deeper_than_recursion_limit(self):
+    depth = 2 * sys.getrecursionlimit()
+    deep_ast = _construct_deep_chain_of_blocks(depth)
+
+    self.assertEqual(
+        _get_number_of_nodes_via_transform_preorder(deep_ast), 2 * depth + 1)
+
+  def test_transform_postorder_with_symbol_bindings_handles_deep_ast(self):
+    depth = 2 * sys.getrecursionlimit()
+    deep_ast = _construct_deep_chain_of_blocks(depth)
+
+    self.assertEqual(
+        _get_number_of_nodes_via_transform_postorder_with_symbol_bindings(
+            deep_ast), 2 * depth + 1)
+
   # TODO(b/113123410): Add more tests for corner cases of `transform_preorder`.
 
   def test_transform_postorder_with_symbol_bindings_fails_on_none_comp(self):
@@ -1727,6 +1774,11 @@ class GetUniqueNamesTest(absltest.TestCase):
     names = transformation_utils.get_unique_names(block_2)
     self.assertCountEqual(names, ('x', 'y', 'z'))
 
+  def test_handles_ast_deeper_than_recursion_limit(self):
+    deep_ast = _construct_deep_chain_of_blocks(2 * sys.getrecursionlimit())
+    names = transformation_utils.get_unique_names(deep_ast)
+    self.assertCountEqual(names, ('x',))
+
 
 class HasUniqueNamesTest(absltest.TestCase):
 
@@ -1812,6 +1864,26 @@ class GetMapOfUnboundReferencesTest(absltest.TestCase):
         call_on_x_ref)[lambda_1]
     self.assertEmpty(unbound_refs)
 
+  def test_returns_unbound_references_of_each_comp(self):
+    x_ref = building_blocks.Reference('x', tf.int32)
+    y_ref = building_blocks.Reference('y', tf.int32)
+    struct = building_blocks.Struct([x_ref, y_ref])
+    lambda_1 = building_blocks.Lambda('x', tf.int32, struct)
+    unbound_refs = transformation_utils.get_map_of_unbound_references(lambda_1)
+    self.assertLen(unbound_refs, 4)
+    self.assertEqual(unbound_refs[lambda_1], set(['y']))
+    self.assertEqual(unbound_refs[struct], set(['x', 'y']))
+    self.assertEqual(unbound_refs[x_ref], set(['x']))
+
+  def test_returned_sets_can_be_modified(self):
+    x_ref = building_blocks.Reference('x', tf.int32)
+    selection = building_blocks.Selection(
+        building_blocks.Struct([x_ref]), index=0)
+    unbound_refs = transformation_utils.get_map_of_unbound_references(
+        selection)[selection]
+    unbound_refs.add('y')
+    self.assertEqual(selection.unbound_references, frozenset(['x']))
+
 
 if __name__ == '__main__':
   absltest.main()
@@ -17,7 +17,7 @@ A composite transformation is one that applies multiple atomic transformation to
 an AST either pointwise or serially.
 """
 
-from typing import Mapping
+from typing import Mapping, Optional
 
 from absl import logging
 
@@ -27,6 +27,7 @@ from tensorflow_federated.python.core.impl import tree_to_cc_transformations
 from tensorflow_federated.python.core.impl.compiler import building_block_factory
 from tensorflow_federated.python.core.impl.compiler import building_blocks
 from tensorflow_federated.python.core.impl.compiler import compiled_computation_transforms
+from tensorflow_federated.python.core.impl.compiler import pass_manager as pass_manager_lib
 from tensorflow_federated.python.core.impl.compiler import transformation_utils
 from tensorflow_federated.python.core.impl.compiler import tree_analysis
 from tensorflow_federated.python.core.impl.compiler import tree_transformations
@@ -270,8 +271,7 @@ def _construct_tensorflow_representing_single_local_assignment(
 
 def _get_unbound_ref(block):
   """Helper to get unbound ref name and type spec if it exists in `block`."""
-  all_unbound_refs = transformation_utils.get_map_of_unbound_references(block)
-  top_level_unbound_ref = all_unbound_refs[block]
+  top_level_unbound_ref = set(block.unbound_references)
   num_unbound_refs = len(top_level_unbound_ref)
   if num_unbound_refs == 0:
     return None
@@ -643,9 +643,7 @@ class TensorFlowGenerator(transformation_utils.TransformSpec):
         comp.is_call() and comp.function.is_compiled_computation()):
       # These represent the final result of TF generation; no need to transform.
       return False
-    unbound_refs = transformation_utils.get_map_of_unbound_references(
-        comp)[comp]
-    if unbound_refs:
+    if comp.unbound_references:
       # We cannot represent these captures without further information.
       return False
     if tree_analysis.contains_types(comp, building_blocks.Intrinsic):
@@ -667,7 +665,8 @@ def compile_local_computation_to_tensorflow(comp):
 
 
 def transform_to_call_dominant(
-    comp: building_blocks.ComputationBuildingBlock
+    comp: building_blocks.ComputationBuildingBlock,
+    pass_manager: Optional[pass_manager_lib.PassManager] = None
 ) -> transformation_utils.TransformReturnType:
   """Normalizes computations into Call-Dominant Form.
 
@@ -692,8 +691,17 @@ def transform_to_call_dominant(
   Note that if no lambda takes a functional parameter, the final case in
   the enumeration above is additionally disallowed.
 
+  The passes are run by a `pass_manager.PassManager`, which records the time
+  spent in each pass. When a pass is rerun, the local passes do not revisit the
+  subtrees they have already left unmodified, while the whole-tree passes are
+  only skipped if they have already left the entire tree unmodified.
+
   Args:
     comp: Instance of `building_blocks.ComputationBuildingBlock` to transform.
+    pass_manager: An optional `pass_manager.PassManager` to run the passes
+      with, for example to inspect its `timings` or to share its state between
+      computations which have subtrees in common. If not specified, a new
+      `pass_manager.PassManager` is used.
 
   Returns:
     A two-tuple, whose first element is a building block representing the same
@@ -701,6 +709,10 @@ def transform_to_call_dominant(
     any transformations were in fact run.
   """
   py_typecheck.check_type(comp, building_blocks.ComputationBuildingBlock)
+  if pass_manager is None:
+    pass_manager = pass_manager_lib.PassManager()
+  else:
+    py_typecheck.check_type(pass_manager, pass_manager_lib.PassManager)
 
   def _check_calls_are_concrete(comp):
     """Encodes condition for completeness of direct extraction of calls.
@@ -815,17 +827,27 @@ def transform_to_call_dominant(
   def _resolve_calls_to_concrete_functions(comp):
     """Removes symbol bindings which contain functional types."""
 
-    comp, refs_renamed = tree_transformations.uniquify_reference_names(comp)
-    comp, fns_resolved = tree_transformations.resolve_higher_order_functions(
-        comp)
-    comp, called_lambdas_replaced = tree_transformations.replace_called_lambda_with_block(
-        comp)
-    comp, selections_inlined = tree_transformations.inline_selections_from_tuple(
-        comp)
+    comp, refs_renamed = pass_manager.run_pass(
+        'uniquify_reference_names', comp,
+        tree_transformations.uniquify_reference_names)
+    comp, fns_resolved = pass_manager.run_pass(
+        'resolve_higher_order_functions', comp,
+        tree_transformations.resolve_higher_order_functions)
+    comp, called_lambdas_replaced = pass_manager.run_pass(
+        'replace_called_lambda_with_block', comp,
+        tree_transformations.replace_called_lambda_with_block)
+    comp, selections_inlined = pass_manager.run_pass(
+        'inline_selections_from_tuple', comp,
+        tree_transformations.inline_selections_from_tuple)
     if selections_inlined:
-      comp, _ = tree_transformations.uniquify_reference_names(comp)
-    comp, fns_inlined = _inline_functions(comp)
-    comp, locals_removed = tree_transformations.remove_unused_block_locals(comp)
+      comp, _ = pass_manager.run_pass(
+          'uniquify_reference_names', comp,
+          tree_transformations.uniquify_reference_names)
+    comp, fns_inlined = pass_manager.run_pass('inline_functions', comp,
+                                              _inline_functions)
+    comp, locals_removed = pass_manager.run_local_pass(
+        'remove_unused_block_locals', comp,
+        lambda _: tree_transformations.RemoveUnusedBlockLocals())
 
     modified = (
         refs_renamed or fns_resolved or called_lambdas_replaced or
@@ -835,16 +857,28 @@ def transform_to_call_dominant(
   comp, modified = _resolve_calls_to_concrete_functions(comp)
   _check_calls_are_concrete(comp)
 
-  for transform in [
-      _extract_calls_and_blocks,
+  for name, transform in [
+      ('extract_calls_and_blocks', _extract_calls_and_blocks),
       # Extraction can leave some tuples packing references to clean up. Leaving
       # would not violate CDF, but we prefer to do this for cleanliness.
-      tree_transformations.inline_selections_from_tuple,
-      tree_transformations.merge_chained_blocks,
-      tree_transformations.remove_duplicate_block_locals,
-      tree_transformations.remove_unused_block_locals,
-      tree_transformations.uniquify_reference_names,
+      ('inline_selections_from_tuple',
+       tree_transformations.inline_selections_from_tuple),
   ]:
-    comp, transformed = transform(comp)
+    comp, transformed = pass_manager.run_pass(name, comp, transform)
     modified = modified or transformed
+  comp, transformed = pass_manager.run_local_pass(
+      'merge_chained_blocks', comp, tree_transformations.MergeChainedBlocks)
+  modified = modified or transformed
+  comp, transformed = pass_manager.run_pass(
+      'remove_duplicate_block_locals', comp,
+      tree_transformations.remove_duplicate_block_locals)
+  modified = modified or transformed
+  comp, transformed = pass_manager.run_local_pass(
+      'remove_unused_block_locals', comp,
+      lambda _: tree_transformations.RemoveUnusedBlockLocals())
+  modified = modified or transformed
+  comp, transformed = pass_manager.run_pass(
+      'uniquify_reference_names', comp,
+      tree_transformations.uniquify_reference_names)
+  modified = modified or transformed
   return comp, modified
@@ -413,12 +413,11 @@ def contains_no_unbound_references(tree, excluding=None):
   py_typecheck.check_type(tree, building_blocks.ComputationBuildingBlock)
   if isinstance(excluding, str):
     excluding = [excluding]
-  unbound_references = transformation_utils.get_map_of_unbound_references(tree)
   if excluding is not None:
     excluding = set(excluding)
-    names = unbound_references[tree] - excluding
+    names = tree.unbound_references - excluding
   else:
-    names = unbound_references[tree]
+    names = tree.unbound_references
   return len(names) == 0  # pylint: disable=g-explicit-length-test
 
 
@@ -489,6 +488,10 @@ def trees_equal(comp_1, comp_2):
     # will not be equal to its baseclass.
     if comp_1 is None or comp_2 is None:
       return comp_1 is None and comp_2 is None
+    # Unless references are renamed, a tree is equal to itself; in particular,
+    # this makes comparing hash-consed trees constant time.
+    if comp_1 is comp_2 and not reference_equivalences:
+      return True
     if type(comp_1) != type(comp_2):  # pylint: disable=unidiomatic-typecheck
       return False
     if comp_1.type_signature != comp_2.type_signature:
@@ -383,6 +383,12 @@ class ComputationsEqualTest(absltest.TestCase):
     data = building_blocks.Data('data', tf.int32)
     self.assertTrue(tree_analysis.trees_equal(data, data))
 
+  def test_returns_false_for_same_reference_bound_to_different_names(self):
+    ref = building_blocks.Reference('a', tf.int32)
+    comp_1 = building_blocks.Lambda('a', tf.int32, ref)
+    comp_2 = building_blocks.Lambda('b', tf.int32, ref)
+    self.assertFalse(tree_analysis.trees_equal(comp_1, comp_2))
+
   def test_returns_false_for_comps_with_different_types(self):
     data = building_blocks.Data('data', tf.int32)
     ref = building_blocks.Reference('a', tf.int32)
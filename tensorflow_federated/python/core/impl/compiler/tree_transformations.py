@@ -110,15 +110,12 @@ class ExtractComputation(transformation_utils.TransformSpec):
     tree_analysis.check_has_unique_names(comp)
     self._name_generator = building_block_factory.unique_name_generator(comp)
     self._predicate = predicate
-    self._unbound_references = transformation_utils.get_map_of_unbound_references(
-        comp)
 
   def _contains_unbound_reference(self, comp, names):
     """Returns `True` if `comp` contains unbound references to `names`.
 
-    This function will update the non-local `_unbound_references` captured from
-    the parent context if `comp` is not contained in that collection. This can
-    happen when new computations are created and added to the AST.
+    The unbound references are cached on `comp`, including on computations
+    which are created and added to the AST by this transformation.
 
     Args:
       comp: The computation building block to test.
@@ -126,10 +123,7 @@ class ExtractComputation(transformation_utils.TransformSpec):
     """
     if isinstance(names, str):
       names = (names,)
-    if comp not in self._unbound_references:
-      references = transformation_utils.get_map_of_unbound_references(comp)
-      self._unbound_references.update(references)
-    return any(n in self._unbound_references[comp] for n in names)
+    return any(n in comp.unbound_references for n in names)
 
   def _passes_test_or_block(self, comp):
     """Returns `True` if `comp` matches the `predicate` or is a block."""
@@ -1190,16 +1184,14 @@ class RemoveUnusedBlockLocals(transformation_utils.TransformSpec):
   def transform(self, comp):
     if not self.should_transform(comp):
       return comp, False
-    unbound_ref_set = transformation_utils.get_map_of_unbound_references(
-        comp.result)[comp.result]
+    unbound_ref_set = set(comp.result.unbound_references)
     if (not unbound_ref_set) or (not comp.locals):
       return comp.result, True
     new_locals = []
     for name, val in reversed(comp.locals):
       if name in unbound_ref_set:
         new_locals.append((name, val))
-        unbound_ref_set = unbound_ref_set.union(
-            transformation_utils.get_map_of_unbound_references(val)[val])
+        unbound_ref_set = unbound_ref_set.union(val.unbound_references)
         unbound_ref_set.discard(name)
     if len(new_locals) == len(comp.locals):
       return comp, False
@@ -1718,8 +1710,7 @@ def group_block_locals_by_namespace(block):
     variables declared.
   """
   py_typecheck.check_type(block, building_blocks.Block)
-  all_unbound_refs = transformation_utils.get_map_of_unbound_references(block)
-  top_level_unbound_ref = all_unbound_refs[block]
+  top_level_unbound_ref = set(block.unbound_references)
   local_variables = block.locals
 
   arg_classes = [top_level_unbound_ref]
@@ -1730,7 +1721,7 @@ def group_block_locals_by_namespace(block):
     arg_classes.append(final_arg_class)
 
   comps_yet_to_partition = [
-      (name, comp, all_unbound_refs[comp]) for (name, comp) in local_variables
+      (name, comp, comp.unbound_references) for (name, comp) in local_variables
   ]
   comp_classes = []
   for args in arg_classes:
@@ -1891,9 +1882,7 @@ def unwrap_placement(comp):
 
   name_generator = building_block_factory.unique_name_generator(comp)
 
-  all_unbound_references = transformation_utils.get_map_of_unbound_references(
-      comp)
-  root_unbound_references = all_unbound_references[comp]
+  root_unbound_references = set(comp.unbound_references)
 
   if len(root_unbound_references) > 1:
     raise ValueError(
@@ -13,6 +13,8 @@
 # limitations under the License.
 """Defines the implementation of the base Computation interface."""
 
+import hashlib
+
 from tensorflow_federated.proto.v0 import computation_pb2 as pb
 from tensorflow_federated.python.common_libs import py_typecheck
 from tensorflow_federated.python.core.api import computation_types
@@ -72,13 +74,80 @@ class ComputationImpl(function_utils.ConcreteFunction):
 
     super().__init__(type_spec, context_stack)
     self._computation_proto = computation_proto
+    self._cached_fingerprint = None
+
+  @property
+  def fingerprint(self) -> bytes:
+    """Returns a digest of the deterministically serialized computation.
+
+    The fingerprint is the 32-byte BLAKE2b digest of `computation_proto`
+    serialized with `deterministic=True`. It is computed on first use and
+    memoized, so hashing, comparing, and looking up this computation in caches
+    does not serialize the (potentially large) proto again.
+
+    Note: The fingerprint assumes that `computation_proto` is not mutated after
+    this computation is constructed.
+    """
+    if self._cached_fingerprint is None:
+      self._cached_fingerprint = hashlib.blake2b(
+          self._computation_proto.SerializeToString(deterministic=True),
+          digest_size=32).digest()
+    return self._cached_fingerprint
 
   def __eq__(self, other):
     if self is other:
       return True
     elif not isinstance(other, ComputationImpl):
       return NotImplemented
-    return self._computation_proto == other._computation_proto
+    return self.fingerprint == other.fingerprint
 
   def __hash__(self) -> int:
-    return hash(self._computation_proto.SerializeToString(deterministic=True))
+    return hash(self.fingerprint)
+
+
+def mark_associative(comp: ComputationImpl) -> ComputationImpl:
+  """Returns a copy of `comp` marked as an associative binary operator.
+
+  An operator `op` marked as associative may be applied by executors in any
+  grouping, for example, `federated_reduce` may compute `op(op(a, b), op(c, d))`
+  rather than `op(op(op(a, b), c), d)`, such that the reduction of `N` values
+  can be computed in `log(N)` sequential calls. The order of the operands is
+  preserved, so `comp` does not need to be commutative.
+
+  The mark is carried by the TensorFlow computation itself, so it is kept as
+  long as the computation is not rewritten; otherwise executors apply the
+  operator sequentially.
+
+  Args:
+    comp: An instance of `ComputationImpl` representing a TensorFlow
+      computation of type `(<T,T> -> T)`.
+
+  Returns:
+    A new instance of `ComputationImpl` equivalent to `comp`, and marked as
+    associative.
+
+  Raises:
+    TypeError: If `comp` is not a `ComputationImpl` of type `(<T,T> -> T)`.
+    ValueError: If `comp` is not a TensorFlow computation.
+  """
+  py_typecheck.check_type(comp, ComputationImpl)
+  type_signature = comp.type_signature
+  parameter_type = type_signature.parameter
+  if (parameter_type is None or not parameter_type.is_struct() or
+      len(parameter_type) != 2 or
+      not all(t.is_equivalent_to(type_signature.result)
+              for t in parameter_type)):
+    raise TypeError(
+        'Expected a binary operator of type `(<T,T> -> T)`, found {}.'.format(
+            type_signature))
+  computation_proto = pb.Computation()
+  computation_proto.CopyFrom(ComputationImpl.get_proto(comp))
+  if computation_proto.WhichOneof('computation') != 'tensorflow':
+    raise ValueError(
+        'Only TensorFlow computations can be marked associative, found a {} '
+        'computation.'.format(computation_proto.WhichOneof('computation')))
+  computation_proto.tensorflow.associative = True
+  return ComputationImpl(
+      computation_proto,
+      comp._context_stack,  # pylint: disable=protected-access
+      annotated_type=type_signature)
@@ -18,6 +18,7 @@ import tensorflow as tf
 from tensorflow_federated.proto.v0 import computation_pb2 as pb
 from tensorflow_federated.python.core.api import computation_types
 from tensorflow_federated.python.core.impl import computation_impl
+from tensorflow_federated.python.core.impl.compiler import tensorflow_computation_factory
 from tensorflow_federated.python.core.impl.context_stack import context_stack_impl
 from tensorflow_federated.python.core.impl.types import type_serialization
 
@@ -48,6 +49,76 @@ class ComputationImplTest(absltest.TestCase):
     self.assertRaises(TypeError, computation_impl.ComputationImpl, 10,
                       context_stack_impl.context_stack)
 
+  def test_fingerprint_identifies_equal_computations(self):
+
+    def _create_computation(uri):
+      return computation_impl.ComputationImpl(
+          pb.Computation(
+              **{
+                  'type':
+                      type_serialization.serialize_type(
+                          computation_types.FunctionType(tf.int32, tf.int32)),
+                  'intrinsic':
+                      pb.Intrinsic(uri=uri)
+              }), context_stack_impl.context_stack)
+
+    comp = _create_computation('foo')
+    same_comp = _create_computation('foo')
+    other_comp = _create_computation('bar')
+    self.assertLen(comp.fingerprint, 32)
+    self.assertIs(comp.fingerprint, comp.fingerprint)
+    self.assertEqual(comp.fingerprint, same_comp.fingerprint)
+    self.assertEqual(comp, same_comp)
+    self.assertEqual(hash(comp), hash(same_comp))
+    self.assertNotEqual(comp.fingerprint, other_comp.fingerprint)
+    self.assertNotEqual(comp, other_comp)
+
+
+class MarkAssociativeTest(absltest.TestCase):
+
+  def test_returns_marked_copy_of_computation(self):
+    operand_type = computation_types.TensorType(tf.int64)
+    proto, type_signature = (
+        tensorflow_computation_factory.create_binary_operator(
+            tf.maximum, operand_type))
+    comp = computation_impl.ComputationImpl(proto,
+                                            context_stack_impl.context_stack)
+
+    marked_comp = computation_impl.mark_associative(comp)
+
+    marked_proto = computation_impl.ComputationImpl.get_proto(marked_comp)
+    self.assertTrue(marked_proto.tensorflow.associative)
+    self.assertFalse(proto.tensorflow.associative)
+    self.assertTrue(marked_comp.type_signature.is_equivalent_to(type_signature))
+    self.assertNotEqual(marked_comp, comp)
+
+  def test_raises_type_error_with_python_function(self):
+    with self.assertRaises(TypeError):
+      computation_impl.mark_associative(lambda x, y: x + y)
+
+  def test_raises_type_error_with_non_binary_operator(self):
+    proto, _ = tensorflow_computation_factory.create_identity(
+        computation_types.TensorType(tf.int64))
+    comp = computation_impl.ComputationImpl(proto,
+                                            context_stack_impl.context_stack)
+    with self.assertRaises(TypeError):
+      computation_impl.mark_associative(comp)
+
+  def test_raises_value_error_with_non_tensorflow_computation(self):
+    operand_type = computation_types.TensorType(tf.int32)
+    comp = computation_impl.ComputationImpl(
+        pb.Computation(
+            **{
+                'type':
+                    type_serialization.serialize_type(
+                        computation_types.FunctionType(
+                            [operand_type, operand_type], operand_type)),
+                'intrinsic':
+                    pb.Intrinsic(uri='whatever')
+            }), context_stack_impl.context_stack)
+    with self.assertRaises(ValueError):
+      computation_impl.mark_associative(comp)
+
 
 if __name__ == '__main__':
   absltest.main()
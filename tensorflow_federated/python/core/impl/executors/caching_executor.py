@@ -15,6 +15,10 @@
 
 import asyncio
 import collections
+import functools
+import hashlib
+import weakref
+
 import cachetools
 
 import numpy as np
@@ -28,6 +32,7 @@ from tensorflow_federated.python.core.impl import computation_impl
 from tensorflow_federated.python.core.impl import type_utils
 from tensorflow_federated.python.core.impl.executors import executor_base
 from tensorflow_federated.python.core.impl.executors import executor_value_base
+from tensorflow_federated.python.core.impl.executors import sizing_executor
 
 
 class HashableWrapper(collections.Hashable):
@@ -43,6 +48,50 @@ class HashableWrapper(collections.Hashable):
     return other is HashableWrapper and other._target is self._target  # pylint: disable=protected-access
 
 
+# The digests of immutable `np.ndarray`s, keyed by the `id` of the array. An
+# entry is removed when the array it was computed for is garbage collected.
+_ndarray_digests = {}
+
+
+def _get_digest(buffer) -> bytes:
+  """Returns a fixed-size digest of the bytes of `buffer`."""
+  return hashlib.blake2b(buffer, digest_size=32).digest()
+
+
+def _get_ndarray_digest(value: np.ndarray) -> bytes:
+  """Returns a digest of the contents of `value`.
+
+  The digest is computed over the buffer of `value` directly, so (unless `value`
+  is not contiguous) the contents of `value` are not copied. The digest of an
+  immutable array (one that is not writeable and either owns its data or is
+  backed by a `bytes` object) is memoized for the lifetime of the array, so
+  repeatedly hashing the same array (e.g., the same model weights broadcast on
+  every round) only hashes its contents once. The digest of any other array is
+  not memoized, because the contents of the array may change in place.
+
+  Note: NumPy arrays are writeable by default, so the contents of most arrays
+  passed to `create_value` are hashed again on every call. Only arrays which
+  have been made read-only (e.g., with `value.setflags(write=False)`) benefit
+  from the memoized digest.
+
+  Args:
+    value: A `np.ndarray`.
+  """
+  if value.dtype.hasobject:
+    # The buffer of an array of objects only holds references to the objects.
+    return _get_digest(value.tobytes())
+  if value.flags.writeable or not (value.flags.owndata or
+                                  isinstance(value.base, bytes)):
+    return _get_digest(np.ascontiguousarray(value))
+  key = id(value)
+  digest = _ndarray_digests.get(key)
+  if digest is None:
+    digest = _get_digest(np.ascontiguousarray(value))
+    _ndarray_digests[key] = digest
+    weakref.finalize(value, _ndarray_digests.pop, key, None)
+  return digest
+
+
 def _get_hashable_key(value, type_spec):
   """Return a hashable key for value `value` of TFF type `type_spec`.
 
@@ -76,10 +125,10 @@ def _get_hashable_key(value, type_spec):
     else:
       return tuple([_get_hashable_key(x, type_spec.member) for x in value])
   elif isinstance(value, pb.Computation):
-    return value.SerializeToString(deterministic=True)
+    return _get_digest(value.SerializeToString(deterministic=True))
   elif isinstance(value, np.ndarray):
-    return ('<dtype={},shape={}>'.format(value.dtype,
-                                         value.shape), value.tobytes())
+    return ('<dtype={},shape={}>'.format(value.dtype, value.shape),
+            _get_ndarray_digest(value))
   elif (isinstance(value, collections.Hashable) and
         not isinstance(value, (tf.Tensor, tf.Variable))):
     # TODO(b/139200385): Currently Tensor and Variable returns True for
@@ -142,6 +191,7 @@ class CachedValue(executor_value_base.ExecutorValue):
     self._type_spec = type_spec
     self._target_future = target_future
     self._computed_result = None
+    self._dependents = weakref.WeakSet()
 
   @property
   def type_signature(self):
@@ -159,6 +209,16 @@ class CachedValue(executor_value_base.ExecutorValue):
   def target_future(self):
     return self._target_future
 
+  @property
+  def dependents(self):
+    """The cached values created from this value, while they are alive."""
+    return list(self._dependents)
+
+  def add_dependent(self, value):
+    """Records that the cached `value` was created from this value."""
+    py_typecheck.check_type(value, CachedValue)
+    self._dependents.add(value)
+
   async def compute(self):
     if self._computed_result is None:
       target_value = await self._target_future
@@ -168,6 +228,78 @@ class CachedValue(executor_value_base.ExecutorValue):
 
 _DEFAULT_CACHE_SIZE = 1000
 
+# A nominal size in bytes of every entry in a `SizeBoundedLRUCache`, which also
+# bounds the number of entries whose values have no estimated size, such as
+# identifiers and computations.
+_CACHE_ENTRY_OVERHEAD_BYTES = 64
+
+
+def _get_cache_entry_size_in_bytes(value, cardinalities=None) -> int:
+  """Returns the estimated size in bytes of an entry of a `CachingExecutor`."""
+  if isinstance(value, CachedValue):
+    return _CACHE_ENTRY_OVERHEAD_BYTES + sizing_executor.get_type_size_in_bytes(
+        value.type_signature, cardinalities)
+  return _CACHE_ENTRY_OVERHEAD_BYTES
+
+
+class SizeBoundedLRUCache(cachetools.LRUCache):
+  """An LRU cache bounded by the estimated size in bytes of the cached values.
+
+  The size of each `CachedValue` is estimated from its type signature using
+  `sizing_executor.get_type_size_in_bytes`, plus a nominal overhead per entry.
+  When the total size exceeds `max_size_bytes`, the least recently used entries
+  are evicted. A value larger than `max_size_bytes` is not cached at all.
+  """
+
+  def __init__(self, max_size_bytes: int, cardinalities=None):
+    """Creates a `SizeBoundedLRUCache`.
+
+    Args:
+      max_size_bytes: The maximum total estimated size in bytes of the entries.
+      cardinalities: An optional mapping from placements to the number of
+        participants at each placement, used to estimate the size of federated
+        values. If unspecified, a federated value is estimated to have the size
+        of a single member.
+
+    Raises:
+      TypeError: If `max_size_bytes` is not an integer.
+      ValueError: If `max_size_bytes` is not positive.
+    """
+    py_typecheck.check_type(max_size_bytes, int)
+    if max_size_bytes < 1:
+      raise ValueError('Expected a positive `max_size_bytes`, found {}.'.format(
+          max_size_bytes))
+    super().__init__(
+        max_size_bytes,
+        getsizeof=functools.partial(
+            _get_cache_entry_size_in_bytes, cardinalities=cardinalities))
+    self._evictions = 0
+
+  @property
+  def size_bytes(self) -> int:
+    return self.currsize
+
+  @property
+  def evictions(self) -> int:
+    return self._evictions
+
+  def __setitem__(self, key, value):
+    if self.getsizeof(value) > self.maxsize:
+      self.pop(key, None)
+      return
+    super().__setitem__(key, value)
+
+  def popitem(self):
+    item = super().popitem()
+    self._evictions += 1
+    return item
+
+  def clear(self):
+    # `MutableMapping.clear` removes the entries using `popitem`, which would
+    # count them as evictions.
+    for key in list(self):
+      del self[key]
+
 
 class CachingExecutor(executor_base.Executor):
   """The caching executor only performs caching."""
@@ -185,7 +317,9 @@ class CachingExecutor(executor_base.Executor):
     Args:
       target_executor: An instance of `executor_base.Executor`.
       cache: The cache to use (must be an instance of `cachetools.Cache`). If
-        unspecified, by default we construct a 1000-element LRU cache.
+        unspecified, by default we construct a 1000-element LRU cache. To bound
+        the cache by the estimated size of the values rather than the number of
+        entries, use a `SizeBoundedLRUCache`.
     """
     py_typecheck.check_type(target_executor, executor_base.Executor)
     if cache is not None:
@@ -195,6 +329,28 @@ class CachingExecutor(executor_base.Executor):
     self._target_executor = target_executor
     self._cache = cache
     self._num_values_created = 0
+    self._hits = 0
+    self._misses = 0
+
+  @property
+  def cache(self) -> cachetools.Cache:
+    return self._cache
+
+  @property
+  def hits(self) -> int:
+    """The number of values created by this executor found in the cache."""
+    return self._hits
+
+  @property
+  def misses(self) -> int:
+    """The number of values created by this executor not found in the cache."""
+    return self._misses
+
+  @property
+  def hit_rate(self) -> float:
+    """The fraction of values created by this executor found in the cache."""
+    total = self._hits + self._misses
+    return self._hits / total if total else 0.0
 
   def close(self):
     self._cache.clear()
@@ -204,14 +360,45 @@ class CachingExecutor(executor_base.Executor):
     for k in list(self._cache):
       del self._cache[k]
 
+  def _invalidate(self, cached_value):
+    """Removes `cached_value` and the values created from it from the cache.
+
+    This is called when the target executor fails to create `cached_value`,
+    such that it is created again the next time it is requested, while all
+    other values remain cached. Entries that no longer refer to
+    `cached_value`, for example because it was already invalidated by a
+    concurrent call and created again, are left untouched.
+
+    Args:
+      cached_value: An instance of `CachedValue`.
+    """
+    visited = set()
+    to_invalidate = [cached_value]
+    while to_invalidate:
+      value = to_invalidate.pop()
+      if id(value) in visited:
+        continue
+      visited.add(id(value))
+      if self._cache.get(value.identifier) is value:
+        del self._cache[value.identifier]
+        if (value.hashable_key is not None and
+            self._cache.get(value.hashable_key) == value.identifier):
+          del self._cache[value.hashable_key]
+      to_invalidate.extend(value.dependents)
+
   async def create_value(self, value, type_spec=None):
     type_spec = computation_types.to_type(type_spec)
     if isinstance(value, computation_impl.ComputationImpl):
-      return await self.create_value(
-          computation_impl.ComputationImpl.get_proto(value),
-          type_utils.reconcile_value_with_type_spec(value, type_spec))
-    py_typecheck.check_type(type_spec, computation_types.Type)
-    hashable_key = _get_hashable_key(value, type_spec)
+      # The fingerprint is the digest of the serialized `pb.Computation`, so it
+      # is the same key `_get_hashable_key` returns for the proto, but it is
+      # memoized on the computation rather than recomputed on every call.
+      hashable_key = value.fingerprint
+      type_spec = type_utils.reconcile_value_with_type_spec(value, type_spec)
+      value = computation_impl.ComputationImpl.get_proto(value)
+      py_typecheck.check_type(type_spec, computation_types.Type)
+    else:
+      py_typecheck.check_type(type_spec, computation_types.Type)
+      hashable_key = _get_hashable_key(value, type_spec)
     try:
       identifier = self._cache.get(hashable_key)
     except TypeError as err:
@@ -225,31 +412,30 @@ class CachingExecutor(executor_base.Executor):
       # which may be a legitimate use case if (as it happens) the payload alone
       # does not uniquely determine the type, so we simply opt not to reuse the
       # cache value and fallback on the regular behavior.
-      if (cached_value is not None and type_spec is not None and
+      # The value may also have been evicted from the cache independently of
+      # its identifier, in which case it needs to be created again.
+      if cached_value is None or (
+          type_spec is not None and
           not cached_value.type_signature.is_equivalent_to(type_spec)):
         identifier = None
     else:
       identifier = None
     if identifier is None:
+      self._misses += 1
       self._num_values_created = self._num_values_created + 1
       identifier = CachedValueIdentifier(str(self._num_values_created))
       self._cache[hashable_key] = identifier
       target_future = asyncio.ensure_future(
           self._target_executor.create_value(value, type_spec))
-      cached_value = None
-    if cached_value is None:
       cached_value = CachedValue(identifier, hashable_key, type_spec,
                                  target_future)
       self._cache[identifier] = cached_value
+    else:
+      self._hits += 1
     try:
       await cached_value.target_future
     except Exception:
-      # Invalidate the entire cache in the inner executor had an exception.
-      # TODO(b/145514490): This is a bit heavy handed, there maybe caches where
-      # only the current cache item needs to be invalidated; however this
-      # currently only occurs when an inner RemoteExecutor has the backend go
-      # down.
-      self._cache = {}
+      self._invalidate(cached_value)
       raise
     # No type check is necessary here; we have either checked
     # `is_equivalent_to` or just constructed `target_value`
@@ -272,19 +458,20 @@ class CachingExecutor(executor_base.Executor):
     identifier = CachedValueIdentifier(identifier_str)
     try:
       cached_value = self._cache[identifier]
+      self._hits += 1
     except KeyError:
+      self._misses += 1
       target_future = asyncio.ensure_future(
           self._target_executor.create_call(*gathered))
       cached_value = CachedValue(identifier, None, type_spec, target_future)
       self._cache[identifier] = cached_value
+      comp.add_dependent(cached_value)
+      if arg is not None:
+        arg.add_dependent(cached_value)
     try:
       target_value = await cached_value.target_future
     except Exception:
-      # TODO(b/145514490): This is a bit heavy handed, there maybe caches where
-      # only the current cache item needs to be invalidated; however this
-      # currently only occurs when an inner RemoteExecutor has the backend go
-      # down.
-      self._cache = {}
+      self._invalidate(cached_value)
       raise
     type_spec.check_assignable_from(target_value.type_signature)
     return cached_value
@@ -311,21 +498,21 @@ class CachingExecutor(executor_base.Executor):
     identifier = CachedValueIdentifier('<{}>'.format(','.join(element_strings)))
     try:
       cached_value = self._cache[identifier]
+      self._hits += 1
     except KeyError:
+      self._misses += 1
       target_future = asyncio.ensure_future(
           self._target_executor.create_struct(
               structure.Struct(
                   (k, v) for (k, _), v in zip(element_kv_pairs, gathered))))
       cached_value = CachedValue(identifier, None, type_spec, target_future)
       self._cache[identifier] = cached_value
+      for _, v in element_kv_pairs:
+        v.add_dependent(cached_value)
     try:
       target_value = await cached_value.target_future
     except Exception:
-      # TODO(b/145514490): This is a bit heavy handed, there maybe caches where
-      # only the current cache item needs to be invalidated; however this
-      # currently only occurs when an inner RemoteExecutor has the backend go
-      # down.
-      self._cache = {}
+      self._invalidate(cached_value)
       raise
     type_spec.check_assignable_from(target_value.type_signature)
     return cached_value
@@ -345,20 +532,19 @@ class CachingExecutor(executor_base.Executor):
     identifier = CachedValueIdentifier(identifier_str)
     try:
       cached_value = self._cache[identifier]
+      self._hits += 1
     except KeyError:
+      self._misses += 1
       target_future = asyncio.ensure_future(
           self._target_executor.create_selection(
               source_val, index=index, name=name))
       cached_value = CachedValue(identifier, None, type_spec, target_future)
       self._cache[identifier] = cached_value
+      source.add_dependent(cached_value)
     try:
       target_value = await cached_value.target_future
     except Exception:
-      # TODO(b/145514490): This is a bit heavy handed, there maybe caches where
-      # only the current cache item needs to be invalidated; however this
-      # currently only occurs when an inner RemoteExecutor has the backend go
-      # down.
-      self._cache = {}
+      self._invalidate(cached_value)
       raise
     type_spec.check_assignable_from(target_value.type_signature)
     return cached_value
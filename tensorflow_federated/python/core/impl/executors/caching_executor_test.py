@@ -17,6 +17,7 @@ import collections
 from unittest import mock
 
 from absl.testing import absltest
+import cachetools
 import numpy as np
 import tensorflow as tf
 
@@ -171,6 +172,11 @@ class GetHashableKeyTest(absltest.TestCase):
     second_key = caching_executor._get_hashable_key(bar_proto, bar_type)
     self.assertNotEqual(hash(first_key), hash(second_key))
 
+  def test_get_key_for_computation_proto_matches_fingerprint(self):
+    foo_proto = computation_impl.ComputationImpl.get_proto(foo)
+    key = caching_executor._get_hashable_key(foo_proto, foo.type_signature)
+    self.assertEqual(key, foo.fingerprint)
+
   def test_get_key_for_identical_ndarray(self):
     array_1 = np.ones(shape=[100, 100])
     tensor_1 = tf.convert_to_tensor(array_1)
@@ -194,6 +200,52 @@ class GetHashableKeyTest(absltest.TestCase):
         array_2, computation_types.TensorType(tensor_2.dtype, tensor_2.shape))
     self.assertNotEqual(first_key, second_key)
 
+  def test_get_key_for_ndarray_has_constant_size(self):
+    small_array = np.ones(shape=[2])
+    large_array = np.ones(shape=[1000, 1000])
+
+    small_key = caching_executor._get_hashable_key(
+        small_array, computation_types.TensorType(tf.float64, [2]))
+    large_key = caching_executor._get_hashable_key(
+        large_array, computation_types.TensorType(tf.float64, [1000, 1000]))
+
+    self.assertLen(small_key[1], len(large_key[1]))
+
+  def test_get_key_for_non_contiguous_ndarray(self):
+    array = np.arange(6).reshape([2, 3])
+    transposed_array = np.ascontiguousarray(array.T)
+
+    first_key = caching_executor._get_hashable_key(
+        array.T, computation_types.TensorType(tf.int64, [3, 2]))
+    second_key = caching_executor._get_hashable_key(
+        transposed_array, computation_types.TensorType(tf.int64, [3, 2]))
+
+    self.assertEqual(first_key, second_key)
+
+  def test_get_key_for_mutated_ndarray(self):
+    array = np.ones(shape=[100, 100])
+    type_spec = computation_types.TensorType(tf.float64, [100, 100])
+
+    first_key = caching_executor._get_hashable_key(array, type_spec)
+    array[50, 50] = 0
+    second_key = caching_executor._get_hashable_key(array, type_spec)
+
+    self.assertNotEqual(first_key, second_key)
+
+  def test_get_key_for_read_only_ndarray_is_memoized(self):
+    array = np.ones(shape=[100, 100])
+    array.flags.writeable = False
+    type_spec = computation_types.TensorType(tf.float64, [100, 100])
+
+    first_key = caching_executor._get_hashable_key(array, type_spec)
+    self.assertIn(id(array), caching_executor._ndarray_digests)
+    second_key = caching_executor._get_hashable_key(array, type_spec)
+
+    self.assertEqual(first_key, second_key)
+    array_id = id(array)
+    del array
+    self.assertNotIn(array_id, caching_executor._ndarray_digests)
+
   def test_get_key_for_same_tensors(self):
     array_1 = np.ones(shape=[100, 100])
     tensor_1 = tf.convert_to_tensor(array_1)
@@ -368,6 +420,45 @@ class CachingExecutorTest(absltest.TestCase):
     self.assertIsInstance(results[0], TestError)
     self.assertIsInstance(results[1], TestError)
 
+  def test_create_value_error_keeps_other_values_cached(self):
+    loop = asyncio.get_event_loop()
+
+    async def create_value_or_raise_error(value, type_spec=None):
+      del type_spec  # Unused.
+      if value == 2.0:
+        raise TestError()
+      return TEST_VALUE
+
+    mock_executor = mock.create_autospec(executor_base.Executor)
+    mock_executor.create_value.side_effect = create_value_or_raise_error
+    cached_executor = caching_executor.CachingExecutor(mock_executor)
+    v1 = loop.run_until_complete(cached_executor.create_value(1.0, tf.float32))
+    with self.assertRaises(TestError):
+      _ = loop.run_until_complete(cached_executor.create_value(2.0, tf.float32))
+    v2 = loop.run_until_complete(cached_executor.create_value(1.0, tf.float32))
+    self.assertIs(v2, v1)
+    self.assertIsInstance(cached_executor.cache, cachetools.LRUCache)
+    self.assertEqual(mock_executor.create_value.call_count, 2)
+
+  def test_invalidate_removes_dependent_values(self):
+    loop = asyncio.get_event_loop()
+    cached_executor = caching_executor.CachingExecutor(
+        eager_tf_executor.EagerTFExecutor())
+    fn = loop.run_until_complete(cached_executor.create_value(foo))
+    other_fn = loop.run_until_complete(cached_executor.create_value(bar))
+    call = loop.run_until_complete(cached_executor.create_call(fn))
+    other_call = loop.run_until_complete(cached_executor.create_call(other_fn))
+    struct = loop.run_until_complete(
+        cached_executor.create_struct([call, other_call]))
+    cached_executor._invalidate(fn)
+    cache = cached_executor.cache
+    self.assertNotIn(fn.identifier, cache)
+    self.assertNotIn(fn.hashable_key, cache)
+    self.assertNotIn(call.identifier, cache)
+    self.assertNotIn(struct.identifier, cache)
+    self.assertIn(other_fn.identifier, cache)
+    self.assertIn(other_call.identifier, cache)
+
   def test_close_clears_cache(self):
     ex, _ = _make_executor_and_tracer_for_test()
     loop = asyncio.get_event_loop()
@@ -378,6 +469,18 @@ class CachingExecutorTest(absltest.TestCase):
     v3 = loop.run_until_complete(ex.create_value(10, tf.int32))
     self.assertIsNot(v3, v1)
 
+  def test_hit_rate(self):
+    ex, _ = _make_executor_and_tracer_for_test()
+    loop = asyncio.get_event_loop()
+    self.assertEqual(ex.hit_rate, 0.0)
+    loop.run_until_complete(ex.create_value(10, tf.int32))
+    loop.run_until_complete(ex.create_value(10, tf.int32))
+    loop.run_until_complete(ex.create_value(10, tf.int32))
+    loop.run_until_complete(ex.create_value(20, tf.int32))
+    self.assertEqual(ex.hits, 2)
+    self.assertEqual(ex.misses, 2)
+    self.assertEqual(ex.hit_rate, 0.5)
+
   def test_with_integer_constant(self):
     ex, tracer = _make_executor_and_tracer_for_test()
     loop = asyncio.get_event_loop()
@@ -559,5 +662,72 @@ class CachingExecutorTest(absltest.TestCase):
     self.assertEqual(result, 10)
 
 
+class SizeBoundedLRUCacheTest(absltest.TestCase):
+
+  def _create_executor(self, max_size_bytes):
+    cache = caching_executor.SizeBoundedLRUCache(max_size_bytes)
+    ex = caching_executor.CachingExecutor(
+        eager_tf_executor.EagerTFExecutor(), cache=cache)
+    return ex, cache
+
+  def test_raises_value_error_with_nonpositive_max_size_bytes(self):
+    with self.assertRaises(ValueError):
+      caching_executor.SizeBoundedLRUCache(0)
+
+  def test_size_bytes_includes_size_of_values(self):
+    ex, cache = self._create_executor(max_size_bytes=10000)
+    loop = asyncio.get_event_loop()
+    small_type = computation_types.TensorType(tf.float32, [10])
+    large_type = computation_types.TensorType(tf.float32, [100])
+    loop.run_until_complete(ex.create_value(np.zeros([10], np.float32),
+                                            small_type))
+    small_size_bytes = cache.size_bytes
+    loop.run_until_complete(ex.create_value(np.zeros([100], np.float32),
+                                            large_type))
+    large_size_bytes = cache.size_bytes - small_size_bytes
+    self.assertEqual(large_size_bytes - small_size_bytes, (100 - 10) * 4)
+
+  def test_evicts_least_recently_used_values(self):
+    # Each value takes 400 bytes, plus the overhead of two entries.
+    ex, cache = self._create_executor(max_size_bytes=1200)
+    loop = asyncio.get_event_loop()
+    type_spec = computation_types.TensorType(tf.float32, [100])
+    v1 = loop.run_until_complete(
+        ex.create_value(np.zeros([100], np.float32), type_spec))
+    v2 = loop.run_until_complete(
+        ex.create_value(np.ones([100], np.float32), type_spec))
+    self.assertEqual(cache.evictions, 0)
+    v3 = loop.run_until_complete(
+        ex.create_value(np.full([100], 2, np.float32), type_spec))
+    self.assertGreater(cache.evictions, 0)
+    self.assertLessEqual(cache.size_bytes, 1200)
+    self.assertNotIn(v1.identifier, cache)
+    self.assertIn(v2.identifier, cache)
+    self.assertIn(v3.identifier, cache)
+    v4 = loop.run_until_complete(
+        ex.create_value(np.zeros([100], np.float32), type_spec))
+    self.assertIsNot(v4, v1)
+    self.assertEqual(loop.run_until_complete(v4.compute()).numpy().sum(), 0)
+
+  def test_does_not_cache_values_larger_than_cache(self):
+    ex, cache = self._create_executor(max_size_bytes=1000)
+    loop = asyncio.get_event_loop()
+    type_spec = computation_types.TensorType(tf.float32, [1000])
+    value = np.zeros([1000], np.float32)
+    v1 = loop.run_until_complete(ex.create_value(value, type_spec))
+    self.assertNotIn(v1.identifier, cache)
+    v2 = loop.run_until_complete(ex.create_value(value, type_spec))
+    self.assertIsNot(v2, v1)
+    self.assertEqual(loop.run_until_complete(v2.compute()).numpy().sum(), 0)
+
+  def test_clear_does_not_count_evictions(self):
+    ex, cache = self._create_executor(max_size_bytes=10000)
+    loop = asyncio.get_event_loop()
+    loop.run_until_complete(ex.create_value(10, tf.int32))
+    ex.close()
+    self.assertEqual(cache.size_bytes, 0)
+    self.assertEqual(cache.evictions, 0)
+
+
 if __name__ == '__main__':
   absltest.main()
@@ -13,7 +13,11 @@
 # limitations under the License.
 """A simple executor that operates synchronously in eager TensorFlow mode."""
 
-from typing import Any, MutableMapping, Optional
+import collections
+import hashlib
+import threading
+from typing import Any, Iterable, MutableMapping, Optional
+import weakref
 
 import cachetools
 import tensorflow as tf
@@ -40,6 +44,155 @@ from tensorflow_federated.python.tensorflow_libs import graph_merge
 # Cache size here is simply heuristic, no formal analysis.
 _TF_FUNCTION_CACHE_SIZE = 100
 
+_shared_function_cache = None
+_shared_function_cache_lock = threading.Lock()
+
+
+class SharedFunctionCache(object):
+  """A thread-safe cache of embedded TensorFlow functions shared by executors.
+
+  Entries are keyed by a fingerprint of the computation, its type, and the
+  device it is embedded on, such that a computation used by many executors on
+  the same device is imported only once.
+
+  Each `EagerTFExecutor` using the cache holds a reference to the entries it
+  has looked up, until it is closed or garbage collected. Entries referenced by
+  no executor are kept in a least recently used order, and are evicted once
+  there are more than `max_unreferenced_entries` of them.
+
+  Note: Executors which concurrently miss on the same key may each embed the
+  function, in which case the first one stored is kept.
+  """
+
+  def __init__(self, max_unreferenced_entries: int = _TF_FUNCTION_CACHE_SIZE):
+    """Creates a `SharedFunctionCache`.
+
+    Args:
+      max_unreferenced_entries: The maximum number of entries to keep that are
+        not referenced by any executor.
+
+    Raises:
+      TypeError: If `max_unreferenced_entries` is not an `int`.
+      ValueError: If `max_unreferenced_entries` is negative.
+    """
+    py_typecheck.check_type(max_unreferenced_entries, int)
+    if max_unreferenced_entries < 0:
+      raise ValueError(
+          'Expected a nonnegative `max_unreferenced_entries`, found {}.'.format(
+              max_unreferenced_entries))
+    self._max_unreferenced_entries = max_unreferenced_entries
+    self._lock = threading.Lock()
+    self._entries = {}
+    self._ref_counts = collections.Counter()
+    self._unreferenced_keys = collections.OrderedDict()
+    self._hits = 0
+    self._misses = 0
+    self._evictions = 0
+
+  @property
+  def hits(self) -> int:
+    return self._hits
+
+  @property
+  def misses(self) -> int:
+    return self._misses
+
+  @property
+  def evictions(self) -> int:
+    return self._evictions
+
+  @property
+  def size(self) -> int:
+    """The number of entries in the cache."""
+    return len(self._entries)
+
+  @property
+  def num_referenced(self) -> int:
+    """The number of entries referenced by at least one executor."""
+    return len(self._ref_counts)
+
+  def _get(self, key, acquire: bool):
+    """Returns the entry for `key`, acquiring a reference to it if `acquire`."""
+    with self._lock:
+      fn = self._entries.get(key)
+      if fn is None:
+        self._misses += 1
+        return None
+      self._hits += 1
+      if acquire:
+        self._ref_counts[key] += 1
+        self._unreferenced_keys.pop(key, None)
+      return fn
+
+  def _put(self, key, fn):
+    """Stores `fn` for `key` unless already present, and acquires `key`."""
+    with self._lock:
+      self._entries.setdefault(key, fn)
+      self._ref_counts[key] += 1
+      self._unreferenced_keys.pop(key, None)
+
+  def _release(self, keys: Iterable[Any]):
+    """Releases a reference to each of `keys`, evicting unreferenced entries."""
+    with self._lock:
+      for key in keys:
+        self._ref_counts[key] -= 1
+        if self._ref_counts[key] <= 0:
+          del self._ref_counts[key]
+          self._unreferenced_keys[key] = None
+      while len(self._unreferenced_keys) > self._max_unreferenced_entries:
+        key, _ = self._unreferenced_keys.popitem(last=False)
+        del self._entries[key]
+        self._evictions += 1
+
+
+class _SharedFunctionCacheView(object):
+  """A `dict`-like view of a `SharedFunctionCache` used by a single executor.
+
+  The view tracks the entries the executor holds a reference to, and releases
+  them when it is released or garbage collected.
+  """
+
+  def __init__(self, cache: SharedFunctionCache):
+    self._cache = cache
+    self._keys = set()
+    weakref.finalize(self, cache._release, self._keys)  # pylint: disable=protected-access
+
+  def get(self, key, default=None):
+    fn = self._cache._get(key, acquire=key not in self._keys)  # pylint: disable=protected-access
+    if fn is None:
+      return default
+    self._keys.add(key)
+    return fn
+
+  def __setitem__(self, key, fn):
+    if key in self._keys:
+      return
+    self._cache._put(key, fn)  # pylint: disable=protected-access
+    self._keys.add(key)
+
+  def release(self):
+    keys = list(self._keys)
+    self._keys.clear()
+    self._cache._release(keys)  # pylint: disable=protected-access
+
+
+def get_shared_function_cache() -> SharedFunctionCache:
+  """Returns the `SharedFunctionCache` shared by this process."""
+  global _shared_function_cache
+  with _shared_function_cache_lock:
+    if _shared_function_cache is None:
+      _shared_function_cache = SharedFunctionCache()
+    return _shared_function_cache
+
+
+def _get_function_cache_key(comp: pb.Computation,
+                            type_spec: computation_types.Type,
+                            device: Optional[tf.config.LogicalDevice]):
+  """Returns a key for `comp` embedded with `type_spec` on `device`."""
+  fingerprint = hashlib.blake2b(
+      comp.SerializeToString(deterministic=True), digest_size=32).digest()
+  return (fingerprint, str(type_spec), device.name if device else None)
+
 
 def _get_wrapped_function_from_comp(comp, must_pin_function_to_cpu, param_type,
                                     device):
@@ -188,6 +341,23 @@ def embed_tensorflow_computation(comp, type_spec=None, device=None):
 
       result_fns.append(fn)
 
+  # There is a tf.wrap_function(...) issue b/144127474 that variables created
+  # from tf.import_graph_def(...) inside tf.wrap_function(...) is not
+  # destroyed.  So get all the variables from `wrapped_fn` and destroy
+  # manually after each call. The resources and the function returning them
+  # only depend on the graph, so they are found once here rather than on
+  # every call.
+  # TODO(b/144127474): Remove this manual cleanup once tf.wrap_function(...)
+  # is fixed.
+  resources = []
+  for op in wrapped_fn.graph.get_operations():
+    if op.type in ['VarHandleOp', 'HashTableV2']:
+      resources += op.outputs
+  if resources:
+    get_resources_fn = wrapped_fn.prune(feeds={}, fetches=resources)
+  else:
+    get_resources_fn = None
+
   def _fn_to_return(arg, param_fns, wrapped_fn):  # pylint:disable=missing-docstring
     param_elements = []
     if arg is not None:
@@ -199,18 +369,8 @@ def embed_tensorflow_computation(comp, type_spec=None, device=None):
         param_elements.append(param_fn(arg_part))
     result_parts = wrapped_fn(*param_elements)
 
-    # There is a tf.wrap_function(...) issue b/144127474 that variables created
-    # from tf.import_graph_def(...) inside tf.wrap_function(...) is not
-    # destroyed.  So get all the variables from `wrapped_fn` and destroy
-    # manually.
-    # TODO(b/144127474): Remove this manual cleanup once tf.wrap_function(...)
-    # is fixed.
-    resources = []
-    for op in wrapped_fn.graph.get_operations():
-      if op.type in ['VarHandleOp', 'HashTableV2']:
-        resources += op.outputs
-    if resources:
-      for resource in wrapped_fn.prune(feeds={}, fetches=resources)():
+    if get_resources_fn is not None:
+      for resource in get_resources_fn():
         tf.raw_ops.DestroyResourceOp(resource=resource)
 
     result_elements = []
@@ -282,8 +442,7 @@ def to_representation_for_type(
         computation_impl.ComputationImpl.get_proto(value), tf_function_cache,
         type_spec, device)
   elif isinstance(value, pb.Computation):
-    key = (value.SerializeToString(), str(type_spec),
-           device.name if device else None)
+    key = _get_function_cache_key(value, type_spec, device)
     cached_fn = tf_function_cache.get(key)
     if cached_fn is not None:
       return cached_fn
@@ -418,7 +577,9 @@ class EagerTFExecutor(executor_base.Executor):
   executors into a complex executor stack, rather than mixing in all the logic.
   """
 
-  def __init__(self, device=None):
+  def __init__(self,
+               device=None,
+               shared_function_cache: Optional[SharedFunctionCache] = None):
     """Creates a new instance of an eager executor.
 
     Args:
@@ -426,6 +587,9 @@ class EagerTFExecutor(executor_base.Executor):
         schedule all of its operations to run on. For example, the list of
         logical devices can be obtained using
         `tf.config.list_logical_devices()`.
+      shared_function_cache: An optional `SharedFunctionCache` to look up the
+        embedded TensorFlow functions in, shared with other executors. If
+        unspecified, the executor caches the functions it embeds privately.
 
     Raises:
       RuntimeError: If not executing eagerly.
@@ -439,7 +603,11 @@ class EagerTFExecutor(executor_base.Executor):
       self._device = device
     else:
       self._device = None
-    self._tf_function_cache = cachetools.LRUCache(_TF_FUNCTION_CACHE_SIZE)
+    if shared_function_cache is not None:
+      py_typecheck.check_type(shared_function_cache, SharedFunctionCache)
+      self._tf_function_cache = _SharedFunctionCacheView(shared_function_cache)
+    else:
+      self._tf_function_cache = cachetools.LRUCache(_TF_FUNCTION_CACHE_SIZE)
 
   @tracing.trace(span=True)
   async def create_value(self, value, type_spec=None):
@@ -558,4 +726,7 @@ class EagerTFExecutor(executor_base.Executor):
       raise ValueError('Must specify either name or index.')
 
   def close(self):
-    pass
+    # Release the references to the shared functions, such that they can be
+    # evicted; they are reacquired if this executor is used again.
+    if isinstance(self._tf_function_cache, _SharedFunctionCacheView):
+      self._tf_function_cache.release()
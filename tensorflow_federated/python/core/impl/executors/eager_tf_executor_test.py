@@ -139,6 +139,22 @@ class EagerTFExecutorTest(tf.test.TestCase):
     self.assertIsInstance(result, tf.Tensor)
     self.assertEqual(result.numpy(), 60)
 
+  def test_embed_tensorflow_computation_with_variable_called_repeatedly(self):
+
+    @computations.tf_computation(tf.int32)
+    def comp(x):
+      v = tf.Variable(10)
+      with tf.control_dependencies([v.initializer]):
+        with tf.control_dependencies([v.assign_add(x)]):
+          return tf.identity(v)
+
+    fn = eager_tf_executor.embed_tensorflow_computation(
+        computation_impl.ComputationImpl.get_proto(comp))
+    # The variable is destroyed after each call, so every call starts from the
+    # initial value.
+    for _ in range(3):
+      self.assertEqual(fn(tf.constant(5)).numpy(), 15)
+
   def test_embed_tensorflow_computation_with_float_variables_same_name(self):
 
     @computations.tf_computation
@@ -293,6 +309,59 @@ class EagerTFExecutorTest(tf.test.TestCase):
     self.assertIsInstance(result.internal_representation, tf.Tensor)
     self.assertEqual(result.internal_representation.numpy(), 30)
 
+  def test_executors_share_embedded_functions(self):
+
+    @computations.tf_computation(tf.int32, tf.int32)
+    def comp(a, b):
+      return a + b
+
+    cache = eager_tf_executor.SharedFunctionCache()
+    executors = [
+        eager_tf_executor.EagerTFExecutor(shared_function_cache=cache)
+        for _ in range(3)
+    ]
+    loop = asyncio.get_event_loop()
+    fns = [loop.run_until_complete(ex.create_value(comp)) for ex in executors]
+
+    self.assertEqual(cache.misses, 1)
+    self.assertEqual(cache.hits, 2)
+    self.assertEqual(cache.size, 1)
+    self.assertEqual(cache.num_referenced, 1)
+    for fn in fns:
+      self.assertIs(fn.internal_representation,
+                    fns[0].internal_representation)
+
+  def test_shared_function_cache_evicts_unreferenced_functions(self):
+
+    @computations.tf_computation(tf.int32)
+    def add_one(x):
+      return x + 1
+
+    @computations.tf_computation(tf.int32)
+    def add_two(x):
+      return x + 2
+
+    cache = eager_tf_executor.SharedFunctionCache(max_unreferenced_entries=1)
+    ex = eager_tf_executor.EagerTFExecutor(shared_function_cache=cache)
+    loop = asyncio.get_event_loop()
+    loop.run_until_complete(ex.create_value(add_one))
+    loop.run_until_complete(ex.create_value(add_two))
+    self.assertEqual(cache.size, 2)
+    self.assertEqual(cache.num_referenced, 2)
+
+    # Once released, only `max_unreferenced_entries` of the functions are kept.
+    ex.close()
+    self.assertEqual(cache.num_referenced, 0)
+    self.assertEqual(cache.size, 1)
+    self.assertEqual(cache.evictions, 1)
+
+    # The executor can still be used after it has been closed.
+    fn = loop.run_until_complete(ex.create_value(add_two))
+    arg = loop.run_until_complete(ex.create_value(10, tf.int32))
+    result = loop.run_until_complete(ex.create_call(fn, arg))
+    self.assertEqual(result.internal_representation.numpy(), 12)
+    self.assertEqual(cache.num_referenced, 1)
+
   # TODO(b/137602785): bring GPU test back after the fix for `wrap_function`.
   @test.skip_test_for_gpu
   def test_executor_create_call_take_two_int_from_finite_dataset(self):
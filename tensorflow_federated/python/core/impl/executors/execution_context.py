@@ -14,9 +14,14 @@
 """A context for execution based on an embedded executor instance."""
 
 import asyncio
-import contextlib
+import concurrent.futures
+import functools
+import random
+import threading
 from typing import Any, Callable, Optional
+import weakref
 
+from absl import logging
 import retrying
 import tensorflow as tf
 
@@ -26,6 +31,7 @@ from tensorflow_federated.python.common_libs import tracing
 from tensorflow_federated.python.core.api import computation_base
 from tensorflow_federated.python.core.api import computation_types
 from tensorflow_federated.python.core.api import typed_object
+from tensorflow_federated.python.core.impl.compiler import compilation_cache
 from tensorflow_federated.python.core.impl.compiler import compiler_pipeline
 from tensorflow_federated.python.core.impl.context_stack import context_base
 from tensorflow_federated.python.core.impl.executors import cardinalities_utils
@@ -35,6 +41,11 @@ from tensorflow_federated.python.core.impl.executors import executor_value_base
 from tensorflow_federated.python.core.impl.types import type_conversions
 
 
+_RETRY_WAIT_EXPONENTIAL_MAX_MS = 300000
+_RETRY_WAIT_EXPONENTIAL_MULTIPLIER_MS = 1000
+_RETRY_WAIT_JITTER_MAX_MS = 1000
+
+
 class RetryableError(Exception):
   """Raised when execution fails and can be retried."""
 
@@ -125,6 +136,30 @@ async def _invoke(executor, comp, arg, result_type: computation_types.Type):
   return type_conversions.type_to_py_container(result_val, result_type)
 
 
+async def _ingest_and_invoke(executor, comp, arg, arg_type,
+                             result_type: computation_types.Type):
+  """A coroutine that ingests `arg` (if not `None`) and invokes `comp`."""
+  if arg is not None:
+    arg = await _ingest(executor, arg, arg_type)
+  return await _invoke(executor, comp, arg, result_type)
+
+
+def _new_event_loop():
+  event_loop = asyncio.new_event_loop()
+  event_loop.set_task_factory(tracing.propagate_trace_context_task_factory)
+  return event_loop
+
+
+def _run_event_loop(event_loop):
+  event_loop.run_forever()
+  event_loop.close()
+
+
+def _stop_event_loop_thread(event_loop, thread):
+  event_loop.call_soon_threadsafe(event_loop.stop)
+  thread.join()
+
+
 def _unwrap_execution_context_value(val):
   """Recursively removes wrapping from `val` under anonymous tuples."""
   if isinstance(val, structure.Struct):
@@ -138,40 +173,122 @@ def _unwrap_execution_context_value(val):
 
 
 class ExecutionContext(context_base.Context):
-  """Represents an execution context backed by an `executor_base.Executor`."""
+  """Represents an execution context backed by an `executor_base.Executor`.
+
+  By default, each invocation runs on a new event loop in the invoking thread.
+  If `use_persistent_event_loop` is `True`, all invocations instead run on a
+  single event loop running in a dedicated thread, such that the cost of
+  creating an event loop is not paid on every invocation, and invocations from
+  multiple Python threads can overlap.
+
+  Invocations can also be started without blocking with `invoke_async`, which
+  always runs them on the persistent event loop. Coroutines running on the
+  persistent event loop must use `invoke_async`, since `invoke` would block the
+  loop waiting for its own result; it raises a `RuntimeError` instead.
+
+  Overlapping invocations share the executor stack for their cardinalities.
+  Each invocation acquires the stack from the executor factory and releases it
+  once done, and the stack is only closed once the last of them releases it.
+  """
 
-  def __init__(self,
-               executor_fn: executor_factory.ExecutorFactory,
-               compiler_fn: Optional[Callable[[computation_base.Computation],
-                                              Any]] = None):
+  def __init__(
+      self,
+      executor_fn: executor_factory.ExecutorFactory,
+      compiler_fn: Optional[Callable[[computation_base.Computation],
+                                     Any]] = None,
+      persistent_compilation_cache: Optional[
+          compilation_cache.PersistentCompilationCache] = None,
+      use_persistent_event_loop: bool = False,
+      compiler_id: Optional[str] = None):
     """Initializes an execution context.
 
     Args:
       executor_fn: Instance of `executor_factory.ExecutorFactory`.
       compiler_fn: A Python function that will be used to compile a computation.
+      persistent_compilation_cache: An optional
+        `compilation_cache.PersistentCompilationCache` used to persist the
+        computations compiled by `compiler_fn` across processes. Requires
+        `compiler_fn` and `compiler_id`.
+      use_persistent_event_loop: Whether to run all invocations on a single
+        event loop in a dedicated thread, rather than on a new event loop for
+        each invocation.
+      compiler_id: An optional string uniquely identifying `compiler_fn` in the
+        `persistent_compilation_cache`.
+
+    Raises:
+      ValueError: If `persistent_compilation_cache` is specified without a
+        `compiler_fn` or a `compiler_id`.
     """
     py_typecheck.check_type(executor_fn, executor_factory.ExecutorFactory)
     self._executor_factory = executor_fn
     if compiler_fn is not None:
       py_typecheck.check_callable(compiler_fn)
-      self._compiler_pipeline = compiler_pipeline.CompilerPipeline(compiler_fn)
+      self._compiler_pipeline = compiler_pipeline.CompilerPipeline(
+          compiler_fn,
+          persistent_cache=persistent_compilation_cache,
+          compiler_id=compiler_id)
+    elif persistent_compilation_cache is not None:
+      raise ValueError('A `persistent_compilation_cache` requires a '
+                       '`compiler_fn`.')
     else:
       self._compiler_pipeline = None
+    self._lock = threading.Lock()
+    self._event_loop = None
+    self._event_loop_thread = None
+    if use_persistent_event_loop:
+      self._get_persistent_event_loop()
 
   @property
   def executor_factory(self):
     return self._executor_factory
 
-  def ingest(self, val, type_spec):
-    return ExecutionContextValue(val, type_spec)
+  def _get_persistent_event_loop(self):
+    """Returns the persistent event loop, starting it if needed."""
+    with self._lock:
+      if self._event_loop is None:
+        event_loop = _new_event_loop()
+        thread = threading.Thread(
+            target=functools.partial(_run_event_loop, event_loop), daemon=True)
+        thread.start()
+        weakref.finalize(self, _stop_event_loop_thread, event_loop, thread)
+        self._event_loop = event_loop
+        self._event_loop_thread = thread
+      return self._event_loop
+
+  def _run_coroutine(self, coro):
+    """Runs `coro` to completion in the current trace context."""
+    coro = tracing.wrap_coroutine_in_current_trace_context(coro)
+    if self._event_loop is not None:
+      return asyncio.run_coroutine_threadsafe(coro, self._event_loop).result()
+    event_loop = _new_event_loop()
+    try:
+      return event_loop.run_until_complete(coro)
+    finally:
+      event_loop.close()
+
+  def _acquire_executor(self, cardinalities) -> executor_base.Executor:
+    """Returns the executor for `cardinalities`, for use by an invocation."""
+    with self._lock:
+      executor = self._executor_factory.acquire_executor(cardinalities)
+      py_typecheck.check_type(executor, executor_base.Executor)
+      return executor
+
+  def _release_executor(self, executor: executor_base.Executor):
+    """Closes `executor` if no other invocation is using it."""
+    with self._lock:
+      if self._executor_factory.release_executor(executor):
+        executor.close()
+
+  def _prepare_invocation(self, comp, arg):
+    """Compiles `comp` and unwraps `arg` for an invocation.
 
-  @retrying.retry(
-      retry_on_exception=_is_retryable_error,
-      wait_exponential_max=300000,  # in milliseconds
-      wait_exponential_multiplier=1000,  # in milliseconds
-      wait_jitter_max=1000  # in milliseconds
-  )
-  def invoke(self, comp, arg):
+    Args:
+      comp: The first argument to `invoke()`.
+      arg: The second argument to `invoke()`.
+
+    Returns:
+      A tuple `(comp, result_type, unwrapped_arg, arg_type, cardinalities)`.
+    """
     comp.type_signature.check_function()
     # Save the type signature before compiling. Compilation currently loses
     # container types, so we must remember them here so that they can be
@@ -181,41 +298,92 @@ class ExecutionContext(context_base.Context):
       with tracing.span('ExecutionContext', 'Compile', span=True):
         comp = self._compiler_pipeline.compile(comp)
 
+    if arg is not None:
+      py_typecheck.check_type(arg, ExecutionContextValue)
+      unwrapped_arg = _unwrap_execution_context_value(arg)
+      arg_type = arg.type_signature
+      cardinalities = cardinalities_utils.infer_cardinalities(
+          unwrapped_arg, arg_type)
+    else:
+      unwrapped_arg = None
+      arg_type = None
+      cardinalities = {}
+    return comp, result_type, unwrapped_arg, arg_type, cardinalities
+
+  def ingest(self, val, type_spec):
+    return ExecutionContextValue(val, type_spec)
+
+  @retrying.retry(
+      retry_on_exception=_is_retryable_error,
+      wait_exponential_max=_RETRY_WAIT_EXPONENTIAL_MAX_MS,
+      wait_exponential_multiplier=_RETRY_WAIT_EXPONENTIAL_MULTIPLIER_MS,
+      wait_jitter_max=_RETRY_WAIT_JITTER_MAX_MS)
+  def invoke(self, comp, arg):
+    if threading.current_thread() is self._event_loop_thread:
+      raise RuntimeError(
+          '`invoke` cannot be called from the persistent event loop of the '
+          'context, since it would block the loop waiting for its own result. '
+          'Use `invoke_async` and await its result instead.')
+    comp, result_type, unwrapped_arg, arg_type, cardinalities = (
+        self._prepare_invocation(comp, arg))
     with tracing.span('ExecutionContext', 'Invoke', span=True):
+      executor = self._acquire_executor(cardinalities)
+      try:
+        return self._run_coroutine(
+            _ingest_and_invoke(executor, comp, unwrapped_arg, arg_type,
+                               result_type))
+      finally:
+        self._release_executor(executor)
+
+  def invoke_async(self, comp, arg) -> concurrent.futures.Future:
+    """Starts invoking `comp` on `arg`, without waiting for the result.
+
+    The invocation runs on the persistent event loop of this context, which is
+    started if needed. Several invocations can be in flight at the same time,
+    for example to evaluate the result of a round of training while training
+    the next one. Like `invoke`, the invocation is retried on a
+    `RetryableError`.
 
-      @contextlib.contextmanager
-      def executor_closer(wrapped_executor):
-        """Wraps an Executor into a closeable resource."""
-        try:
-          yield wrapped_executor
-        finally:
-          wrapped_executor.close()
-
-      if arg is not None:
-        py_typecheck.check_type(arg, ExecutionContextValue)
-        unwrapped_arg = _unwrap_execution_context_value(arg)
-        cardinalities = cardinalities_utils.infer_cardinalities(
-            unwrapped_arg, arg.type_signature)
-      else:
-        cardinalities = {}
-
-      with executor_closer(
-          self._executor_factory.create_executor(cardinalities)) as executor:
-        py_typecheck.check_type(executor, executor_base.Executor)
-
-        def get_event_loop():
-          new_loop = asyncio.new_event_loop()
-          new_loop.set_task_factory(
-              tracing.propagate_trace_context_task_factory)
-          return new_loop
-
-        event_loop = get_event_loop()
-
-        if arg is not None:
-          arg = event_loop.run_until_complete(
-              tracing.wrap_coroutine_in_current_trace_context(
-                  _ingest(executor, unwrapped_arg, arg.type_signature)))
-
-        return event_loop.run_until_complete(
-            tracing.wrap_coroutine_in_current_trace_context(
-                _invoke(executor, comp, arg, result_type)))
+    Args:
+      comp: The computation being invoked.
+      arg: The optional argument of the call, or `None` if no argument was
+        supplied, as returned by `ingest`.
+
+    Returns:
+      A `concurrent.futures.Future` of the result of the invocation. In a
+      coroutine, it can be awaited by wrapping it with `asyncio.wrap_future`.
+    """
+    comp, result_type, unwrapped_arg, arg_type, cardinalities = (
+        self._prepare_invocation(comp, arg))
+    event_loop = self._get_persistent_event_loop()
+    coro = tracing.wrap_coroutine_in_current_trace_context(
+        self._invoke_with_retries(comp, result_type, unwrapped_arg, arg_type,
+                                  cardinalities))
+    return asyncio.run_coroutine_threadsafe(coro, event_loop)
+
+  async def _invoke_with_retries(self, comp, result_type, unwrapped_arg,
+                                 arg_type, cardinalities):
+    """A coroutine invoking `comp`, retrying on a `RetryableError`."""
+    # Constructing an executor stack can take a while, and acquiring and
+    # releasing stacks waits for the lock of the context, so these run off the
+    # event loop rather than blocking the other invocations on it.
+    event_loop = asyncio.get_event_loop()
+    num_attempts = 0
+    while True:
+      executor = await event_loop.run_in_executor(None, self._acquire_executor,
+                                                  cardinalities)
+      try:
+        return await _ingest_and_invoke(executor, comp, unwrapped_arg,
+                                        arg_type, result_type)
+      except RetryableError as e:
+        wait_ms = min(
+            _RETRY_WAIT_EXPONENTIAL_MULTIPLIER_MS * 2**num_attempts,
+            _RETRY_WAIT_EXPONENTIAL_MAX_MS) + random.uniform(
+                0, _RETRY_WAIT_JITTER_MAX_MS)
+        num_attempts += 1
+        logging.info('Retrying invocation in %d ms after error: %s', wait_ms,
+                     e)
+      finally:
+        await event_loop.run_in_executor(None, self._release_executor,
+                                         executor)
+      await asyncio.sleep(wait_ms / 1000)
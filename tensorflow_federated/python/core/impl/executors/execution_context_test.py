@@ -12,7 +12,10 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import asyncio
 import collections
+import concurrent.futures
+from unittest import mock
 
 from absl.testing import absltest
 from absl.testing import parameterized
@@ -22,6 +25,8 @@ import tensorflow as tf
 from tensorflow_federated.python.core.api import computation_types
 from tensorflow_federated.python.core.api import computations
 from tensorflow_federated.python.core.api import intrinsics
+from tensorflow_federated.python.core.impl.compiler import compilation_cache
+from tensorflow_federated.python.core.impl.context_stack import context_stack_impl
 from tensorflow_federated.python.core.impl.executors import execution_context
 from tensorflow_federated.python.core.impl.executors import executor_stacks
 from tensorflow_federated.python.core.impl.executors import executor_test_utils
@@ -180,6 +185,121 @@ class ExecutionContextIntegrationTest(parameterized.TestCase):
       with self.assertRaisesRegex(ValueError, 'Conflicting cardinalities'):
         comp([five_ints, ten_ints])
 
+  def test_raises_value_error_with_persistent_cache_and_no_compiler_fn(self):
+    cache = compilation_cache.PersistentCompilationCache(
+        self.create_tempdir().full_path)
+
+    with self.assertRaises(ValueError):
+      execution_context.ExecutionContext(
+          executor_stacks.local_executor_factory(),
+          persistent_compilation_cache=cache)
+
+  def test_with_persistent_event_loop(self):
+
+    @computations.tf_computation(tf.int32)
+    def comp(x):
+      return tf.add(x, 10)
+
+    context = execution_context.ExecutionContext(
+        executor_stacks.local_executor_factory(),
+        use_persistent_event_loop=True)
+    with context_stack_impl.context_stack.install(context):
+      self.assertEqual(comp(3), 13)
+      self.assertEqual(comp(4), 14)
+
+  def test_overlapping_invocations_with_persistent_event_loop(self):
+
+    @computations.tf_computation(tf.int32)
+    def comp(x):
+      return tf.add(x, 10)
+
+    context = execution_context.ExecutionContext(
+        executor_stacks.local_executor_factory(),
+        use_persistent_event_loop=True)
+
+    def _invoke(x):
+      arg = context.ingest(x, comp.type_signature.parameter)
+      return context.invoke(comp, arg)
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=4) as pool:
+      results = list(pool.map(_invoke, range(8)))
+
+    self.assertEqual(results, [x + 10 for x in range(8)])
+
+  def test_overlapping_invocation_does_not_close_shared_executor(self):
+
+    @computations.tf_computation
+    def comp():
+      return tf.constant(10)
+
+    context = execution_context.ExecutionContext(
+        executor_stacks.local_executor_factory(),
+        use_persistent_event_loop=True)
+    # Acquires the executor stack as an invocation in flight would.
+    executor = context._acquire_executor({})
+
+    with mock.patch.object(executor, 'close') as mock_close:
+      with context_stack_impl.context_stack.install(context):
+        self.assertEqual(comp(), 10)
+      mock_close.assert_not_called()
+      context._release_executor(executor)
+      mock_close.assert_called_once()
+
+  def test_invoke_async_with_overlapping_invocations(self):
+
+    @computations.tf_computation(tf.int32)
+    def add_ten(x):
+      return tf.add(x, 10)
+
+    @computations.tf_computation(tf.int32)
+    def double(x):
+      return tf.multiply(x, 2)
+
+    context = execution_context.ExecutionContext(
+        executor_stacks.local_executor_factory())
+    futures = [
+        context.invoke_async(comp,
+                             context.ingest(3, comp.type_signature.parameter))
+        for comp in [add_ten, double]
+    ]
+
+    self.assertIsInstance(futures[0], concurrent.futures.Future)
+    self.assertEqual([f.result() for f in futures], [13, 6])
+    # The executor stack is closed once the last invocation completes.
+    self.assertEmpty(context.executor_factory._num_acquisitions)
+
+  def test_invoke_raises_runtime_error_on_persistent_event_loop(self):
+
+    @computations.tf_computation
+    def comp():
+      return tf.constant(10)
+
+    context = execution_context.ExecutionContext(
+        executor_stacks.local_executor_factory(),
+        use_persistent_event_loop=True)
+
+    async def _invoke():
+      return context.invoke(comp, None)
+
+    future = asyncio.run_coroutine_threadsafe(
+        _invoke(), context._get_persistent_event_loop())
+    with self.assertRaises(RuntimeError):
+      future.result()
+
+  def test_invoke_async_result_can_be_awaited(self):
+
+    @computations.tf_computation
+    def comp():
+      return tf.constant(10)
+
+    context = execution_context.ExecutionContext(
+        executor_stacks.local_executor_factory())
+
+    async def _invoke():
+      return await asyncio.wrap_future(context.invoke_async(comp, None))
+
+    self.assertEqual(asyncio.get_event_loop().run_until_complete(_invoke()), 10)
+
 
 if __name__ == '__main__':
   absltest.main()
@@ -14,7 +14,9 @@
 """ExecutorFactory interface and simple implementation."""
 
 import abc
-from typing import Callable, Mapping, List, Tuple, Any, Dict
+import collections
+import threading
+from typing import Callable, Mapping, List, Optional, Tuple, Any, Dict
 
 import attr
 import tensorflow as tf
@@ -80,6 +82,38 @@ class ExecutorFactory(metaclass=abc.ABCMeta):
     """
     pass
 
+  def acquire_executor(
+      self, cardinalities: CardinalitiesType) -> executor_base.Executor:
+    """Returns an executor for `cardinalities`, for use until it is released.
+
+    Unlike the executors returned by `create_executor`, an acquired executor is
+    not closed by the factory to bound the executors it holds, until
+    `release_executor` has been called once for every time it was acquired.
+    By default, this is the same as `create_executor`.
+
+    Args:
+      cardinalities: a dict mapping instances of
+        `placement_literals.PlacementLiteral` to ints, specifying the population
+        size at each placement.
+
+    Returns:
+      Instance of `executor_base.Executor`.
+    """
+    return self.create_executor(cardinalities)
+
+  def release_executor(self, executor: executor_base.Executor) -> bool:
+    """Releases an executor returned by `acquire_executor`.
+
+    Args:
+      executor: The `executor_base.Executor` to release.
+
+    Returns:
+      Whether `executor` is no longer acquired, such that it can be closed.
+      By default, this is always `True`.
+    """
+    del executor  # Unused.
+    return True
+
   @abc.abstractmethod
   def clean_up_executors(self):
     """Releases any resources held by the factory.
@@ -104,10 +138,19 @@ def _get_hashable_key(cardinalities: CardinalitiesType):
 
 
 class ExecutorFactoryImpl(ExecutorFactory):
-  """Implementation of executor factory holding an executor per cardinality."""
+  """Implementation of executor factory holding an executor per cardinality.
+
+  If `max_cached_executors` is specified, only that many of the most recently
+  used executors are held; the least recently used executors which are not
+  acquired (see `acquire_executor`) are closed and released when a new one
+  would exceed this bound. Acquired executors are only retired once they are
+  released.
+  """
 
-  def __init__(self, executor_stack_fn: Callable[[CardinalitiesType],
-                                                 executor_base.Executor]):
+  def __init__(self,
+               executor_stack_fn: Callable[[CardinalitiesType],
+                                           executor_base.Executor],
+               max_cached_executors: Optional[int] = None):
     """Initializes `ExecutorFactoryImpl`.
 
     Args:
@@ -115,11 +158,60 @@ class ExecutorFactoryImpl(ExecutorFactory):
         `placement_literals.PlacementLiteral` to integers, and returning an
         `executor_base.Executor`. The returned executor will be configured to
         handle these cardinalities.
+      max_cached_executors: An optional maximum number of executors to hold.
+        If unspecified, an executor is held for every distinct cardinalities
+        until `clean_up_executors` is called.
+
+    Raises:
+      ValueError: If `max_cached_executors` is not positive.
     """
 
     py_typecheck.check_callable(executor_stack_fn)
+    if max_cached_executors is not None:
+      py_typecheck.check_type(max_cached_executors, int)
+      if max_cached_executors < 1:
+        raise ValueError(
+            'Expected a positive `max_cached_executors`, found {}.'.format(
+                max_cached_executors))
     self._executor_stack_fn = executor_stack_fn
-    self._executors = {}
+    self._max_cached_executors = max_cached_executors
+    self._executors = collections.OrderedDict()
+    self._num_acquisitions = {}
+    self._lock = threading.RLock()
+
+  def _get_cached_executor(self, key) -> Optional[executor_base.Executor]:
+    with self._lock:
+      ex = self._executors.get(key)
+      if ex is not None:
+        self._executors.move_to_end(key)
+      return ex
+
+  def _cache_executor(self, key, ex: executor_base.Executor):
+    """Holds `ex` for `key`, closing the least recently used executors."""
+    with self._lock:
+      self._executors[key] = ex
+      self._retire_executors(keep_key=key)
+
+  def _retire_executors(self, keep_key=None):
+    """Closes the least recently used executors exceeding the bound.
+
+    Executors which are acquired, and the executor for `keep_key`, are not
+    retired, such that the bound can be temporarily exceeded.
+
+    Args:
+      keep_key: An optional key of an executor not to retire.
+    """
+    if self._max_cached_executors is None:
+      return
+    num_to_retire = len(self._executors) - self._max_cached_executors
+    if num_to_retire < 1:
+      return
+    retired_keys = [
+        key for key, ex in self._executors.items()
+        if key != keep_key and ex not in self._num_acquisitions
+    ][:num_to_retire]
+    for key in retired_keys:
+      self._executors.pop(key).close()
 
   def create_executor(
       self, cardinalities: CardinalitiesType) -> executor_base.Executor:
@@ -140,14 +232,33 @@ class ExecutorFactoryImpl(ExecutorFactory):
     """
     py_typecheck.check_type(cardinalities, dict)
     key = _get_hashable_key(cardinalities)
-    ex = self._executors.get(key)
+    ex = self._get_cached_executor(key)
     if ex is not None:
       return ex
     ex = self._executor_stack_fn(cardinalities)
     py_typecheck.check_type(ex, executor_base.Executor)
-    self._executors[key] = ex
+    self._cache_executor(key, ex)
     return ex
 
+  def acquire_executor(
+      self, cardinalities: CardinalitiesType) -> executor_base.Executor:
+    """See base class."""
+    with self._lock:
+      ex = self.create_executor(cardinalities)
+      self._num_acquisitions[ex] = self._num_acquisitions.get(ex, 0) + 1
+      return ex
+
+  def release_executor(self, executor: executor_base.Executor) -> bool:
+    """See base class."""
+    with self._lock:
+      num_acquisitions = self._num_acquisitions[executor] - 1
+      if num_acquisitions > 0:
+        self._num_acquisitions[executor] = num_acquisitions
+        return False
+      del self._num_acquisitions[executor]
+      self._retire_executors()
+      return True
+
   def clean_up_executors(self):
     """Calls `close` on all constructed executors, resetting internal cache.
 
@@ -156,9 +267,10 @@ class ExecutorFactoryImpl(ExecutorFactory):
     state, and should not be used after this method is called. Instead, callers
     should again invoke `create_executor`.
     """
-    for _, ex in self._executors.items():
-      ex.close()
-    self._executors = {}
+    with self._lock:
+      for _, ex in self._executors.items():
+        ex.close()
+      self._executors = collections.OrderedDict()
 
 
 class SizingExecutorFactory(ExecutorFactoryImpl):
@@ -168,15 +280,18 @@ class SizingExecutorFactory(ExecutorFactoryImpl):
       self,
       executor_stack_fn: Callable[[CardinalitiesType],
                                   Tuple[executor_base.Executor,
-                                        List[sizing_executor.SizingExecutor]]]):
+                                        List[sizing_executor.SizingExecutor]]],
+      max_cached_executors: Optional[int] = None):
     """Initializes `SizingExecutorFactory`.
 
     Args:
       executor_stack_fn: Similar to base class but the second return value of
         the callable is used to expose the SizingExecutors.
+      max_cached_executors: See base class. The size information of the
+        executors which are closed is kept.
     """
 
-    super().__init__(executor_stack_fn)
+    super().__init__(executor_stack_fn, max_cached_executors)
     self._sizing_executors = {}
 
   def create_executor(
@@ -185,7 +300,7 @@ class SizingExecutorFactory(ExecutorFactoryImpl):
 
     py_typecheck.check_type(cardinalities, dict)
     key = _get_hashable_key(cardinalities)
-    ex = self._executors.get(key)
+    ex = self._get_cached_executor(key)
     if ex is not None:
       return ex
     ex, sizing_executors = self._executor_stack_fn(cardinalities)
@@ -195,7 +310,7 @@ class SizingExecutorFactory(ExecutorFactoryImpl):
         raise ValueError('Expected all input executors to be sizing executors')
       self._sizing_executors[key].append(executor)
     py_typecheck.check_type(ex, executor_base.Executor)
-    self._executors[key] = ex
+    self._cache_executor(key, ex)
     return ex
 
   def get_size_info(self) -> SizeInfo:
@@ -153,6 +153,67 @@ class ExecutorFactoryImplTest(parameterized.TestCase):
       factory.create_executor({placement_literals.SERVER: 1})
     self.assertEqual(num_times_invoked, 2)
 
+  @parameterized.named_parameters(
+      ('SizingExecutorFactory', executor_factory.SizingExecutorFactory),
+      ('ExecutorFactoryImpl', executor_factory.ExecutorFactoryImpl))
+  def test_max_cached_executors_closes_least_recently_used(self, ex_factory):
+    executors = {}
+
+    def _stack_fn(cardinalities):
+      ex = eager_tf_executor.EagerTFExecutor()
+      ex.close = mock.MagicMock()
+      executors[cardinalities.get(placement_literals.CLIENTS)] = ex
+      return ex
+
+    maybe_wrapped_stack_fn = self._maybe_wrap_stack_fn(_stack_fn, ex_factory)
+    factory = ex_factory(maybe_wrapped_stack_fn, max_cached_executors=2)
+    factory.create_executor({placement_literals.CLIENTS: 1})
+    factory.create_executor({placement_literals.CLIENTS: 2})
+    # Uses the stack for 1 client, such that the stack for 2 clients is the
+    # least recently used one.
+    factory.create_executor({placement_literals.CLIENTS: 1})
+    factory.create_executor({placement_literals.CLIENTS: 3})
+
+    executors[1].close.assert_not_called()
+    executors[2].close.assert_called_once()
+    executors[3].close.assert_not_called()
+
+    ex = executors[2]
+    self.assertIsNot(
+        factory.create_executor({placement_literals.CLIENTS: 2}), ex)
+    executors[1].close.assert_called_once()
+
+  @parameterized.named_parameters(
+      ('SizingExecutorFactory', executor_factory.SizingExecutorFactory),
+      ('ExecutorFactoryImpl', executor_factory.ExecutorFactoryImpl))
+  def test_max_cached_executors_retires_acquired_executors_once_released(
+      self, ex_factory):
+    executors = {}
+
+    def _stack_fn(cardinalities):
+      ex = eager_tf_executor.EagerTFExecutor()
+      ex.close = mock.MagicMock()
+      executors[cardinalities.get(placement_literals.CLIENTS)] = ex
+      return ex
+
+    maybe_wrapped_stack_fn = self._maybe_wrap_stack_fn(_stack_fn, ex_factory)
+    factory = ex_factory(maybe_wrapped_stack_fn, max_cached_executors=1)
+    ex = factory.acquire_executor({placement_literals.CLIENTS: 1})
+    self.assertIs(factory.acquire_executor({placement_literals.CLIENTS: 1}), ex)
+    factory.create_executor({placement_literals.CLIENTS: 2})
+
+    executors[1].close.assert_not_called()
+    self.assertFalse(factory.release_executor(ex))
+    executors[1].close.assert_not_called()
+    self.assertTrue(factory.release_executor(ex))
+    executors[1].close.assert_called_once()
+    executors[2].close.assert_not_called()
+
+  def test_raises_with_nonpositive_max_cached_executors(self):
+    with self.assertRaises(ValueError):
+      executor_factory.ExecutorFactoryImpl(
+          lambda x: None, max_cached_executors=0)
+
 
 if __name__ == '__main__':
   test.main()
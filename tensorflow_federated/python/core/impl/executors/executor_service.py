@@ -172,17 +172,37 @@ class ExecutorService(executor_pb2_grpc.ExecutorServicer):
       with tracing.span('ExecutorService.CreateValue', 'deserialize_value'):
         value, value_type = (
             executor_service_utils.deserialize_value(request.value))
-      value_id = str(uuid.uuid4())
-      coro = self._executor.create_value(value, value_type)
-      future_val = self._run_coro_threadsafe_with_tracing(coro)
-      with self._lock:
-        self._values[value_id] = future_val
-      return executor_pb2.CreateValueResponse(
-          value_ref=executor_pb2.ValueRef(id=value_id))
+      return self._create_value(value, value_type)
     except (ValueError, TypeError) as err:
       _set_invalid_arg_err(context, err)
       return executor_pb2.CreateValueResponse()
 
+  def CreateValueStream(
+      self,
+      request_iter: Iterable[executor_pb2.CreateValueChunk],
+      context: grpc.ServicerContext,
+  ) -> executor_pb2.CreateValueResponse:
+    """Creates a value embedded in the executor from a stream of chunks."""
+    try:
+      with tracing.span('ExecutorService.CreateValueStream',
+                        'deserialize_value_chunks'):
+        value, value_type = (
+            executor_service_utils.deserialize_value_chunks(request_iter))
+      return self._create_value(value, value_type)
+    except (ValueError, TypeError) as err:
+      _set_invalid_arg_err(context, err)
+      return executor_pb2.CreateValueResponse()
+
+  def _create_value(self, value,
+                    value_type) -> executor_pb2.CreateValueResponse:
+    value_id = str(uuid.uuid4())
+    coro = self._executor.create_value(value, value_type)
+    future_val = self._run_coro_threadsafe_with_tracing(coro)
+    with self._lock:
+      self._values[value_id] = future_val
+    return executor_pb2.CreateValueResponse(
+        value_ref=executor_pb2.ValueRef(id=value_id))
+
   def CreateCall(
       self,
       request: executor_pb2.CreateCallRequest,
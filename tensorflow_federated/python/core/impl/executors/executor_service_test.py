@@ -17,12 +17,14 @@ import threading
 from absl.testing import absltest
 import grpc
 from grpc.framework.foundation import logging_pool
+import numpy as np
 import portpicker
 import tensorflow as tf
 
 from tensorflow_federated.proto.v0 import executor_pb2
 from tensorflow_federated.proto.v0 import executor_pb2_grpc
 from tensorflow_federated.python.common_libs import py_typecheck
+from tensorflow_federated.python.core.api import computation_types
 from tensorflow_federated.python.core.api import computations
 from tensorflow_federated.python.core.impl.executors import eager_tf_executor
 from tensorflow_federated.python.core.impl.executors import executor_base
@@ -137,6 +139,19 @@ class ExecutorServiceTest(absltest.TestCase):
     self.assertEqual(value, 10.0)
     del env
 
+  def test_executor_service_create_value_stream(self):
+    env = TestEnv(eager_tf_executor.EagerTFExecutor())
+    value = np.arange(100, dtype=np.int32)
+    chunks, _ = executor_service_utils.serialize_value_chunks(
+        value, computation_types.TensorType(tf.int32, [100]),
+        chunk_size_bytes=64)
+    response = env.stub.CreateValueStream(chunks)
+    self.assertIsInstance(response, executor_pb2.CreateValueResponse)
+    value_id = str(response.value_ref.id)
+    result = env.get_value(value_id)
+    self.assertTrue(np.array_equal(result, value))
+    del env
+
   def test_executor_service_create_no_arg_computation_value_and_call(self):
     env = TestEnv(eager_tf_executor.EagerTFExecutor())
 
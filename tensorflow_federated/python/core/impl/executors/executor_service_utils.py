@@ -16,9 +16,10 @@
 import os
 import os.path
 import tempfile
-from typing import Any, Optional, Tuple, Union
+from typing import Any, Iterable, Iterator, Optional, Tuple, Union
 import zipfile
 
+from absl import logging
 import numpy as np
 import tensorflow as tf
 
@@ -44,6 +45,11 @@ _DeserializeReturnType = Tuple[Any, computation_types.Type]
 # variables from the graph.
 _DEFAULT_MAX_SERIALIZED_SEQUENCE_SIZE_BYTES = 20 * (1024**2)  # 20 MB
 
+# The default maximum size of the content of a dense tensor in a single chunk
+# of a value streamed to `CreateValueStream`, well below the default maximum
+# gRPC message size of 4 MB.
+_DEFAULT_VALUE_CHUNK_SIZE_BYTES = 1024**2  # 1 MB
+
 
 class DatasetSerializationError(Exception):
   """Error raised during Dataset serialization or deserialization."""
@@ -60,12 +66,59 @@ def _serialize_computation(
   return executor_pb2.Value(computation=comp), type_spec
 
 
+def _is_dense_tensor_dtype(dtype: tf.DType) -> bool:
+  """Returns `True` if tensors of `dtype` can be serialized as raw bytes."""
+  return dtype.is_bool or ((dtype.is_floating or dtype.is_integer or
+                            dtype.is_complex) and not dtype.is_quantized)
+
+
+def _to_dense_tensor_array(
+    value: Any,
+    type_spec: computation_types.TensorType) -> Optional[np.ndarray]:
+  """Returns `value` as an array to serialize as a `DenseTensor`, if possible.
+
+  Args:
+    value: A tensor value to be serialized.
+    type_spec: A `tff.TensorType`.
+
+  Returns:
+    A contiguous Numpy array with the elements of `value` in little-endian byte
+    order, or `None` if `value` is not a Numpy array (or eager tensor) whose
+    dtype is the numeric or boolean dtype of `type_spec`.
+
+  Raises:
+    TypeError: If the shape of `value` does not match `type_spec`.
+  """
+  if isinstance(value, tf.Tensor):
+    value = value.numpy()
+  if isinstance(value, np.generic):
+    value = np.asarray(value)
+  if (not isinstance(value, np.ndarray) or
+      not _is_dense_tensor_dtype(type_spec.dtype) or
+      value.dtype != type_spec.dtype.as_numpy_dtype):
+    return None
+  type_spec.check_assignable_from(
+      computation_types.TensorType(type_spec.dtype, value.shape))
+  # This is a no-op for contiguous arrays on little-endian hosts.
+  return np.ascontiguousarray(value, dtype=value.dtype.newbyteorder('<'))
+
+
+def _serialize_dense_tensor_type(
+    dtype: tf.DType, shape) -> computation_pb2.TensorType:
+  return type_serialization.serialize_type(
+      computation_types.TensorType(dtype, shape)).tensor
+
+
 @tracing.trace
 def _serialize_tensor_value(
     value: Any,
     type_spec: computation_types.TensorType) -> _SerializeReturnType:
   """Serializes a tensor value into `executor_pb2.Value`.
 
+  Numpy arrays (and eager tensors) whose dtype matches a numeric or boolean
+  `type_spec` are serialized as raw bytes in a `DenseTensor`; all other values
+  are serialized as a `tensorflow.TensorProto`.
+
   Args:
     value: A Numpy array or other object understood by `tf.make_tensor_proto`.
     type_spec: A `tff.TensorType`.
@@ -83,6 +136,14 @@ def _serialize_tensor_value(
   """
   if isinstance(value, tf.Tensor):
     value = value.numpy()
+  dense_array = _to_dense_tensor_array(value, type_spec)
+  if dense_array is not None:
+    # The elements are written to the proto as raw bytes, without an
+    # intermediate `tensorflow.TensorProto`.
+    dense_tensor = executor_pb2.Value.DenseTensor(
+        type=_serialize_dense_tensor_type(type_spec.dtype, dense_array.shape),
+        content=dense_array.tobytes())
+    return executor_pb2.Value(dense_tensor=dense_tensor), type_spec
   if isinstance(value, np.ndarray):
     tensor_proto = tf.make_tensor_proto(
         value, dtype=type_spec.dtype, verify_shape=False)
@@ -151,6 +212,56 @@ def _serialize_dataset(
   return zip_bytes
 
 
+# The `external_state_policy` of `DatasetToGraphV2` under which serializing a
+# dataset that depends on external state (e.g., a lookup table) fails.
+_EXTERNAL_STATE_POLICY_FAIL = 2
+
+
+def _serialize_dataset_graph_def(
+    dataset,
+    max_serialized_size_bytes=_DEFAULT_MAX_SERIALIZED_SEQUENCE_SIZE_BYTES):
+  """Serializes a `tf.data.Dataset` value into the bytes of its `GraphDef`.
+
+  Unlike `_serialize_dataset`, the dataset is serialized in memory, without
+  writing to the filesystem. Datasets that depend on external state (e.g., a
+  lookup table or a Python function), or whose elements have a structure that
+  cannot be recovered from their TFF type, cannot be serialized this way.
+
+  Args:
+    dataset: A `tf.data.Dataset`.
+    max_serialized_size_bytes: An `int` size in bytes designating the threshold
+      on when to raise an error if the resulting serialization is too big.
+
+  Returns:
+    A `bytes` object that can be sent to `_deserialize_dataset_graph_def` to
+    recover the original `tf.data.Dataset`.
+
+  Raises:
+    DatasetSerializationError: If the dataset cannot be serialized this way.
+  """
+  py_typecheck.check_type(dataset,
+                          type_conversions.TF_DATASET_REPRESENTATION_TYPES)
+  try:
+    # The structure of the elements must be recoverable from their TFF type to
+    # deserialize the `GraphDef`.
+    type_conversions.type_to_tf_structure(
+        computation_types.to_type(dataset.element_spec))
+    graph_def = tf.raw_ops.DatasetToGraphV2(
+        input_dataset=tf.data.experimental.to_variant(dataset),
+        external_state_policy=_EXTERNAL_STATE_POLICY_FAIL,
+        strip_device_assignment=True)
+    graph_def_bytes = graph_def.numpy()
+  except Exception as e:  # pylint: disable=broad-except
+    raise DatasetSerializationError(
+        'Error serializing tff.Sequence value. Inner error: {!s}'.format(
+            e)) from e
+  if len(graph_def_bytes) > max_serialized_size_bytes:
+    raise ValueError('Serialized size of Dataset ({:d} bytes) exceeds maximum '
+                     'allowed ({:d} bytes)'.format(
+                         len(graph_def_bytes), max_serialized_size_bytes))
+  return graph_def_bytes
+
+
 @tracing.trace
 def _serialize_sequence_value(
     value: Union[type_conversions.TF_DATASET_REPRESENTATION_TYPES],
@@ -185,11 +296,14 @@ def _serialize_sequence_value(
   # type. This allows TFF to preserve and restore the key ordering upon
   # deserialization.
   element_type = computation_types.to_type(value.element_spec)
-  return executor_pb2.Value(
-      sequence=executor_pb2.Value.Sequence(
-          zipped_saved_model=_serialize_dataset(value),
-          element_type=type_serialization.serialize_type(
-              element_type))), type_spec
+  sequence_proto = executor_pb2.Value.Sequence(
+      element_type=type_serialization.serialize_type(element_type))
+  try:
+    sequence_proto.serialized_graph_def = _serialize_dataset_graph_def(value)
+  except DatasetSerializationError as e:
+    logging.debug('Serializing the dataset as a SavedModel: %s', e)
+    sequence_proto.zipped_saved_model = _serialize_dataset(value)
+  return executor_pb2.Value(sequence=sequence_proto), type_spec
 
 
 @tracing.trace
@@ -327,6 +441,57 @@ def _deserialize_tensor_value(
   return tensor_value, value_type
 
 
+def _get_dense_tensor_layout(tensor_type_proto: computation_pb2.TensorType):
+  """Returns the type, Numpy dtype and size in bytes of a `DenseTensor`.
+
+  Args:
+    tensor_type_proto: The `type` of an `executor_pb2.Value.DenseTensor`.
+
+  Returns:
+    A tuple `(type_spec, dtype, size_bytes)`, where `type_spec` is an instance
+    of `tff.TensorType`, `dtype` is the little-endian Numpy dtype of the
+    elements, and `size_bytes` is the size in bytes of the content.
+
+  Raises:
+    ValueError: If the type does not have a fully defined shape.
+  """
+  type_spec = type_serialization.deserialize_type(
+      computation_pb2.Type(tensor=tensor_type_proto))
+  if not type_spec.shape.is_fully_defined():
+    raise ValueError('Expected a dense tensor with a fully defined shape, '
+                     'found {}.'.format(type_spec))
+  dtype = np.dtype(type_spec.dtype.as_numpy_dtype).newbyteorder('<')
+  return type_spec, dtype, type_spec.shape.num_elements() * dtype.itemsize
+
+
+@tracing.trace
+def _deserialize_dense_tensor_value(
+    value_proto: executor_pb2.Value) -> _DeserializeReturnType:
+  """Deserializes a dense tensor value from `executor_pb2.Value`.
+
+  Args:
+    value_proto: An instance of `executor_pb2.Value` with a `dense_tensor`.
+
+  Returns:
+    A tuple `(value, type_spec)`, where `value` is a read-only Numpy array
+    backed by the bytes of `value_proto`, and `type_spec` is an instance of
+    `tff.TensorType` that represents its type.
+
+  Raises:
+    ValueError: If the value is malformed.
+  """
+  dense_tensor = value_proto.dense_tensor
+  value_type, dtype, size_bytes = _get_dense_tensor_layout(dense_tensor.type)
+  content = dense_tensor.content
+  if len(content) != size_bytes:
+    raise ValueError(
+        'Expected {} bytes for a dense tensor of type {}, found {}.'.format(
+            size_bytes, value_type, len(content)))
+  tensor_value = np.frombuffer(content, dtype=dtype).reshape(
+      value_type.shape.as_list())
+  return tensor_value, value_type
+
+
 def _deserialize_dataset(serialized_bytes):
   """Deserializes a `bytes` object to a `tf.data.Dataset`.
 
@@ -366,6 +531,37 @@ def _deserialize_dataset(serialized_bytes):
   return ds
 
 
+def _deserialize_dataset_graph_def(serialized_graph_def: bytes,
+                                   element_type: computation_types.Type):
+  """Deserializes the bytes of a `GraphDef` to a `tf.data.Dataset`.
+
+  Args:
+    serialized_graph_def: `bytes` object produced by
+      `_serialize_dataset_graph_def`.
+    element_type: The `tff.Type` of the elements of the dataset.
+
+  Returns:
+    A `tf.data.Dataset` instance.
+
+  Raises:
+    DatasetSerializationError: If there was an error in TensorFlow during
+      deserialization.
+  """
+  py_typecheck.check_type(serialized_graph_def, bytes)
+  try:
+    element_structure = type_conversions.type_to_tf_structure(element_type)
+    # Like in `_deserialize_dataset`, the dataset is placed on the CPU.
+    with tf.device('cpu'):
+      variant = tf.raw_ops.DatasetFromGraph(graph_def=serialized_graph_def)
+      ds = tf.data.experimental.from_variant(
+          variant, structure=element_structure)
+  except Exception as e:  # pylint: disable=broad-except
+    raise DatasetSerializationError(
+        'Error deserializing tff.Sequence value. Inner error: {!s}'.format(
+            e)) from e
+  return ds
+
+
 @tracing.trace
 def _deserialize_sequence_value(
     sequence_value_proto: executor_pb2.Value.Sequence
@@ -378,17 +574,19 @@ def _deserialize_sequence_value(
   Returns:
     A tuple of `(tf.data.Dataset, tff.Type)`.
   """
+  element_type = type_serialization.deserialize_type(
+      sequence_value_proto.element_type)
   which_value = sequence_value_proto.WhichOneof('value')
   if which_value == 'zipped_saved_model':
     ds = _deserialize_dataset(sequence_value_proto.zipped_saved_model)
+  elif which_value == 'serialized_graph_def':
+    ds = _deserialize_dataset_graph_def(
+        sequence_value_proto.serialized_graph_def, element_type)
   else:
     raise NotImplementedError(
         'Deserializing Sequences enocded as {!s} has not been implemented'
         .format(which_value))
 
-  element_type = type_serialization.deserialize_type(
-      sequence_value_proto.element_type)
-
   # If a serialized dataset had elements of nested structes of tensors (e.g.
   # `dict`, `OrderedDict`), the deserialized dataset will return `dict`,
   # `tuple`, or `namedtuple` (loses `collections.OrderedDict` in a conversion).
@@ -460,6 +658,8 @@ def deserialize_value(
   which_value = value_proto.WhichOneof('value')
   if which_value == 'tensor':
     return _deserialize_tensor_value(value_proto)
+  elif which_value == 'dense_tensor':
+    return _deserialize_dense_tensor_value(value_proto)
   elif which_value == 'computation':
     return _deserialize_computation(value_proto)
   elif which_value == 'sequence':
@@ -471,3 +671,245 @@ def deserialize_value(
   else:
     raise ValueError(
         'Unable to deserialize a value of type {}.'.format(which_value))
+
+
+def _iter_leaves(value: Any, type_spec: computation_types.Type,
+                 path: Tuple[int, ...]):
+  """Yields `(path, value, type_spec)` for the leaves of `value`.
+
+  The leaves of a value are its constituents which are neither structs nor
+  federated values, in depth-first order.
+
+  Args:
+    value: A value to be serialized.
+    type_spec: The `tff.Type` of `value`.
+    path: The indices of `value` in the enclosing structs and federated values.
+  """
+  if type_spec.is_struct():
+    type_elem_iter = structure.iter_elements(type_spec)
+    val_elem_iter = structure.iter_elements(structure.from_container(value))
+    for index, ((_, e_type), (_, e_val)) in enumerate(
+        zip(type_elem_iter, val_elem_iter)):
+      yield from _iter_leaves(e_val, e_type, path + (index,))
+  elif type_spec.is_federated():
+    members = [value] if type_spec.all_equal else value
+    py_typecheck.check_type(members, list)
+    for index, member in enumerate(members):
+      yield from _iter_leaves(member, type_spec.member, path + (index,))
+  else:
+    yield path, value, type_spec
+
+
+def _iter_leaf_chunk_values(value: Any, type_spec: computation_types.Type,
+                            chunk_size_bytes: int):
+  """Yields the `executor_pb2.Value`s of the chunks of a leaf value."""
+  if type_spec.is_tensor():
+    dense_array = _to_dense_tensor_array(value, type_spec)
+    if dense_array is not None and dense_array.nbytes > chunk_size_bytes:
+      # Only a single chunk of the content is copied at a time.
+      content = dense_array.reshape([-1]).view(np.uint8)
+      for start in range(0, content.size, chunk_size_bytes):
+        dense_tensor = executor_pb2.Value.DenseTensor(
+            content=content[start:start + chunk_size_bytes].tobytes())
+        if start == 0:
+          dense_tensor.type.CopyFrom(
+              _serialize_dense_tensor_type(type_spec.dtype, dense_array.shape))
+        yield executor_pb2.Value(dense_tensor=dense_tensor)
+      return
+  value_proto, _ = serialize_value(value, type_spec)
+  yield value_proto
+
+
+def serialize_value_chunks(
+    value: Any,
+    type_spec: Optional[computation_types.Type] = None,
+    chunk_size_bytes: int = _DEFAULT_VALUE_CHUNK_SIZE_BYTES
+) -> Tuple[Iterator[executor_pb2.CreateValueChunk], computation_types.Type]:
+  """Serializes a value into a stream of `executor_pb2.CreateValueChunk`s.
+
+  The value is serialized lazily as the returned iterator is consumed, one leaf
+  at a time, and dense tensors larger than `chunk_size_bytes` are split across
+  several chunks, such that the complete serialized value is never held in
+  memory. Other leaves, such as computations and sequences, are serialized
+  into a single chunk regardless of their size.
+
+  Args:
+    value: A value to be serialized.
+    type_spec: Optional type spec, a `tff.Type` or something convertible to it.
+    chunk_size_bytes: The maximum size in bytes of the content of a dense tensor
+      in a single chunk.
+
+  Returns:
+    A tuple `(chunks, ret_type_spec)` where `chunks` is an iterator of
+    `executor_pb2.CreateValueChunk`s with the serialized content of `value`,
+    and the returned `ret_type_spec` is an instance of `tff.Type` that
+    represents the TFF type of the serialized value.
+
+  Raises:
+    TypeError: If the arguments are of the wrong types.
+    ValueError: If `chunk_size_bytes` is not positive.
+  """
+  py_typecheck.check_type(chunk_size_bytes, int)
+  if chunk_size_bytes < 1:
+    raise ValueError('Expected a positive `chunk_size_bytes`, found {}.'.format(
+        chunk_size_bytes))
+  type_spec = computation_types.to_type(type_spec)
+  if (type_spec is None or isinstance(
+      value, (computation_pb2.Computation, computation_impl.ComputationImpl))):
+    value_proto, type_spec = serialize_value(value, type_spec)
+    chunk = executor_pb2.CreateValueChunk(
+        type=type_serialization.serialize_type(type_spec), value=value_proto)
+    return iter([chunk]), type_spec
+
+  def _iter_chunks():
+    type_proto = type_serialization.serialize_type(type_spec)
+    for path, leaf_value, leaf_type in _iter_leaves(value, type_spec, ()):
+      for chunk_value in _iter_leaf_chunk_values(leaf_value, leaf_type,
+                                                 chunk_size_bytes):
+        chunk = executor_pb2.CreateValueChunk(path=path, value=chunk_value)
+        if type_proto is not None:
+          chunk.type.CopyFrom(type_proto)
+          type_proto = None
+        yield chunk
+    if type_proto is not None:
+      # A value without leaves, such as an empty struct.
+      yield executor_pb2.CreateValueChunk(type=type_proto)
+
+  return _iter_chunks(), type_spec
+
+
+class _DenseTensorBuilder(object):
+  """Assembles a dense tensor whose content is split across several chunks."""
+
+  def __init__(self, tensor_type_proto: computation_pb2.TensorType):
+    self._type_spec, self._dtype, size_bytes = _get_dense_tensor_layout(
+        tensor_type_proto)
+    self._buffer = bytearray(size_bytes)
+    self._size_bytes = 0
+
+  def append(self, content: bytes):
+    end = self._size_bytes + len(content)
+    if end > len(self._buffer):
+      raise ValueError('Received more than the {} bytes of a dense tensor of '
+                       'type {}.'.format(len(self._buffer), self._type_spec))
+    self._buffer[self._size_bytes:end] = content
+    self._size_bytes = end
+
+  def build(self) -> np.ndarray:
+    if self._size_bytes != len(self._buffer):
+      raise ValueError(
+          'Expected {} bytes for a dense tensor of type {}, found {}.'.format(
+              len(self._buffer), self._type_spec, self._size_bytes))
+    value = np.frombuffer(self._buffer, dtype=self._dtype)
+    return value.reshape(self._type_spec.shape.as_list())
+
+
+class _ValueTree(object):
+  """The leaves of a value received in chunks, indexed by their paths."""
+
+  def __init__(self):
+    self.children = {}
+    self.has_value = False
+    self.value = None
+
+  def set_value(self, path: Tuple[int, ...], value: Any):
+    node = self
+    for index in path:
+      node = node.children.setdefault(index, _ValueTree())
+    if node.has_value or node.children:
+      raise ValueError('Received more than one value at path {}.'.format(path))
+    node.has_value = True
+    node.value = value
+
+  def assemble(self, type_spec: computation_types.Type) -> Any:
+    """Returns the value of `type_spec` with the leaves in this tree."""
+    if self.has_value:
+      return self.value
+    elif type_spec.is_struct():
+      elements = []
+      for index, (name, e_type) in enumerate(
+          structure.iter_elements(type_spec)):
+        child = self.children.get(index, _ValueTree())
+        elements.append((name, child.assemble(e_type)))
+      return structure.Struct(elements)
+    elif type_spec.is_federated():
+      if sorted(self.children) != list(range(len(self.children))):
+        raise ValueError('Received the members of a federated value at '
+                         'indices {}.'.format(sorted(self.children)))
+      members = [
+          self.children[index].assemble(type_spec.member)
+          for index in range(len(self.children))
+      ]
+      if type_spec.all_equal:
+        if len(members) != 1:
+          raise ValueError(
+              'Encountered an all_equal value with {} member constituents. '
+              'Expected exactly 1.'.format(len(members)))
+        return members[0]
+      return members
+    else:
+      raise ValueError('Missing a value of type {}.'.format(type_spec))
+
+
+@tracing.trace
+def deserialize_value_chunks(
+    chunks: Iterable[executor_pb2.CreateValueChunk]) -> _DeserializeReturnType:
+  """Deserializes a value from a stream of `executor_pb2.CreateValueChunk`s.
+
+  The chunks are deserialized as they are received, such that the complete
+  serialized value is never held in memory.
+
+  Args:
+    chunks: An iterable of `executor_pb2.CreateValueChunk`s, as produced by
+      `serialize_value_chunks`.
+
+  Returns:
+    A tuple `(value, type_spec)`, where `value` is a deserialized
+    representation of the transmitted value, and `type_spec` is an instance of
+    `tff.Type` that represents its type.
+
+  Raises:
+    TypeError: If the arguments are of the wrong types.
+    ValueError: If the chunks are malformed.
+  """
+  type_spec = None
+  tree = _ValueTree()
+  builder = None
+  builder_path = None
+  for chunk in chunks:
+    py_typecheck.check_type(chunk, executor_pb2.CreateValueChunk)
+    if type_spec is None:
+      if not chunk.HasField('type'):
+        raise ValueError('Expected the first chunk to set the type.')
+      type_spec = type_serialization.deserialize_type(chunk.type)
+    which_value = chunk.value.WhichOneof('value')
+    if which_value is None:
+      continue
+    path = tuple(chunk.path)
+    is_continuation = (
+        which_value == 'dense_tensor' and
+        not chunk.value.dense_tensor.HasField('type'))
+    if builder is not None and (not is_continuation or path != builder_path):
+      tree.set_value(builder_path, builder.build())
+      builder = None
+    if is_continuation:
+      if builder is None:
+        raise ValueError('Received a part of a dense tensor at path {} '
+                         'without its type.'.format(path))
+      builder.append(chunk.value.dense_tensor.content)
+      continue
+    if which_value == 'dense_tensor':
+      _, _, size_bytes = _get_dense_tensor_layout(
+          chunk.value.dense_tensor.type)
+      if len(chunk.value.dense_tensor.content) < size_bytes:
+        builder = _DenseTensorBuilder(chunk.value.dense_tensor.type)
+        builder.append(chunk.value.dense_tensor.content)
+        builder_path = path
+        continue
+    value, _ = deserialize_value(chunk.value)
+    tree.set_value(path, value)
+  if type_spec is None:
+    raise ValueError('Expected at least one chunk.')
+  if builder is not None:
+    tree.set_value(builder_path, builder.build())
+  return tree.assemble(type_spec), type_spec
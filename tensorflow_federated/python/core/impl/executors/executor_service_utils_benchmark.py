@@ -0,0 +1,117 @@
+# Copyright 2020, The TensorFlow Federated Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Benchmarks the serialization of datasets in `executor_service_utils`.
+
+Compares serializing client datasets as zipped SavedModels with serializing
+them as in-memory `GraphDef`s, for synthetic datasets shaped like the EMNIST
+and StackOverflow client datasets.
+
+To run the benchmarks:
+
+```
+bazel run //tensorflow_federated/python/core/impl/executors:executor_service_utils_benchmark -- --benchmarks=.
+```
+"""
+
+import collections
+import time
+
+import numpy as np
+import tensorflow as tf
+
+from tensorflow_federated.proto.v0 import executor_pb2
+from tensorflow_federated.python.core.api import computation_types
+from tensorflow_federated.python.core.impl.executors import executor_service_utils
+from tensorflow_federated.python.core.impl.types import type_serialization
+
+_NUM_EXAMPLES = 100
+_BATCH_SIZE = 20
+_SEQUENCE_LENGTH = 20
+_VOCAB_SIZE = 10000
+_NUM_ITERS = 20
+
+
+def _create_emnist_like_dataset():
+  pixels = np.random.uniform(size=[_NUM_EXAMPLES, 28, 28]).astype(np.float32)
+  labels = np.random.randint(10, size=[_NUM_EXAMPLES]).astype(np.int32)
+  return tf.data.Dataset.from_tensor_slices(
+      collections.OrderedDict(pixels=pixels,
+                              label=labels)).batch(_BATCH_SIZE)
+
+
+def _create_stackoverflow_like_dataset():
+  tokens = np.random.randint(
+      _VOCAB_SIZE, size=[_NUM_EXAMPLES, _SEQUENCE_LENGTH]).astype(np.int64)
+  return tf.data.Dataset.from_tensor_slices(
+      collections.OrderedDict(x=tokens[:, :-1],
+                              y=tokens[:, 1:])).batch(_BATCH_SIZE)
+
+
+def _serialize_dataset(dataset, use_graph_def):
+  element_type = computation_types.to_type(dataset.element_spec)
+  sequence_proto = executor_pb2.Value.Sequence(
+      element_type=type_serialization.serialize_type(element_type))
+  if use_graph_def:
+    sequence_proto.serialized_graph_def = (
+        executor_service_utils._serialize_dataset_graph_def(dataset))
+  else:
+    sequence_proto.zipped_saved_model = (
+        executor_service_utils._serialize_dataset(dataset))
+  return executor_pb2.Value(sequence=sequence_proto)
+
+
+class DatasetSerializationBenchmark(tf.test.Benchmark):
+
+  def _benchmark_roundtrip(self, name, dataset, use_graph_def):
+
+    def _roundtrip():
+      value_proto = _serialize_dataset(dataset, use_graph_def)
+      value, _ = executor_service_utils.deserialize_value(value_proto)
+      # Iterate over the dataset to include the cost of materializing it.
+      for _ in value:
+        pass
+      return value_proto.ByteSize()
+
+    # Warm up, such that tracing the dataset functions is not measured.
+    serialized_size_bytes = _roundtrip()
+    wall_times = []
+    for _ in range(_NUM_ITERS):
+      start_time = time.time()
+      _roundtrip()
+      wall_times.append(time.time() - start_time)
+
+    mode = 'graph_def' if use_graph_def else 'saved_model'
+    self.report_benchmark(
+        name='{}_dataset_roundtrip_{}'.format(name, mode),
+        iters=_NUM_ITERS,
+        wall_time=np.median(wall_times),
+        extras={
+            'serialized_size_bytes': serialized_size_bytes,
+            'min_wall_time': np.min(wall_times),
+            'max_wall_time': np.max(wall_times),
+        })
+
+  def benchmark_emnist_like_dataset_roundtrip(self):
+    dataset = _create_emnist_like_dataset()
+    for use_graph_def in [False, True]:
+      self._benchmark_roundtrip('emnist', dataset, use_graph_def)
+
+  def benchmark_stackoverflow_like_dataset_roundtrip(self):
+    dataset = _create_stackoverflow_like_dataset()
+    for use_graph_def in [False, True]:
+      self._benchmark_roundtrip('stackoverflow', dataset, use_graph_def)
+
+
+if __name__ == '__main__':
+  tf.test.main()
@@ -60,6 +60,42 @@ class ExecutorServiceUtilsTest(tf.test.TestCase):
     self.assertEqual(str(type_spec), 'int32[3]')
     self.assertTrue(np.array_equal(x, y))
 
+  def test_serialize_deserialize_tensor_value_as_dense_tensor(self):
+    x = np.arange(6, dtype=np.float32).reshape([2, 3])
+    value_proto, value_type = executor_service_utils.serialize_value(
+        x, computation_types.TensorType(tf.float32, [2, 3]))
+    self.assertEqual(value_proto.WhichOneof('value'), 'dense_tensor')
+    self.assertEqual(str(value_type), 'float32[2,3]')
+    y, type_spec = executor_service_utils.deserialize_value(value_proto)
+    self.assertEqual(str(type_spec), 'float32[2,3]')
+    self.assertEqual(y.dtype, np.float32)
+    self.assertFalse(y.flags.writeable)
+    self.assertAllEqual(x, y)
+
+  def test_serialize_deserialize_non_contiguous_tensor_value(self):
+    x = np.arange(6, dtype=np.int64).reshape([2, 3]).T
+    value_proto, _ = executor_service_utils.serialize_value(
+        x, computation_types.TensorType(tf.int64, [3, 2]))
+    self.assertEqual(value_proto.WhichOneof('value'), 'dense_tensor')
+    y, _ = executor_service_utils.deserialize_value(value_proto)
+    self.assertAllEqual(x, y)
+
+  def test_serialize_deserialize_string_tensor_value(self):
+    x = np.array([b'a', b'bc'])
+    value_proto, _ = executor_service_utils.serialize_value(
+        x, computation_types.TensorType(tf.string, [2]))
+    self.assertEqual(value_proto.WhichOneof('value'), 'tensor')
+    y, type_spec = executor_service_utils.deserialize_value(value_proto)
+    self.assertEqual(str(type_spec), 'string[2]')
+    self.assertEqual(list(y), [b'a', b'bc'])
+
+  def test_deserialize_dense_tensor_value_with_bad_size_raises(self):
+    value_proto, _ = executor_service_utils.serialize_value(
+        np.zeros([3], np.int32), computation_types.TensorType(tf.int32, [3]))
+    value_proto.dense_tensor.content = b'\x00' * 4
+    with self.assertRaises(ValueError):
+      executor_service_utils.deserialize_value(value_proto)
+
   def test_serialize_sequence_bad_element_type(self):
     x = tf.data.Dataset.range(5).map(lambda x: x * 2)
     with self.assertRaisesRegex(
@@ -252,6 +288,113 @@ class ExecutorServiceUtilsTest(tf.test.TestCase):
     self.assertEqual(y, 10)
 
 
+class ValueChunksSerializationTest(tf.test.TestCase):
+
+  def _roundtrip(self, value, type_spec, chunk_size_bytes=16):
+    chunks, value_type = executor_service_utils.serialize_value_chunks(
+        value, type_spec, chunk_size_bytes)
+    chunks = list(chunks)
+    for chunk in chunks:
+      self.assertLessEqual(
+          len(chunk.value.dense_tensor.content), chunk_size_bytes)
+    result, result_type = executor_service_utils.deserialize_value_chunks(
+        chunks)
+    return chunks, value_type, result, result_type
+
+  def test_roundtrip_tensor_value_in_multiple_chunks(self):
+    x = np.arange(10, dtype=np.float32)
+    chunks, value_type, y, y_type = self._roundtrip(
+        x, computation_types.TensorType(tf.float32, [10]))
+    self.assertLen(chunks, 3)
+    self.assertEqual(str(value_type), 'float32[10]')
+    self.assertEqual(str(y_type), 'float32[10]')
+    self.assertAllEqual(x, y)
+
+  def test_roundtrip_tensor_value_in_single_chunk(self):
+    x = np.arange(4, dtype=np.int32)
+    chunks, _, y, y_type = self._roundtrip(
+        x, computation_types.TensorType(tf.int32, [4]))
+    self.assertLen(chunks, 1)
+    self.assertEqual(str(y_type), 'int32[4]')
+    self.assertAllEqual(x, y)
+
+  def test_roundtrip_nested_struct_value(self):
+    x = collections.OrderedDict(
+        a=np.arange(8, dtype=np.int64),
+        b=(np.float32(1.0), np.array([True, False])))
+    type_spec = computation_types.StructType([
+        ('a', computation_types.TensorType(tf.int64, [8])),
+        ('b', computation_types.StructType([
+            computation_types.TensorType(tf.float32),
+            computation_types.TensorType(tf.bool, [2]),
+        ])),
+    ])
+    _, _, y, y_type = self._roundtrip(x, type_spec)
+    self.assertEqual(y_type, type_spec)
+    self.assertAllEqual(y.a, x['a'])
+    self.assertEqual(y.b[0], 1.0)
+    self.assertAllEqual(y.b[1], [True, False])
+
+  def test_roundtrip_empty_struct_value(self):
+    chunks, _, y, y_type = self._roundtrip((), computation_types.StructType([]))
+    self.assertLen(chunks, 1)
+    self.assertEqual(str(y_type), '<>')
+    self.assertEmpty(y)
+
+  def test_roundtrip_federated_at_clients(self):
+    x = [np.full([8], i, np.int32) for i in range(3)]
+    type_spec = type_factory.at_clients(
+        computation_types.TensorType(tf.int32, [8]))
+    _, _, y, y_type = self._roundtrip(x, type_spec)
+    self.assertEqual(y_type, type_spec)
+    self.assertLen(y, 3)
+    for x_member, y_member in zip(x, y):
+      self.assertAllEqual(x_member, y_member)
+
+  def test_roundtrip_federated_at_server(self):
+    x = np.arange(8, dtype=np.int32)
+    type_spec = type_factory.at_server(
+        computation_types.TensorType(tf.int32, [8]))
+    _, _, y, y_type = self._roundtrip(x, type_spec)
+    self.assertEqual(y_type, type_spec)
+    self.assertAllEqual(x, y)
+
+  def test_roundtrip_computation_value(self):
+
+    @computations.tf_computation
+    def comp():
+      return tf.constant(10)
+
+    chunks, _, y, y_type = self._roundtrip(comp, None)
+    self.assertLen(chunks, 1)
+    self.assertIsInstance(y, computation_pb2.Computation)
+    self.assertEqual(str(y_type), '( -> int32)')
+
+  def test_serialize_value_chunks_with_nonpositive_chunk_size_raises(self):
+    with self.assertRaises(ValueError):
+      executor_service_utils.serialize_value_chunks(
+          np.zeros([4], np.int32), computation_types.TensorType(tf.int32, [4]),
+          chunk_size_bytes=0)
+
+  def test_deserialize_value_chunks_without_type_raises(self):
+    chunks, _ = executor_service_utils.serialize_value_chunks(
+        np.zeros([4], np.int32), computation_types.TensorType(tf.int32, [4]))
+    chunks = list(chunks)
+    chunks[0].ClearField('type')
+    with self.assertRaises(ValueError):
+      executor_service_utils.deserialize_value_chunks(chunks)
+
+  def test_deserialize_value_chunks_with_missing_chunk_raises(self):
+    chunks, _ = executor_service_utils.serialize_value_chunks(
+        np.zeros([10], np.int32),
+        computation_types.TensorType(tf.int32, [10]),
+        chunk_size_bytes=16)
+    chunks = list(chunks)
+    del chunks[1]
+    with self.assertRaises(ValueError):
+      executor_service_utils.deserialize_value_chunks(chunks)
+
+
 class DatasetSerializationTest(test.TestCase):
 
   def test_serialize_sequence_not_a_dataset(self):
@@ -361,6 +504,51 @@ class DatasetSerializationTest(test.TestCase):
     for actual, expected in zip(actual_values, expected_values):
       self.assertAllClose(actual, expected)
 
+  def test_serialize_graph_def_bytes_too_large(self):
+    with self.assertRaisesRegex(ValueError,
+                                r'Serialized size .* exceeds maximum allowed'):
+      _ = executor_service_utils._serialize_dataset_graph_def(
+          tf.data.Dataset.range(5), max_serialized_size_bytes=0)
+
+  def test_serialize_graph_def_fails_with_unsupported_structure(self):
+    x = tf.data.Dataset.range(5).map(lambda x: ())
+    with self.assertRaises(executor_service_utils.DatasetSerializationError):
+      _ = executor_service_utils._serialize_dataset_graph_def(x)
+
+  def test_roundtrip_graph_def_sequence_of_tuples(self):
+    x = tf.data.Dataset.range(5).map(
+        lambda x: (x * 2, tf.cast(x, tf.int32), tf.cast(x - 1, tf.float32)))
+    serialized_bytes = executor_service_utils._serialize_dataset_graph_def(x)
+    y = executor_service_utils._deserialize_dataset_graph_def(
+        serialized_bytes,
+        computation_types.to_type((tf.int64, tf.int32, tf.float32)))
+
+    self.assertEqual(x.element_spec, y.element_spec)
+    self.assertAllEqual(
+        self.evaluate(list(y)), [(x * 2, x, x - 1.) for x in range(5)])
+
+  def test_serialize_value_uses_graph_def(self):
+    ds = tf.data.Dataset.range(5).batch(2)
+    value_proto, value_type = executor_service_utils.serialize_value(
+        ds, computation_types.SequenceType(
+            computation_types.TensorType(tf.int64, [None])))
+    self.assertEqual(
+        value_proto.sequence.WhichOneof('value'), 'serialized_graph_def')
+    y, type_spec = executor_service_utils.deserialize_value(value_proto)
+    self.assertEqual(type_spec, value_type)
+    self.assertAllEqual(self.evaluate(list(y)), [[0, 1], [2, 3], [4]])
+
+  # TODO(b/137602785): bring GPU test back after the fix for `wrap_function`.
+  @test.skip_test_for_gpu
+  def test_serialize_value_falls_back_to_saved_model(self):
+    # A dataset with a `tf.py_function` depends on external state.
+    ds = tf.data.Dataset.range(5).map(
+        lambda x: tf.py_function(lambda y: y * 2, [x], tf.int64))
+    value_proto, _ = executor_service_utils.serialize_value(
+        ds, computation_types.SequenceType(tf.int64))
+    self.assertEqual(
+        value_proto.sequence.WhichOneof('value'), 'zipped_saved_model')
+
 
 if __name__ == '__main__':
   tf.test.main()
@@ -14,6 +14,7 @@
 """A collection of constructors for basic types of executor stacks."""
 
 import math
+import threading
 from typing import Callable, List, Optional, Sequence
 
 import tensorflow as tf
@@ -23,6 +24,7 @@ from tensorflow_federated.python.core.impl.executors import caching_executor
 from tensorflow_federated.python.core.impl.executors import eager_tf_executor
 from tensorflow_federated.python.core.impl.executors import executor_base
 from tensorflow_federated.python.core.impl.executors import executor_factory
+from tensorflow_federated.python.core.impl.executors import executor_utils
 from tensorflow_federated.python.core.impl.executors import federated_composing_strategy
 from tensorflow_federated.python.core.impl.executors import federated_resolving_strategy
 from tensorflow_federated.python.core.impl.executors import federating_executor
@@ -32,12 +34,22 @@ from tensorflow_federated.python.core.impl.executors import thread_delegating_ex
 from tensorflow_federated.python.core.impl.types import placement_literals
 
 
-def _wrap_executor_in_threading_stack(ex: executor_base.Executor,
-                                      use_caching: Optional[bool] = True,
-                                      can_resolve_references=True):
-  threaded_ex = thread_delegating_executor.ThreadDelegatingExecutor(ex)
+def _wrap_executor_in_threading_stack(
+    ex: executor_base.Executor,
+    use_caching: Optional[bool] = True,
+    can_resolve_references=True,
+    cache_max_size_bytes: Optional[int] = None,
+    worker_pool: Optional[thread_delegating_executor.WorkerPool] = None,
+    cardinalities: Optional[executor_factory.CardinalitiesType] = None):
+  threaded_ex = thread_delegating_executor.ThreadDelegatingExecutor(
+      ex, worker_pool=worker_pool)
   if use_caching:
-    threaded_ex = caching_executor.CachingExecutor(threaded_ex)
+    if cache_max_size_bytes is not None:
+      cache = caching_executor.SizeBoundedLRUCache(
+          cache_max_size_bytes, cardinalities=cardinalities)
+    else:
+      cache = None
+    threaded_ex = caching_executor.CachingExecutor(threaded_ex, cache=cache)
   if can_resolve_references:
     threaded_ex = reference_resolving_executor.ReferenceResolvingExecutor(
         threaded_ex)
@@ -50,6 +62,12 @@ class UnplacedExecutorFactory(executor_factory.ExecutorFactory):
   This factory constructs executors which represent "local execution": work
   that happens at the clients, at the server, or without placements. As such,
   this executor manages the placement of work on local executors.
+
+  If a `client_worker_pool` is given, the executors constructed for the clients
+  share its threads, rather than each starting a thread of its own. If
+  `use_shared_function_cache` is `True`, the executors share the TensorFlow
+  functions they embed with all other such executors in the process, rather
+  than each importing the same computations.
   """
 
   def __init__(
@@ -58,12 +76,37 @@ class UnplacedExecutorFactory(executor_factory.ExecutorFactory):
       use_caching: bool,
       can_resolve_references: bool = True,
       server_device: Optional[tf.config.LogicalDevice] = None,
-      client_devices: Optional[Sequence[tf.config.LogicalDevice]] = ()):
+      client_devices: Optional[Sequence[tf.config.LogicalDevice]] = (),
+      cache_max_size_bytes: Optional[int] = None,
+      client_worker_pool: Optional[
+          thread_delegating_executor.WorkerPool] = None,
+      use_shared_function_cache: bool = False):
+    if cache_max_size_bytes is not None:
+      py_typecheck.check_type(cache_max_size_bytes, int)
+      if cache_max_size_bytes < 1:
+        raise ValueError(
+            'Expected a positive `cache_max_size_bytes`, found {}.'.format(
+                cache_max_size_bytes))
+    if client_worker_pool is not None:
+      py_typecheck.check_type(client_worker_pool,
+                              thread_delegating_executor.WorkerPool)
     self._use_caching = use_caching
+    self._cache_max_size_bytes = cache_max_size_bytes
     self._can_resolve_references = can_resolve_references
     self._server_device = server_device
     self._client_devices = client_devices
     self._client_device_index = 0
+    self._client_worker_pool = client_worker_pool
+    if use_shared_function_cache:
+      self._shared_function_cache = (
+          eager_tf_executor.get_shared_function_cache())
+    else:
+      self._shared_function_cache = None
+
+  @property
+  def cache_max_size_bytes(self) -> Optional[int]:
+    """The bound on the estimated size of the values cached by each executor."""
+    return self._cache_max_size_bytes
 
   def _get_next_client_device(self) -> Optional[tf.config.LogicalDevice]:
     if not self._client_devices:
@@ -83,23 +126,91 @@ class UnplacedExecutorFactory(executor_factory.ExecutorFactory):
       raise ValueError(
           'Unplaced executors cannot accept nonempty cardinalities as '
           'arguments. Received cardinalities: {}.'.format(cardinalities))
+    worker_pool = None
     if placement == placement_literals.CLIENTS:
       device = self._get_next_client_device()
+      worker_pool = self._client_worker_pool
     elif placement == placement_literals.SERVER:
       device = self._server_device
     else:
       device = None
-    eager_ex = eager_tf_executor.EagerTFExecutor(device=device)
+    eager_ex = eager_tf_executor.EagerTFExecutor(
+        device=device, shared_function_cache=self._shared_function_cache)
     return _wrap_executor_in_threading_stack(
         eager_ex,
         use_caching=self._use_caching,
-        can_resolve_references=self._can_resolve_references)
+        can_resolve_references=self._can_resolve_references,
+        cache_max_size_bytes=self._cache_max_size_bytes,
+        worker_pool=worker_pool)
 
   def clean_up_executors(self):
     # Does not hold any executors internally, so nothing to clean up.
     pass
 
 
+class _SharedExecutor(object):
+  """An executor shared by the executor stacks of different cardinalities.
+
+  Each stack uses the executor through a view of its own. Closing a view only
+  closes the shared executor if no other view has been used since it was last
+  closed, such that closing a stack does not close the executor while another
+  stack is using it.
+  """
+
+  def __init__(self, executor: executor_base.Executor):
+    self._executor = executor
+    self._lock = threading.Lock()
+    self._views_in_use = set()
+
+  @property
+  def executor(self) -> executor_base.Executor:
+    return self._executor
+
+  def create_view(self) -> executor_base.Executor:
+    return _SharedExecutorView(self)
+
+  def _use_view(self, view):
+    with self._lock:
+      self._views_in_use.add(view)
+
+  def _close_view(self, view):
+    with self._lock:
+      self._views_in_use.discard(view)
+      if self._views_in_use:
+        return
+    self._executor.close()
+
+  def close(self):
+    self._executor.close()
+
+
+class _SharedExecutorView(executor_base.Executor):
+  """The view of a `_SharedExecutor` used by an executor stack."""
+
+  def __init__(self, shared_executor: _SharedExecutor):
+    self._shared_executor = shared_executor
+
+  def close(self):
+    self._shared_executor._close_view(self)  # pylint: disable=protected-access
+
+  def _target_executor(self) -> executor_base.Executor:
+    self._shared_executor._use_view(self)  # pylint: disable=protected-access
+    return self._shared_executor.executor
+
+  async def create_value(self, value, type_spec=None):
+    return await self._target_executor().create_value(value, type_spec)
+
+  async def create_call(self, comp, arg=None):
+    return await self._target_executor().create_call(comp, arg)
+
+  async def create_struct(self, elements):
+    return await self._target_executor().create_struct(elements)
+
+  async def create_selection(self, source, index=None, name=None):
+    return await self._target_executor().create_selection(
+        source, index=index, name=name)
+
+
 class FederatingExecutorFactory(executor_factory.ExecutorFactory):
   """Executor factory for stacks which delegate placed computations.
 
@@ -127,6 +238,22 @@ class FederatingExecutorFactory(executor_factory.ExecutorFactory):
       this hardcoded parameter.
     * A boolean `use_sizing` to indicate whether to wire instances of
       `sizing_executors.SizingExecutor` on top of the client stacks.
+    * An optional `aggregation_partition_size`, passed to the
+      `federated_resolving_strategy.FederatedResolvingStrategy` to select how
+      `federated_aggregate` is computed.
+    * An optional `aggregation_deadline_seconds` and `aggregation_quorum`,
+      passed to the `federated_resolving_strategy.FederatedResolvingStrategy`
+      to drop the clients that are not done by the deadline or quorum from
+      `federated_aggregate`. These only apply to `federated_aggregate`; all
+      other intrinsics, including `federated_map` and `federated_reduce`, still
+      wait for every client.
+    * A boolean `reuse_client_executors` to indicate whether the client
+      executors should be held and reused by the executors created for other
+      cardinalities, rather than constructing new client executors for each
+      executor. The executors created for different cardinalities then share
+      client executors, which are only closed (that is, have their caches
+      cleared) by closing one of them if none of the others has used them
+      since they were last closed.
   """
 
   def __init__(self,
@@ -134,7 +261,11 @@ class FederatingExecutorFactory(executor_factory.ExecutorFactory):
                clients_per_thread: int,
                unplaced_ex_factory: UnplacedExecutorFactory,
                num_clients: Optional[int] = None,
-               use_sizing: bool = False):
+               use_sizing: bool = False,
+               aggregation_partition_size: Optional[int] = None,
+               reuse_client_executors: bool = False,
+               aggregation_deadline_seconds: Optional[float] = None,
+               aggregation_quorum: Optional[float] = None):
     py_typecheck.check_type(clients_per_thread, int)
     py_typecheck.check_type(unplaced_ex_factory, UnplacedExecutorFactory)
     self._clients_per_thread = clients_per_thread
@@ -145,6 +276,17 @@ class FederatingExecutorFactory(executor_factory.ExecutorFactory):
         raise ValueError('Number of clients cannot be negative.')
     self._num_clients = num_clients
     self._use_sizing = use_sizing
+    if aggregation_partition_size is not None:
+      py_typecheck.check_type(aggregation_partition_size, int)
+      if aggregation_partition_size < 1:
+        raise ValueError('Aggregation partition size must be positive.')
+    self._aggregation_partition_size = aggregation_partition_size
+    executor_utils.check_aggregation_deadline_and_quorum(
+        aggregation_deadline_seconds, aggregation_quorum)
+    self._aggregation_deadline_seconds = aggregation_deadline_seconds
+    self._aggregation_quorum = aggregation_quorum
+    self._reuse_client_executors = reuse_client_executors
+    self._client_stacks = []
     if self._use_sizing:
       self._sizing_executors = []
     else:
@@ -177,12 +319,13 @@ class FederatingExecutorFactory(executor_factory.ExecutorFactory):
       num_clients = num_requested_clients
     return num_clients
 
-  def create_executor(
-      self, cardinalities: executor_factory.CardinalitiesType
-  ) -> executor_base.Executor:
-    """Constructs a federated executor with requested cardinalities."""
+  def get_num_client_executors(
+      self, cardinalities: executor_factory.CardinalitiesType) -> int:
+    """Returns the number of client executors used for `cardinalities`."""
     num_clients = self._validate_requested_clients(cardinalities)
-    num_client_executors = math.ceil(num_clients / self._clients_per_thread)
+    return math.ceil(num_clients / self._clients_per_thread)
+
+  def _create_client_stacks(self, num_client_executors):
     client_stacks = [
         self._unplaced_executor_factory.create_executor(
             cardinalities={}, placement=placement_literals.CLIENTS)
@@ -193,6 +336,40 @@ class FederatingExecutorFactory(executor_factory.ExecutorFactory):
           sizing_executor.SizingExecutor(ex) for ex in client_stacks
       ]
       self._sizing_executors.extend(client_stacks)
+    return client_stacks
+
+  def create_executor(
+      self,
+      cardinalities: executor_factory.CardinalitiesType,
+      client_executor_offset: int = 0) -> executor_base.Executor:
+    """Constructs a federated executor with requested cardinalities.
+
+    Args:
+      cardinalities: A mapping from placements to integers specifying the
+        cardinalities at each placement.
+      client_executor_offset: If `reuse_client_executors` was specified, the
+        index of the first held client executor to use. Executors which are
+        used concurrently, such as the children of a composing executor, should
+        use disjoint ranges of client executors.
+
+    Returns:
+      An `executor_base.Executor`.
+    """
+    num_clients = self._validate_requested_clients(cardinalities)
+    num_client_executors = math.ceil(num_clients / self._clients_per_thread)
+    if self._reuse_client_executors:
+      num_missing = (
+          client_executor_offset + num_client_executors -
+          len(self._client_stacks))
+      if num_missing > 0:
+        self._client_stacks.extend(
+            _SharedExecutor(ex)
+            for ex in self._create_client_stacks(num_missing))
+      shared_client_stacks = self._client_stacks[
+          client_executor_offset:client_executor_offset + num_client_executors]
+      client_stacks = [ex.create_view() for ex in shared_client_stacks]
+    else:
+      client_stacks = self._create_client_stacks(num_client_executors)
 
     federating_strategy_factory = federated_resolving_strategy.FederatedResolvingStrategy.factory(
         {
@@ -203,15 +380,40 @@ class FederatingExecutorFactory(executor_factory.ExecutorFactory):
             placement_literals.SERVER:
                 self._unplaced_executor_factory.create_executor(
                     placement=placement_literals.SERVER),
-        })
+        },
+        aggregation_partition_size=self._aggregation_partition_size,
+        aggregation_deadline_seconds=self._aggregation_deadline_seconds,
+        aggregation_quorum=self._aggregation_quorum)
     unplaced_executor = self._unplaced_executor_factory.create_executor()
     executor = federating_executor.FederatingExecutor(
         federating_strategy_factory, unplaced_executor)
-    return _wrap_executor_in_threading_stack(executor)
+    return _wrap_executor_in_threading_stack(
+        executor,
+        cache_max_size_bytes=self._unplaced_executor_factory
+        .cache_max_size_bytes,
+        cardinalities={
+            **cardinalities, placement_literals.CLIENTS: num_clients
+        })
 
   def clean_up_executors(self):
-    # Does not hold any executors internally, so nothing to clean up.
-    pass
+    for ex in self._client_stacks:
+      ex.close()
+    self._client_stacks = []
+
+
+def _split_num_clients(num_clients: int,
+                       max_clients_per_stack: int) -> List[int]:
+  """Returns the number of clients of each flat stack to run `num_clients`."""
+  if num_clients < 0:
+    raise ValueError('Number of clients cannot be negative.')
+  elif num_clients < 1:
+    return [0]
+  split = []
+  while num_clients > 0:
+    n = min(num_clients, max_clients_per_stack)
+    split.append(n)
+    num_clients -= n
+  return split
 
 
 def create_minimal_length_flat_stack_fn(
@@ -252,34 +454,84 @@ def create_minimal_length_flat_stack_fn(
           federated_stack_factory.create_executor(cardinalities=cardinalities)
       ]
     executors = []
-    while num_clients > 0:
-      n = min(num_clients, max_clients_per_stack)
+    client_executor_offset = 0
+    for n in _split_num_clients(num_clients, max_clients_per_stack):
       sub_executor_cardinalities = {**cardinalities}
       sub_executor_cardinalities[placement_literals.CLIENTS] = n
       executors.append(
-          federated_stack_factory.create_executor(sub_executor_cardinalities))
-      num_clients -= n
+          federated_stack_factory.create_executor(
+              sub_executor_cardinalities,
+              client_executor_offset=client_executor_offset))
+      client_executor_offset += (
+          federated_stack_factory.get_num_client_executors(
+              sub_executor_cardinalities))
     return executors
 
   return create_executor_list
 
 
+def create_minimal_length_flat_cardinalities_fn(
+    max_clients_per_stack: int
+) -> Callable[[executor_factory.CardinalitiesType], List[int]]:
+  """Creates a function returning the number of clients of each flat stack.
+
+  The returned function matches the function returned by
+  `create_minimal_length_flat_stack_fn` with the same `max_clients_per_stack`,
+  such that the number of clients of each executor it constructs is known
+  without computing anything in the executors.
+
+  Args:
+    max_clients_per_stack: Integer determining the maximum number of clients a
+      single executor in the list of flat stacks may execute.
+
+  Returns:
+    A callable taking a parameter of type `executor_factory.CardinalitiesType`,
+    and returning a list of the integer number of clients of each executor in
+    the list returned by the function returned by
+    `create_minimal_length_flat_stack_fn`.
+  """
+
+  def get_cardinalities_list(
+      cardinalities: executor_factory.CardinalitiesType) -> List[int]:
+    return _split_num_clients(
+        cardinalities.get(placement_literals.CLIENTS, 0), max_clients_per_stack)
+
+  return get_cardinalities_list
+
+
 class ComposingExecutorFactory(executor_factory.ExecutorFactory):
   """Factory class encapsulating executor compositional logic.
 
   This class is responsible for aggregating lists of executors into a
   compositional hierarchy based on the `max_fanout` parameter.
+
+  If `flat_cardinalities_fn` is specified, it must return the number of clients
+  of each of the executors returned by `flat_stack_fn`, which are then passed
+  down to the `FederatedComposingStrategy`s at construction, rather than
+  discovered by computing a `federated_sum` in each of their children.
   """
 
-  def __init__(self, *, max_fanout: int,
+  def __init__(self,
+               *,
+               max_fanout: int,
                unplaced_ex_factory: UnplacedExecutorFactory,
                flat_stack_fn: Callable[[executor_factory.CardinalitiesType],
-                                       Sequence[executor_base.Executor]]):
+                                       Sequence[executor_base.Executor]],
+               max_in_flight_children: Optional[int] = None,
+               aggregation_deadline_seconds: Optional[float] = None,
+               aggregation_quorum: Optional[float] = None,
+               flat_cardinalities_fn: Optional[
+                   Callable[[executor_factory.CardinalitiesType],
+                            Sequence[int]]] = None):
     if max_fanout < 2:
       raise ValueError('Max fanout must be greater than 1.')
     self._flat_stack_fn = flat_stack_fn
     self._max_fanout = max_fanout
     self._unplaced_ex_factory = unplaced_ex_factory
+    self._max_in_flight_children = max_in_flight_children
+    self._aggregation_deadline_seconds = aggregation_deadline_seconds
+    self._aggregation_quorum = aggregation_quorum
+    self._flat_cardinalities_fn = flat_cardinalities_fn
 
   def create_executor(
       self, cardinalities: executor_factory.CardinalitiesType
@@ -298,28 +550,48 @@ class ComposingExecutorFactory(executor_factory.ExecutorFactory):
       An `executor_base.Executor` satisfying the conditions above.
     """
     executors = self._flat_stack_fn(cardinalities)
-    return self._aggregate_stacks(executors)
+    if self._flat_cardinalities_fn is not None:
+      flat_cardinalities = list(self._flat_cardinalities_fn(cardinalities))
+      py_typecheck.check_len(flat_cardinalities, len(executors))
+    else:
+      flat_cardinalities = None
+    return self._aggregate_stacks(executors, flat_cardinalities)
 
   def clean_up_executors(self):
     """Holds no executors internally, so passes on cleanup."""
     pass
 
   def _create_composing_stack(
-      self, *, server_executor: executor_base.Executor,
-      target_executors: Sequence[executor_base.Executor]
+      self,
+      *,
+      server_executor: executor_base.Executor,
+      target_executors: Sequence[executor_base.Executor],
+      target_cardinalities: Optional[List[int]] = None
   ) -> executor_base.Executor:
     composing_strategy_factory = federated_composing_strategy.FederatedComposingStrategy.factory(
-        server_executor, target_executors)
+        server_executor,
+        target_executors,
+        max_in_flight_children=self._max_in_flight_children,
+        aggregation_deadline_seconds=self._aggregation_deadline_seconds,
+        aggregation_quorum=self._aggregation_quorum,
+        target_cardinalities=target_cardinalities)
     unplaced_executor = self._unplaced_ex_factory.create_executor()
     composing_executor = federating_executor.FederatingExecutor(
         composing_strategy_factory, unplaced_executor)
+    if target_cardinalities is not None:
+      cardinalities = {placement_literals.CLIENTS: sum(target_cardinalities)}
+    else:
+      cardinalities = None
     threaded_composing_executor = _wrap_executor_in_threading_stack(
-        composing_executor)
+        composing_executor,
+        cache_max_size_bytes=self._unplaced_ex_factory.cache_max_size_bytes,
+        cardinalities=cardinalities)
     return threaded_composing_executor
 
   def _aggregate_stacks(
       self,
       executors: Sequence[executor_base.Executor],
+      flat_cardinalities: Optional[List[int]] = None,
   ) -> executor_base.Executor:
     """Hierarchically aggregates a sequence of executors via composing strategy.
 
@@ -330,6 +602,8 @@ class ComposingExecutorFactory(executor_factory.ExecutorFactory):
     Args:
       executors: Sequence of `executor_base.Executors` to aggregate into a
         composing hierarchy.
+      flat_cardinalities: An optional `list` of the number of clients of each
+        of the `executors`.
 
     Returns:
       A single `executor_base.Executor` representing the aggregated hierarchy.
@@ -339,19 +613,30 @@ class ComposingExecutorFactory(executor_factory.ExecutorFactory):
     Raises:
       RuntimeError: If hierarchy construction fails.
     """
+    cardinalities = flat_cardinalities
     while len(executors) > 1:
       new_executors = []
+      new_cardinalities = []
       offset = 0
       while offset < len(executors):
         new_offset = offset + self._max_fanout
         server_executor = self._unplaced_ex_factory.create_executor(
             placement=placement_literals.SERVER)
         target_executors = executors[offset:new_offset]
+        if cardinalities is not None:
+          target_cardinalities = cardinalities[offset:new_offset]
+          new_cardinalities.append(sum(target_cardinalities))
+        else:
+          target_cardinalities = None
         composing_executor = self._create_composing_stack(
-            server_executor=server_executor, target_executors=target_executors)
+            server_executor=server_executor,
+            target_executors=target_executors,
+            target_cardinalities=target_cardinalities)
         new_executors.append(composing_executor)
         offset = new_offset
       executors = new_executors
+      if cardinalities is not None:
+        cardinalities = new_cardinalities
     if len(executors) != 1:
       raise RuntimeError('Expected 1 executor, got {}.'.format(len(executors)))
     return executors[0]
@@ -362,7 +647,16 @@ def local_executor_factory(
     max_fanout=100,
     clients_per_thread=1,
     server_tf_device=None,
-    client_tf_devices=tuple()
+    client_tf_devices=tuple(),
+    aggregation_partition_size=None,
+    cache_max_size_bytes=None,
+    client_worker_pool=None,
+    use_shared_function_cache=False,
+    max_cached_executors=None,
+    reuse_client_executors=False,
+    max_in_flight_children=None,
+    aggregation_deadline_seconds=None,
+    aggregation_quorum=None,
 ) -> executor_factory.ExecutorFactory:
   """Constructs an executor factory to execute computations locally.
 
@@ -389,6 +683,52 @@ def local_executor_factory(
     client_tf_devices: List/tuple of `tf.config.LogicalDevice` to place clients
       for simulation. Possibly accelerators returned by
       `tf.config.list_logical_devices()`.
+    aggregation_partition_size: An optional integer number of clients to
+      accumulate sequentially in each partition of a `tff.federated_aggregate`.
+      If specified, the partitions are accumulated in parallel and combined
+      using the `merge` function in a balanced tree, rather than accumulating
+      all clients sequentially on the server. This requires the `zero` of the
+      aggregation to be an identity of `merge`, since every partition is
+      accumulated starting from `zero`.
+    cache_max_size_bytes: An optional integer maximum total estimated size in
+      bytes of the values cached by each of the caching executors in the stack,
+      where the size of a federated value is the size of its member times the
+      number of clients. If unspecified, the caches are bounded by the number
+      of values instead.
+    client_worker_pool: An optional `tff.framework.WorkerPool` whose threads are
+      shared by the executors of all clients, rather than starting a thread
+      for each client executor. This bounds the number of threads of large
+      simulations, and exposes the depth of the queue of client work and the
+      time it waits to be started.
+    use_shared_function_cache: Whether the executors share the TensorFlow
+      functions they embed through a cache shared by the process, such that a
+      computation is imported once per device rather than once per client.
+    max_cached_executors: An optional maximum number of executor stacks to
+      hold, one for each of the most recently used cardinalities. Older stacks
+      are closed. If unspecified, a stack is held for every distinct
+      cardinalities until the factory is cleaned up.
+    reuse_client_executors: Whether the client executors are reused by the
+      stacks constructed for other cardinalities, such that changing the
+      number of clients only constructs the missing client executors.
+    max_in_flight_children: An optional integer maximum number of child
+      executors whose partial aggregates each aggregator in the hierarchy
+      computes concurrently. If specified, the partial aggregates are merged as
+      they complete, bounding the number of them held at once. This requires
+      the `merge` of `tff.federated_aggregate` to be commutative, since the
+      partial aggregates are merged in the order in which they complete. If
+      unspecified, all partial aggregates are computed concurrently and merged
+      in order.
+    aggregation_deadline_seconds: An optional number of seconds after which
+      `tff.federated_aggregate` stops waiting for the values of the clients,
+      aggregates the clients whose values are computed (at least one, or the
+      `aggregation_quorum`), and drops the rest.
+    aggregation_quorum: An optional fraction in the interval `(0, 1]` of the
+      clients whose values `tff.federated_aggregate` waits for (or, if
+      `aggregation_deadline_seconds` is also specified, the minimum fraction
+      of clients to aggregate at the deadline), dropping the rest. Like
+      `aggregation_deadline_seconds`, this only applies to
+      `tff.federated_aggregate`; all other intrinsics still wait for every
+      client.
 
   Returns:
     An instance of `executor_factory.ExecutorFactory` encapsulating the
@@ -409,21 +749,32 @@ def local_executor_factory(
   unplaced_ex_factory = UnplacedExecutorFactory(
       use_caching=True,
       server_device=server_tf_device,
-      client_devices=client_tf_devices)
+      client_devices=client_tf_devices,
+      cache_max_size_bytes=cache_max_size_bytes,
+      client_worker_pool=client_worker_pool,
+      use_shared_function_cache=use_shared_function_cache)
   federating_executor_factory = FederatingExecutorFactory(
       clients_per_thread=clients_per_thread,
       unplaced_ex_factory=unplaced_ex_factory,
       num_clients=num_clients,
-      use_sizing=False)
+      use_sizing=False,
+      aggregation_partition_size=aggregation_partition_size,
+      reuse_client_executors=reuse_client_executors,
+      aggregation_deadline_seconds=aggregation_deadline_seconds,
+      aggregation_quorum=aggregation_quorum)
   flat_stack_fn = create_minimal_length_flat_stack_fn(
       max_fanout, federating_executor_factory)
   full_stack_factory = ComposingExecutorFactory(
       max_fanout=max_fanout,
       unplaced_ex_factory=unplaced_ex_factory,
       flat_stack_fn=flat_stack_fn,
+      max_in_flight_children=max_in_flight_children,
+      flat_cardinalities_fn=create_minimal_length_flat_cardinalities_fn(
+          max_fanout),
   )
   return executor_factory.ExecutorFactoryImpl(
-      full_stack_factory.create_executor)
+      full_stack_factory.create_executor,
+      max_cached_executors=max_cached_executors)
 
 
 def thread_debugging_executor_factory(
@@ -542,7 +893,9 @@ def sizing_executor_factory(
   full_stack_factory = ComposingExecutorFactory(
       max_fanout=max_fanout,
       unplaced_ex_factory=unplaced_ex_factory,
-      flat_stack_fn=flat_stack_fn)
+      flat_stack_fn=flat_stack_fn,
+      flat_cardinalities_fn=create_minimal_length_flat_cardinalities_fn(
+          max_fanout))
 
   def _factory_fn(
       cardinalities: executor_factory.CardinalitiesType
@@ -556,9 +909,12 @@ def sizing_executor_factory(
 
 # TODO(b/159378732): Change signature of this function to accept a
 # factory.
-def worker_pool_executor_factory(executors,
-                                 max_fanout=100
-                                ) -> executor_factory.ExecutorFactory:
+def worker_pool_executor_factory(
+    executors,
+    max_fanout=100,
+    max_in_flight_children=None,
+    aggregation_deadline_seconds=None,
+    aggregation_quorum=None) -> executor_factory.ExecutorFactory:
   """Create an executor backed by a worker pool.
 
   Args:
@@ -569,6 +925,25 @@ def worker_pool_executor_factory(executors,
       `num_clients > max_fanout`, the constructed executor stack will consist of
       multiple levels of aggregators. The height of the stack will be on the
       order of `log(num_clients) / log(max_fanout)`.
+    max_in_flight_children: An optional integer maximum number of child
+      executors whose partial aggregates each aggregator in the hierarchy
+      computes concurrently. If specified, the partial aggregates are merged as
+      they complete, such that the aggregators do not hold the partial
+      aggregates of all workers at once, and slow workers do not delay merging
+      the partial aggregates of fast ones. This requires the `merge` of
+      `tff.federated_aggregate` to be commutative, since the partial
+      aggregates are merged in the order in which they complete.
+    aggregation_deadline_seconds: An optional number of seconds after which
+      `tff.federated_aggregate` stops waiting for the partial aggregates of the
+      workers, aggregates the workers which are done (at least one, or the
+      `aggregation_quorum`), and cancels the rest.
+    aggregation_quorum: An optional fraction in the interval `(0, 1]` of the
+      clients whose partial aggregates `tff.federated_aggregate` waits for (or,
+      if `aggregation_deadline_seconds` is also specified, the minimum
+      fraction of clients to aggregate at the deadline), cancelling the rest.
+      Like `aggregation_deadline_seconds`, this only applies to
+      `tff.federated_aggregate`; all other intrinsics still wait for every
+      worker.
 
   Returns:
     An instance of `executor_factory.ExecutorFactory` encapsulating the
@@ -584,6 +959,9 @@ def worker_pool_executor_factory(executors,
       max_fanout=max_fanout,
       unplaced_ex_factory=unplaced_ex_factory,
       flat_stack_fn=flat_stack_fn,
+      max_in_flight_children=max_in_flight_children,
+      aggregation_deadline_seconds=aggregation_deadline_seconds,
+      aggregation_quorum=aggregation_quorum,
   )
   return executor_factory.ExecutorFactoryImpl(
       executor_stack_fn=composing_executor_factory.create_executor)
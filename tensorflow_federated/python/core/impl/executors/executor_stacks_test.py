@@ -11,6 +11,7 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+import asyncio
 import math
 from unittest import mock
 
@@ -22,10 +23,13 @@ import tensorflow as tf
 from tensorflow_federated.python.core.api import computation_types
 from tensorflow_federated.python.core.api import computations
 from tensorflow_federated.python.core.api import intrinsics
+from tensorflow_federated.python.core.impl.executors import caching_executor
+from tensorflow_federated.python.core.impl.executors import eager_tf_executor
 from tensorflow_federated.python.core.impl.executors import executor_base
 from tensorflow_federated.python.core.impl.executors import executor_factory
 from tensorflow_federated.python.core.impl.executors import executor_stacks
 from tensorflow_federated.python.core.impl.executors import executor_test_utils
+from tensorflow_federated.python.core.impl.executors import thread_delegating_executor
 from tensorflow_federated.python.core.impl.types import placement_literals
 from tensorflow_federated.python.core.impl.types import type_factory
 
@@ -154,6 +158,19 @@ class ExecutorStacksTest(parameterized.TestCase):
 
     self.assertEqual(result, 55)
 
+  def test_execution_with_max_in_flight_children(self):
+
+    @computations.federated_computation(type_factory.at_clients(tf.int32))
+    def foo(x):
+      return intrinsics.federated_sum(x)
+
+    executor = executor_stacks.local_executor_factory(
+        max_fanout=3, max_in_flight_children=1)
+    with executor_test_utils.install_executor(executor):
+      result = foo([1, 2, 3, 4, 5, 6, 7, 8, 9, 10])
+
+    self.assertEqual(result, 55)
+
   @parameterized.named_parameters(
       ('local_executor_none_clients', executor_stacks.local_executor_factory()),
       ('sizing_executor_none_clients',
@@ -233,6 +250,38 @@ class UnplacedExecutorFactoryTest(parameterized.TestCase):
     unplaced_executor = unplaced_factory.create_executor(cardinalities={})
     self.assertIsInstance(unplaced_executor, executor_base.Executor)
 
+  def test_create_executor_with_cache_max_size_bytes(self):
+    unplaced_factory = executor_stacks.UnplacedExecutorFactory(
+        use_caching=True, cache_max_size_bytes=1 << 20)
+    unplaced_executor = unplaced_factory.create_executor()
+    self.assertIsInstance(unplaced_executor, executor_base.Executor)
+
+  def test_client_executors_share_client_worker_pool(self):
+    worker_pool = thread_delegating_executor.WorkerPool(num_threads=2)
+    executor = executor_stacks.local_executor_factory(
+        client_worker_pool=worker_pool)
+
+    @computations.tf_computation(tf.int32)
+    def add_one(x):
+      return x + 1
+
+    @computations.federated_computation(
+        computation_types.FederatedType(tf.int32, placement_literals.CLIENTS))
+    def comp(x):
+      return intrinsics.federated_map(add_one, x)
+
+    with executor_test_utils.install_executor(executor):
+      result = comp([1, 2, 3, 4, 5])
+
+    self.assertEqual(result, [2, 3, 4, 5, 6])
+    self.assertGreater(worker_pool.num_started, 0)
+    self.assertEqual(worker_pool.queue_depth, 0)
+
+  def test_raises_with_nonpositive_cache_max_size_bytes(self):
+    with self.assertRaises(ValueError):
+      executor_stacks.UnplacedExecutorFactory(
+          use_caching=True, cache_max_size_bytes=0)
+
   def test_create_executor_raises_with_nonempty_cardinalitites(self):
     unplaced_factory = executor_stacks.UnplacedExecutorFactory(use_caching=True)
     with self.assertRaises(ValueError):
@@ -296,6 +345,23 @@ class FederatingExecutorFactoryTest(absltest.TestCase):
         clients_per_thread=1, unplaced_ex_factory=unplaced_factory)
     self.assertIsInstance(federating_factory, executor_factory.ExecutorFactory)
 
+  def test_create_executor_bounds_cache_by_size_of_federated_values(self):
+    unplaced_factory = executor_stacks.UnplacedExecutorFactory(
+        use_caching=True, cache_max_size_bytes=1 << 20)
+    federating_factory = executor_stacks.FederatingExecutorFactory(
+        clients_per_thread=1, unplaced_ex_factory=unplaced_factory)
+
+    with mock.patch.object(
+        caching_executor,
+        'SizeBoundedLRUCache',
+        wraps=caching_executor.SizeBoundedLRUCache) as cache_cls:
+      federating_factory.create_executor({placement_literals.CLIENTS: 3})
+
+    # Note: The cache of the federating executor is constructed last, after the
+    # caches of the client and server executors.
+    cache_cls.assert_called_with(
+        1 << 20, cardinalities={placement_literals.CLIENTS: 3})
+
   def test_raises_on_access_of_nonexistent_sizing_executors(self):
     unplaced_factory = executor_stacks.UnplacedExecutorFactory(use_caching=True)
     federating_factory = executor_stacks.FederatingExecutorFactory(
@@ -339,6 +405,35 @@ class FederatingExecutorFactoryTest(absltest.TestCase):
     self.assertIsInstance(sizing_ex_list, list)
     self.assertLen(sizing_ex_list, 5 + 6)
 
+  def test_reuse_client_executors_constructs_only_missing_executors(self):
+    unplaced_factory = executor_stacks.UnplacedExecutorFactory(use_caching=True)
+    federating_factory = executor_stacks.FederatingExecutorFactory(
+        clients_per_thread=2,
+        unplaced_ex_factory=unplaced_factory,
+        use_sizing=True,
+        reuse_client_executors=True)
+    federating_factory.create_executor(
+        cardinalities={placement_literals.CLIENTS: 10})
+    federating_factory.create_executor(
+        cardinalities={placement_literals.CLIENTS: 4})
+    federating_factory.create_executor(
+        cardinalities={placement_literals.CLIENTS: 12})
+    self.assertLen(federating_factory.sizing_executors, 6)
+
+  def test_reuse_client_executors_with_offset(self):
+    unplaced_factory = executor_stacks.UnplacedExecutorFactory(use_caching=True)
+    federating_factory = executor_stacks.FederatingExecutorFactory(
+        clients_per_thread=1,
+        unplaced_ex_factory=unplaced_factory,
+        use_sizing=True,
+        reuse_client_executors=True)
+    federating_factory.create_executor(
+        cardinalities={placement_literals.CLIENTS: 3})
+    federating_factory.create_executor(
+        cardinalities={placement_literals.CLIENTS: 3},
+        client_executor_offset=3)
+    self.assertLen(federating_factory.sizing_executors, 6)
+
   def test_create_executor_raises_mismatched_num_clients(self):
     unplaced_factory = executor_stacks.UnplacedExecutorFactory(use_caching=True)
     federating_factory = executor_stacks.FederatingExecutorFactory(
@@ -351,6 +446,39 @@ class FederatingExecutorFactoryTest(absltest.TestCase):
           cardinalities={placement_literals.CLIENTS: 5})
 
 
+class SharedExecutorTest(absltest.TestCase):
+
+  def _create_shared_executor(self):
+    ex = eager_tf_executor.EagerTFExecutor()
+    ex.close = mock.MagicMock()
+    return executor_stacks._SharedExecutor(ex), ex
+
+  def _use_view(self, view):
+    asyncio.get_event_loop().run_until_complete(
+        view.create_value(1, tf.int32))
+
+  def test_close_view_closes_executor_once_other_views_are_closed(self):
+    shared_ex, ex = self._create_shared_executor()
+    view_1 = shared_ex.create_view()
+    view_2 = shared_ex.create_view()
+    self._use_view(view_1)
+    self._use_view(view_2)
+
+    view_1.close()
+    ex.close.assert_not_called()
+    view_2.close()
+    ex.close.assert_called_once()
+
+  def test_close_unused_view_does_not_close_executor_in_use(self):
+    shared_ex, ex = self._create_shared_executor()
+    view_1 = shared_ex.create_view()
+    view_2 = shared_ex.create_view()
+    self._use_view(view_1)
+
+    view_2.close()
+    ex.close.assert_not_called()
+
+
 class MinimalLengthFlatStackFnTest(parameterized.TestCase):
 
   def test_callable_raises_negative_clients(self):
@@ -386,6 +514,28 @@ class MinimalLengthFlatStackFnTest(parameterized.TestCase):
     self.assertLen(executor_list,
                    math.ceil(num_clients / max_clients_per_stack))
 
+  @parameterized.named_parameters(
+      ('max_3_clients_0_clients', 3, 0, [0]),
+      ('max_3_clients_3_clients', 3, 3, [3]),
+      ('max_3_clients_10_clients', 3, 10, [3, 3, 3, 1]),
+  )
+  def test_flat_cardinalities_match_flat_stacks(self, max_clients_per_stack,
+                                                num_clients,
+                                                expected_cardinalities):
+    unplaced_factory = executor_stacks.UnplacedExecutorFactory(use_caching=True)
+    federating_factory = executor_stacks.FederatingExecutorFactory(
+        clients_per_thread=1, unplaced_ex_factory=unplaced_factory)
+    flat_stack_fn = executor_stacks.create_minimal_length_flat_stack_fn(
+        max_clients_per_stack, federating_factory)
+    flat_cardinalities_fn = executor_stacks.create_minimal_length_flat_cardinalities_fn(
+        max_clients_per_stack)
+    cardinalities = {placement_literals.CLIENTS: num_clients}
+
+    flat_cardinalities = flat_cardinalities_fn(cardinalities)
+
+    self.assertEqual(flat_cardinalities, expected_cardinalities)
+    self.assertLen(flat_stack_fn(cardinalities), len(flat_cardinalities))
+
 
 class ComposingExecutorFactoryTest(absltest.TestCase):
 
@@ -476,6 +626,30 @@ class ComposingExecutorFactoryTest(absltest.TestCase):
     # 5 at the first layer, 1 at the second
     self.assertLen(args_list, 6)
 
+  @mock.patch(
+      'tensorflow_federated.python.core.impl.executors.federated_composing_strategy.FederatedComposingStrategy.factory',
+      return_value=ExecutorMock())
+  def test_passes_flat_cardinalities_to_composing_strategies(
+      self, composing_strategy_mock):
+    unplaced_factory = executor_stacks.UnplacedExecutorFactory(use_caching=True)
+    federating_factory = executor_stacks.FederatingExecutorFactory(
+        clients_per_thread=1, unplaced_ex_factory=unplaced_factory)
+    composing_ex_factory = executor_stacks.ComposingExecutorFactory(
+        max_fanout=2,
+        unplaced_ex_factory=unplaced_factory,
+        flat_stack_fn=executor_stacks.create_minimal_length_flat_stack_fn(
+            2, federating_factory),
+        flat_cardinalities_fn=executor_stacks
+        .create_minimal_length_flat_cardinalities_fn(2))
+    composing_ex_factory.create_executor({placement_literals.CLIENTS: 9})
+    target_cardinalities = [
+        kwargs['target_cardinalities']
+        for _, kwargs in composing_strategy_mock.call_args_list
+    ]
+    # Flat stacks of 2, 2, 2, 2 and 1 clients, composed two at a time.
+    self.assertEqual(target_cardinalities,
+                     [[2, 2], [2, 2], [1], [4, 4], [1], [8, 1]])
+
 
 if __name__ == '__main__':
   absltest.main()
@@ -244,6 +244,65 @@ class TracingExecutorValue(executor_value_base.ExecutorValue):
     return result
 
 
+class DelayingExecutor(executor_base.Executor):
+  """An executor that delays computing its values, to simulate stragglers."""
+
+  def __init__(self, target, delay_seconds):
+    """Creates a new instance of a delaying executor.
+
+    Args:
+      target: An instance of `executor_base.Executor`.
+      delay_seconds: The number of seconds to sleep before computing a value;
+        can be changed by assigning to `delay_seconds`.
+    """
+    py_typecheck.check_type(target, executor_base.Executor)
+    self._target = target
+    self.delay_seconds = delay_seconds
+
+  def _wrap(self, value):
+    return DelayingExecutorValue(self, value)
+
+  async def create_value(self, value, type_spec=None):
+    return self._wrap(await self._target.create_value(value, type_spec))
+
+  async def create_call(self, comp, arg=None):
+    arg = arg.value if arg is not None else None
+    return self._wrap(await self._target.create_call(comp.value, arg))
+
+  async def create_struct(self, elements):
+    return self._wrap(await self._target.create_struct(
+        structure.map_structure(lambda x: x.value, elements)))
+
+  async def create_selection(self, source, index=None, name=None):
+    return self._wrap(await self._target.create_selection(
+        source.value, index=index, name=name))
+
+  def close(self):
+    self._target.close()
+
+
+class DelayingExecutorValue(executor_value_base.ExecutorValue):
+  """A value managed by `DelayingExecutor`."""
+
+  def __init__(self, owner, value):
+    py_typecheck.check_type(owner, DelayingExecutor)
+    py_typecheck.check_type(value, executor_value_base.ExecutorValue)
+    self._owner = owner
+    self._value = value
+
+  @property
+  def value(self):
+    return self._value
+
+  @property
+  def type_signature(self):
+    return self._value.type_signature
+
+  async def compute(self):
+    await asyncio.sleep(self._owner.delay_seconds)
+    return await self._value.compute()
+
+
 def create_dummy_intrinsic_def_federated_aggregate():
   value = intrinsic_defs.FEDERATED_AGGREGATE
   type_signature = computation_types.FunctionType([
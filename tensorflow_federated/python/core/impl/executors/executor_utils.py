@@ -14,6 +14,10 @@
 """Utility functions for writing executors."""
 
 import asyncio
+import functools
+import math
+from typing import Any, Awaitable, List, Optional, Sequence, Tuple
+
 import tensorflow as tf
 
 from tensorflow_federated.proto.v0 import computation_pb2 as pb
@@ -31,6 +35,11 @@ from tensorflow_federated.python.core.impl.types import type_factory
 from tensorflow_federated.python.core.impl.types import type_serialization
 
 
+# The maximum number of stacked sum computations cached by
+# `embed_tf_stacked_sum`, one for each member type and count.
+_STACKED_SUM_CACHE_SIZE = 100
+
+
 # TODO(b/140752097): Factor out more commonalities between executorts to place
 # in this helper file. The helpers that are currently here may not be the right
 # ones. Exploit commonalities with transformations.
@@ -120,7 +129,7 @@ async def embed_tf_scalar_constant(executor, type_spec, value):
   return await executor.create_call(result)
 
 
-async def embed_tf_binary_operator(executor, type_spec, op):
+async def embed_tf_binary_operator(executor, type_spec, op, associative=False):
   """Embeds a binary operator `op` on `type_spec`-typed values in `executor`.
 
   Args:
@@ -129,6 +138,8 @@ async def embed_tf_binary_operator(executor, type_spec, op):
       operator accepts as input and returns as output.
     op: An operator function (such as `tf.add` or `tf.multiply`) to apply to the
       tensor-level constituents of the values, pointwise.
+    associative: Whether `op` is associative, in which case the embedded
+      operator is marked as such (see `is_associative`).
 
   Returns:
     An instance of `tff.framework.ExecutorValue` representing the operator in
@@ -136,9 +147,160 @@ async def embed_tf_binary_operator(executor, type_spec, op):
   """
   proto, type_signature = tensorflow_computation_factory.create_binary_operator(
       op, type_spec)
+  proto.tensorflow.associative = associative
   return await executor.create_value(proto, type_signature)
 
 
+# Note: The stacked sum computations are cached because they are constructed
+# for every `federated_sum` (with a new count whenever the number of clients
+# changes); reusing the same proto also lets executors reuse the function they
+# built for it. The returned protos must not be modified.
+@functools.lru_cache(maxsize=_STACKED_SUM_CACHE_SIZE)
+def _create_stacked_sum(type_spec, count):
+  return tensorflow_computation_factory.create_stacked_sum(type_spec, count)
+
+
+async def embed_tf_stacked_sum(executor, type_spec, count):
+  """Embeds a sum of `count` `type_spec`-typed values in `executor`.
+
+  Args:
+    executor: An instance of `tff.framework.Executor`.
+    type_spec: An instance of `tff.Type` of the type of values that are summed.
+    count: The number of values that the embedded computation accepts.
+
+  Returns:
+    An instance of `tff.framework.ExecutorValue` representing a computation
+    with the type signature `(<T, T, ...> -> T)` in a form embedded into the
+    executor.
+  """
+  proto, type_signature = _create_stacked_sum(type_spec, count)
+  return await executor.create_value(proto, type_signature)
+
+
+def is_associative(comp: pb.Computation) -> bool:
+  """Returns `True` iff `comp` is marked as an associative binary operator.
+
+  See `computation_impl.mark_associative`.
+
+  Args:
+    comp: An instance of `pb.Computation`.
+  """
+  py_typecheck.check_type(comp, pb.Computation)
+  return (comp.WhichOneof('computation') == 'tensorflow' and
+          comp.tensorflow.associative)
+
+
+def check_aggregation_deadline_and_quorum(deadline_seconds: Optional[float],
+                                          quorum: Optional[float]):
+  """Checks the arguments of `gather_before_deadline`.
+
+  Args:
+    deadline_seconds: An optional positive number of seconds.
+    quorum: An optional fraction in the interval `(0, 1]`.
+
+  Raises:
+    TypeError: If the arguments are of the wrong types.
+    ValueError: If `deadline_seconds` is not positive or if `quorum` is not in
+      the interval `(0, 1]`.
+  """
+  if deadline_seconds is not None:
+    py_typecheck.check_type(deadline_seconds, (int, float))
+    if deadline_seconds <= 0:
+      raise ValueError(
+          'Expected a positive `deadline_seconds`, found {}.'.format(
+              deadline_seconds))
+  if quorum is not None:
+    py_typecheck.check_type(quorum, (int, float))
+    if not 0 < quorum <= 1:
+      raise ValueError(
+          'Expected a `quorum` in the interval (0, 1], found {}.'.format(
+              quorum))
+
+
+async def gather_before_deadline(
+    awaitables: Sequence[Awaitable[Any]],
+    deadline_seconds: Optional[float] = None,
+    quorum: Optional[float] = None,
+    weights: Optional[Sequence[int]] = None) -> List[Tuple[int, Any]]:
+  """Awaits `awaitables` until a deadline or a quorum, cancelling the rest.
+
+  Waits until either all of `awaitables` are done, or the awaitables that are
+  done make up the `quorum` of the total weight and the deadline (if any) has
+  passed. If only `deadline_seconds` is specified, at least one of the
+  `awaitables` is awaited even if the deadline has passed. If only `quorum` is
+  specified, the awaitables that are not done are cancelled as soon as the
+  quorum is reached. If neither is specified, all of `awaitables` are awaited.
+
+  Args:
+    awaitables: A sequence of awaitables.
+    deadline_seconds: An optional number of seconds after which to stop waiting
+      for the awaitables that are not done.
+    quorum: An optional fraction in the interval `(0, 1]` of the total weight
+      of the `awaitables` that must be done before the others are cancelled.
+    weights: An optional sequence of non-negative integer weights, one for each
+      of the `awaitables`, for example, the number of clients each one
+      aggregates. Defaults to a weight of one for each of the `awaitables`.
+
+  Returns:
+    A list of `(index, result)` tuples, one for each of the `awaitables` that
+    is done, in the order of `awaitables`.
+
+  Raises:
+    ValueError: If the arguments are invalid.
+    Exception: If any of the `awaitables` that are done raised an exception.
+  """
+  check_aggregation_deadline_and_quorum(deadline_seconds, quorum)
+  if weights is None:
+    weights = [1] * len(awaitables)
+  elif len(weights) != len(awaitables):
+    raise ValueError(
+        'Expected one weight for each of the {} awaitables, found {}.'.format(
+            len(awaitables), len(weights)))
+  if quorum is not None:
+    required_weight = math.ceil(quorum * sum(weights))
+  elif deadline_seconds is not None:
+    required_weight = min((w for w in weights if w > 0), default=0)
+  else:
+    required_weight = sum(weights)
+
+  loop = asyncio.get_running_loop()
+  if deadline_seconds is not None:
+    deadline = loop.time() + deadline_seconds
+  else:
+    deadline = None
+  tasks = [asyncio.ensure_future(a) for a in awaitables]
+  pending = set(tasks)
+  done_weight = 0
+  try:
+    while pending:
+      deadline_passed = deadline is not None and loop.time() >= deadline
+      if deadline_passed and done_weight < required_weight:
+        # Note: After the deadline, wait for the awaitables needed to reach
+        # the quorum.
+        timeout = None
+      elif deadline is not None:
+        timeout = max(deadline - loop.time(), 0)
+      else:
+        timeout = None
+      done, pending = await asyncio.wait(
+          pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+      for task in done:
+        # Raise the exceptions of the awaitables as soon as they are done.
+        task.result()
+      done_weight += sum(
+          w for task, w in zip(tasks, weights) if task in done)
+      deadline_passed = deadline is not None and loop.time() >= deadline
+      if done_weight >= required_weight and (deadline is None or
+                                             deadline_passed):
+        break
+  finally:
+    for task in pending:
+      task.cancel()
+  return [(idx, task.result())
+          for idx, task in enumerate(tasks)
+          if task not in pending]
+
+
 def create_intrinsic_comp(intrinsic_def, type_spec):
   """Creates an intrinsic `pb.Computation`.
 
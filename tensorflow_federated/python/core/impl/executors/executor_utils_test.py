@@ -12,9 +12,15 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import asyncio
+from unittest import mock
+
 from absl.testing import absltest
 from absl.testing import parameterized
+import tensorflow as tf
 
+from tensorflow_federated.python.core.api import computation_types
+from tensorflow_federated.python.core.impl.compiler import tensorflow_computation_factory
 from tensorflow_federated.python.core.impl.executors import eager_tf_executor
 from tensorflow_federated.python.core.impl.executors import executor_test_utils
 from tensorflow_federated.python.core.impl.executors import executor_utils
@@ -277,5 +283,107 @@ class ComputeIntrinsicFederatedWeightedMeanTest(
               executor, arg))
 
 
+class GatherBeforeDeadlineTest(executor_test_utils.AsyncTestCase,
+                               parameterized.TestCase):
+
+  def _create_awaitables(self, delays):
+    return [asyncio.sleep(d, result=idx) for idx, d in enumerate(delays)]
+
+  def test_returns_all_results_without_deadline_or_quorum(self):
+    result = self.run_sync(
+        executor_utils.gather_before_deadline(
+            self._create_awaitables([0.1, 0.0, 0.2])))
+    self.assertEqual(result, [(0, 0), (1, 1), (2, 2)])
+
+  def test_drops_awaitables_not_done_by_deadline(self):
+    result = self.run_sync(
+        executor_utils.gather_before_deadline(
+            self._create_awaitables([0.0, 60.0, 0.0]), deadline_seconds=0.5))
+    self.assertEqual(result, [(0, 0), (2, 2)])
+
+  def test_waits_for_one_awaitable_after_deadline(self):
+    result = self.run_sync(
+        executor_utils.gather_before_deadline(
+            self._create_awaitables([60.0, 0.5]), deadline_seconds=0.01))
+    self.assertEqual(result, [(1, 1)])
+
+  def test_waits_for_quorum_after_deadline(self):
+    result = self.run_sync(
+        executor_utils.gather_before_deadline(
+            self._create_awaitables([0.0, 0.5, 60.0]),
+            deadline_seconds=0.01,
+            quorum=0.5))
+    self.assertEqual(result, [(0, 0), (1, 1)])
+
+  def test_drops_awaitables_after_weighted_quorum(self):
+    result = self.run_sync(
+        executor_utils.gather_before_deadline(
+            self._create_awaitables([0.0, 60.0, 60.0]),
+            quorum=0.5,
+            weights=[3, 1, 2]))
+    self.assertEqual(result, [(0, 0)])
+
+  def test_raises_exception_of_awaitable(self):
+
+    async def _raise():
+      raise ValueError('Failed.')
+
+    with self.assertRaisesRegex(ValueError, 'Failed.'):
+      self.run_sync(
+          executor_utils.gather_before_deadline([_raise()],
+                                                deadline_seconds=1.0))
+
+  # pyformat: disable
+  @parameterized.named_parameters(
+      ('zero_deadline', dict(deadline_seconds=0.0)),
+      ('zero_quorum', dict(quorum=0.0)),
+      ('quorum_larger_than_one', dict(quorum=1.5)),
+      ('mismatched_weights', dict(weights=[1, 2, 3])),
+  )
+  # pyformat: enable
+  def test_raises_value_error(self, kwargs):
+    awaitables = self._create_awaitables([0.0])
+    with self.assertRaises(ValueError):
+      self.run_sync(executor_utils.gather_before_deadline(awaitables, **kwargs))
+    for awaitable in awaitables:
+      awaitable.close()
+
+
+class EmbedTfStackedSumTest(executor_test_utils.AsyncTestCase):
+
+  def test_reuses_computation_for_same_type_and_count(self):
+    executor = eager_tf_executor.EagerTFExecutor()
+    type_spec = computation_types.TensorType(tf.float32)
+
+    with mock.patch.object(
+        executor, 'create_value', wraps=executor.create_value) as create_value:
+      for count in [3, 3, 4]:
+        self.run_sync(
+            executor_utils.embed_tf_stacked_sum(executor, type_spec, count))
+
+    protos = [call[0][0] for call in create_value.call_args_list]
+    self.assertLen(protos, 3)
+    self.assertIs(protos[0], protos[1])
+    self.assertIsNot(protos[0], protos[2])
+
+
+class IsAssociativeTest(absltest.TestCase):
+
+  def test_returns_false_with_unmarked_operator(self):
+    op, _ = tensorflow_computation_factory.create_binary_operator(
+        tf.maximum, computation_types.TensorType(tf.int64))
+    self.assertFalse(executor_utils.is_associative(op))
+
+  def test_returns_true_with_marked_operator(self):
+    op, _ = tensorflow_computation_factory.create_binary_operator(
+        tf.maximum, computation_types.TensorType(tf.int64))
+    op.tensorflow.associative = True
+    self.assertTrue(executor_utils.is_associative(op))
+
+  def test_raises_type_error_with_python_function(self):
+    with self.assertRaises(TypeError):
+      executor_utils.is_associative(lambda x, y: x + y)
+
+
 if __name__ == '__main__':
   absltest.main()
@@ -44,8 +44,9 @@
 """
 
 import asyncio
-from typing import Any, List
+from typing import Any, Callable, List, Optional, Sequence
 
+from absl import logging
 import tensorflow as tf
 
 from tensorflow_federated.proto.v0 import computation_pb2 as pb
@@ -144,13 +145,30 @@ class FederatedComposingStrategy(federating_executor.FederatingStrategy):
   """
 
   @classmethod
-  def factory(cls, server_executor: executor_base.Executor,
-              target_executors: List[executor_base.Executor]):
-    return lambda executor: cls(executor, server_executor, target_executors)
-
-  def __init__(self, executor: federating_executor.FederatingExecutor,
+  def factory(cls,
+              server_executor: executor_base.Executor,
+              target_executors: List[executor_base.Executor],
+              max_in_flight_children: Optional[int] = None,
+              aggregation_deadline_seconds: Optional[float] = None,
+              aggregation_quorum: Optional[float] = None,
+              target_cardinalities: Optional[List[int]] = None):
+    return lambda executor: cls(
+        executor,
+        server_executor,
+        target_executors,
+        max_in_flight_children=max_in_flight_children,
+        aggregation_deadline_seconds=aggregation_deadline_seconds,
+        aggregation_quorum=aggregation_quorum,
+        target_cardinalities=target_cardinalities)
+
+  def __init__(self,
+               executor: federating_executor.FederatingExecutor,
                server_executor: executor_base.Executor,
-               target_executors: List[executor_base.Executor]):
+               target_executors: List[executor_base.Executor],
+               max_in_flight_children: Optional[int] = None,
+               aggregation_deadline_seconds: Optional[float] = None,
+               aggregation_quorum: Optional[float] = None,
+               target_cardinalities: Optional[List[int]] = None):
     """Creates a `FederatedComposingStrategy`.
 
     Args:
@@ -161,20 +179,89 @@ class FederatedComposingStrategy(federating_executor.FederatingStrategy):
         server-side processing, etc.
       target_executors: The list of executors that manage disjoint scopes to
         combine in this executor, delegate to and collect or aggregate from.
+      max_in_flight_children: An optional positive integer. If `None` (the
+        default), `federated_aggregate` computes the partial aggregates of all
+        `target_executors` concurrently and merges them in order once all of
+        them are available. Otherwise, at most `max_in_flight_children` partial
+        aggregates are computed concurrently, and each of them is merged as
+        soon as it is available, in the order in which they complete. This
+        bounds the number of partial aggregates held by the parent, and does
+        not delay merging the partial aggregates of fast children behind slow
+        ones. Since the partial aggregates are merged in the order in which
+        they complete rather than in the order of `target_executors`, this
+        requires `merge` to be commutative; otherwise the result depends on
+        which children finish first.
+      aggregation_deadline_seconds: An optional positive number of seconds. If
+        specified, `federated_aggregate` only merges the partial aggregates of
+        the `target_executors` which are done within this many seconds (but
+        at least one of them, or the `aggregation_quorum`), and cancels the
+        rest.
+      aggregation_quorum: An optional fraction in the interval `(0, 1]`. If
+        specified, `federated_aggregate` only waits for the partial aggregates
+        of `target_executors` holding this fraction of the clients (or, if
+        `aggregation_deadline_seconds` is also specified, for any partial
+        aggregates done before the deadline), and cancels the rest. Like
+        `aggregation_deadline_seconds`, this only applies to
+        `federated_aggregate`; all other intrinsics, including `federated_map`
+        and `federated_reduce`, still wait for every child.
+      target_cardinalities: An optional `list` of the number of clients in each
+        of the `target_executors`, if known when the executor is constructed.
+        If `None` (the default), the number of clients is discovered by
+        computing a `federated_sum` in each of the `target_executors` the first
+        time it is needed.
 
     Raises:
       TypeError: If `server_executor` is not an `executor_base.Executor` or if
         `target_executors` is not a `list` of `executor_base.Executor`s.
+      ValueError: If `max_in_flight_children` or
+        `aggregation_deadline_seconds` is not positive, if `aggregation_quorum`
+        is not in the interval `(0, 1]`, or if `max_in_flight_children` is
+        specified together with `aggregation_deadline_seconds` or
+        `aggregation_quorum`, or if `target_cardinalities` does not contain a
+        non-negative integer for each of the `target_executors`.
     """
     super().__init__(executor)
     py_typecheck.check_type(server_executor, executor_base.Executor)
     py_typecheck.check_type(target_executors, list)
     for e in target_executors:
       py_typecheck.check_type(e, executor_base.Executor)
+    if max_in_flight_children is not None:
+      py_typecheck.check_type(max_in_flight_children, int)
+      if max_in_flight_children < 1:
+        raise ValueError(
+            'Expected a positive `max_in_flight_children`, found {}.'.format(
+                max_in_flight_children))
+    executor_utils.check_aggregation_deadline_and_quorum(
+        aggregation_deadline_seconds, aggregation_quorum)
+    if max_in_flight_children is not None and (
+        aggregation_deadline_seconds is not None or
+        aggregation_quorum is not None):
+      raise ValueError(
+          'Expected at most one of `max_in_flight_children` and '
+          '`aggregation_deadline_seconds` or `aggregation_quorum`.')
     self._server_executor = server_executor
     self._target_executors = target_executors
+    self._max_in_flight_children = max_in_flight_children
+    self._aggregation_deadline_seconds = aggregation_deadline_seconds
+    self._aggregation_quorum = aggregation_quorum
+    if target_cardinalities is not None:
+      py_typecheck.check_type(target_cardinalities, list)
+      py_typecheck.check_len(target_cardinalities, len(target_executors))
+      for num_clients in target_cardinalities:
+        py_typecheck.check_type(num_clients, int)
+        if num_clients < 0:
+          raise ValueError(
+              'Expected non-negative `target_cardinalities`, found {}.'.format(
+                  target_cardinalities))
+    self._target_cardinalities = target_cardinalities
+    self._num_dropped_clients = 0
     self._cardinalities_task = None
 
+  @property
+  def num_dropped_clients(self) -> int:
+    """The number of clients dropped from `federated_aggregate`s."""
+    return self._num_dropped_clients
+
   def close(self):
     self._server_executor.close()
     for e in self._target_executors:
@@ -193,6 +280,8 @@ class FederatedComposingStrategy(federating_executor.FederatingStrategy):
       each of these elements is an integer representing the total number of
       clients located in the corresponding child executor.
     """
+    if self._target_cardinalities is not None:
+      return self._target_cardinalities
 
     # This helper function and the logic to cache the `_cardinalities_task` is
     # is required because `functools.lru_cache` is not compatible with async
@@ -224,6 +313,67 @@ class FederatedComposingStrategy(federating_executor.FederatingStrategy):
           _get_cardinalities_helper())
     return await self._cardinalities_task
 
+  async def _gather_dropping_stragglers(self, coros: List[Any]) -> List[Any]:
+    """Returns the results of `coros` done by the deadline or quorum.
+
+    Args:
+      coros: A `list` of coroutines, one for each of `self._target_executors`.
+
+    Returns:
+      A `list` of the results of the `coros` which are done, in order.
+    """
+    cardinalities = await self._get_cardinalities()
+    completed = await executor_utils.gather_before_deadline(
+        coros,
+        deadline_seconds=self._aggregation_deadline_seconds,
+        quorum=self._aggregation_quorum,
+        weights=cardinalities)
+    num_dropped = sum(cardinalities) - sum(
+        cardinalities[idx] for idx, _ in completed)
+    if num_dropped:
+      self._num_dropped_clients += num_dropped
+      logging.warning('Dropped %d of %d clients from `federated_aggregate`.',
+                      num_dropped, sum(cardinalities))
+    return [result for _, result in completed]
+
+  async def _as_completed(self, fn: Callable[..., Any],
+                          args: Sequence[Sequence[Any]]):
+    """Yields the results of `fn(*a)` for each `a` in `args` as they complete.
+
+    At most `self._max_in_flight_children` calls to `fn` are in flight at any
+    time; another call is started as soon as the result of a call is yielded.
+
+    Args:
+      fn: An async function.
+      args: A sequence of the positional arguments of each call to `fn`.
+
+    Yields:
+      The result of each call to `fn`, in the order in which the calls
+      complete.
+
+    Note: Callers must `aclose()` the returned generator, such that the calls
+    still in flight are cancelled and awaited if the caller stops early (for
+    example, because merging a result raised an exception).
+    """
+    args = iter(args)
+    pending = set()
+    try:
+      while True:
+        for a in args:
+          pending.add(asyncio.ensure_future(fn(*a)))
+          if len(pending) >= self._max_in_flight_children:
+            break
+        if not pending:
+          return
+        done, pending = await asyncio.wait(
+            pending, return_when=asyncio.FIRST_COMPLETED)
+        for task in done:
+          yield task.result()
+    finally:
+      for task in pending:
+        task.cancel()
+      await asyncio.gather(*pending, return_exceptions=True)
+
   async def compute_federated_value(
       self, value: Any, type_signature: computation_types.Type
   ) -> FederatedComposingStrategyValue:
@@ -297,21 +447,71 @@ class FederatedComposingStrategy(federating_executor.FederatingStrategy):
               ex.create_value(identity_report, identity_report_type)))))
       return await (await ex.create_call(aggr_func, aggr_args)).compute()
 
-    vals = await asyncio.gather(
-        *[_child_fn(c, v) for c, v in zip(self._target_executors, val)])
-    parent_vals = await asyncio.gather(
-        *[self._server_executor.create_value(v, zero_type) for v in vals])
     parent_merge, parent_report = await asyncio.gather(
         self._server_executor.create_value(merge, merge_type),
         self._server_executor.create_value(report, report_type))
+    merge_result = await self._merge_children(
+        _child_fn, val, parent_merge, zero_type, drop_stragglers=True)
+    return FederatedComposingStrategyValue(
+        await self._server_executor.create_call(parent_report, merge_result),
+        type_factory.at_server(report_type.result))
+
+  async def _merge_children(self, child_fn: Callable[..., Any],
+                            val: List[executor_value_base.ExecutorValue],
+                            merge: executor_value_base.ExecutorValue,
+                            result_type: computation_types.Type,
+                            drop_stragglers: bool):
+    """Merges the partial results of `child_fn` in each of the children.
+
+    Note: If `max_in_flight_children` is specified, the partial results of the
+    children are merged in the order in which they complete, so the result is
+    only equal to merging them in the order of the children if `merge` is
+    commutative.
+
+    Args:
+      child_fn: An async function computing the partial result of a child from
+        the child executor and its value in `val`.
+      val: A `list` of the values in each of `self._target_executors`.
+      merge: The binary operator merging two partial results, embedded in
+        `self._server_executor`.
+      result_type: The type of the partial results.
+      drop_stragglers: Whether to drop the children which are not done by the
+        `aggregation_deadline_seconds` or `aggregation_quorum` (if any).
+
+    Returns:
+      An `executor_value_base.ExecutorValue` in `self._server_executor`.
+    """
+    if self._max_in_flight_children is not None:
+      merge_result = None
+      child_results = self._as_completed(
+          child_fn, list(zip(self._target_executors, val)))
+      try:
+        async for next_val in child_results:
+          next_val = await self._server_executor.create_value(
+              next_val, result_type)
+          if merge_result is None:
+            merge_result = next_val
+          else:
+            merge_result = await self._server_executor.create_call(
+                merge, await
+                self._server_executor.create_struct([merge_result, next_val]))
+      finally:
+        await child_results.aclose()
+      return merge_result
+    child_coros = [child_fn(c, v) for c, v in zip(self._target_executors, val)]
+    if drop_stragglers and (self._aggregation_deadline_seconds is not None or
+                            self._aggregation_quorum is not None):
+      vals = await self._gather_dropping_stragglers(child_coros)
+    else:
+      vals = await asyncio.gather(*child_coros)
+    parent_vals = await asyncio.gather(
+        *[self._server_executor.create_value(v, result_type) for v in vals])
     merge_result = parent_vals[0]
     for next_val in parent_vals[1:]:
       merge_result = await self._server_executor.create_call(
-          parent_merge, await
+          merge, await
           self._server_executor.create_struct([merge_result, next_val]))
-    return FederatedComposingStrategyValue(
-        await self._server_executor.create_call(parent_report, merge_result),
-        type_factory.at_server(report_type.result))
+    return merge_result
 
   @tracing.trace
   async def compute_federated_apply(
@@ -487,18 +687,29 @@ class FederatedComposingStrategy(federating_executor.FederatingStrategy):
       arg: FederatedComposingStrategyValue) -> FederatedComposingStrategyValue:
     type_analysis.check_federated_type(
         arg.type_signature, placement=placement_literals.CLIENTS)
-    id_comp, id_type = tensorflow_computation_factory.create_identity(
-        arg.type_signature.member)
-    zero, plus, identity = await asyncio.gather(
-        executor_utils.embed_tf_scalar_constant(self._executor,
-                                                arg.type_signature.member, 0),
-        executor_utils.embed_tf_binary_operator(self._executor,
-                                                arg.type_signature.member,
-                                                tf.add),
-        self._executor.create_value(id_comp, id_type))
-    aggregate_args = await self._executor.create_struct(
-        [arg, zero, plus, plus, identity])
-    return await self.compute_federated_aggregate(aggregate_args)
+    val = arg.internal_representation
+    py_typecheck.check_type(val, list)
+    py_typecheck.check_len(val, len(self._target_executors))
+    member_type = arg.type_signature.member
+    sum_type = computation_types.FunctionType(
+        arg.type_signature, type_factory.at_server(member_type))
+    sum_comp = executor_utils.create_intrinsic_comp(
+        intrinsic_defs.FEDERATED_SUM, sum_type)
+
+    # Note: The children compute a `federated_sum` rather than a
+    # `federated_aggregate`, such that no child drops stragglers, since the
+    # results of `federated_mean` and `federated_weighted_mean` would be biased.
+    async def _child_fn(ex, v):
+      py_typecheck.check_type(v, executor_value_base.ExecutorValue)
+      sum_func = await ex.create_value(sum_comp, sum_type)
+      return await (await ex.create_call(sum_func, v)).compute()
+
+    plus = await executor_utils.embed_tf_binary_operator(
+        self._server_executor, member_type, tf.add)
+    result = await self._merge_children(
+        _child_fn, val, plus, member_type, drop_stragglers=False)
+    return FederatedComposingStrategyValue(result,
+                                           type_factory.at_server(member_type))
 
   @tracing.trace
   async def compute_federated_secure_sum(
@@ -27,6 +27,7 @@ from tensorflow_federated.python.core.impl import intrinsic_factory
 from tensorflow_federated.python.core.impl.compiler import intrinsic_defs
 from tensorflow_federated.python.core.impl.context_stack import context_stack_impl
 from tensorflow_federated.python.core.impl.executors import eager_tf_executor
+from tensorflow_federated.python.core.impl.executors import executor_test_utils
 from tensorflow_federated.python.core.impl.executors import federated_composing_strategy
 from tensorflow_federated.python.core.impl.executors import federated_resolving_strategy
 from tensorflow_federated.python.core.impl.executors import federating_executor
@@ -49,19 +50,23 @@ def _create_worker_stack():
   return federating_executor.FederatingExecutor(factory, _create_bottom_stack())
 
 
-def _create_middle_stack(children):
+def _create_middle_stack(children, **kwargs):
   factory = federated_composing_strategy.FederatedComposingStrategy.factory(
-      _create_bottom_stack(), children)
+      _create_bottom_stack(), children, **kwargs)
   executor = federating_executor.FederatingExecutor(factory,
                                                     _create_bottom_stack())
   return reference_resolving_executor.ReferenceResolvingExecutor(executor)
 
 
-def _create_test_executor():
-  executor = _create_middle_stack([
-      _create_middle_stack([_create_worker_stack() for _ in range(3)]),
-      _create_middle_stack([_create_worker_stack() for _ in range(3)]),
-  ])
+def _create_test_executor(max_in_flight_children=None):
+  executor = _create_middle_stack(
+      [
+          _create_middle_stack([_create_worker_stack() for _ in range(3)],
+                               max_in_flight_children=max_in_flight_children),
+          _create_middle_stack([_create_worker_stack() for _ in range(3)],
+                               max_in_flight_children=max_in_flight_children),
+      ],
+      max_in_flight_children=max_in_flight_children)
   # 2 clients per worker stack * 3 worker stacks * 2 middle stacks
   num_clients = 12
   return executor, num_clients
@@ -164,6 +169,217 @@ class FederatedComposingStrategyTest(absltest.TestCase):
     result = _invoke(executor, comp)
     self.assertEqual(result, 10 * num_clients + 5)
 
+  def test_federated_aggregate_with_max_in_flight_children(self):
+
+    @computations.tf_computation(tf.int32, tf.int32)
+    def add_int(x, y):
+      return x + y
+
+    @computations.tf_computation(tf.int32)
+    def add_five(x):
+      return x + 5
+
+    @computations.federated_computation(type_factory.at_clients(tf.int32))
+    def comp(value):
+      return intrinsics.federated_aggregate(value, 0, add_int, add_int,
+                                            add_five)
+
+    for max_in_flight_children in [1, 2, 3]:
+      executor, num_clients = _create_test_executor(
+          max_in_flight_children=max_in_flight_children)
+      result = _invoke(executor, comp, list(range(num_clients)))
+      self.assertEqual(result, sum(range(num_clients)) + 5)
+
+  def test_federated_aggregate_merges_in_completion_order(self):
+
+    @computations.tf_computation(tf.int32, tf.int32)
+    def add_int(x, y):
+      return x + y
+
+    @computations.tf_computation(tf.int32, tf.int32)
+    def subtract_int(x, y):
+      return x - y
+
+    @computations.tf_computation(tf.int32)
+    def identity(x):
+      return x
+
+    @computations.federated_computation(type_factory.at_clients(tf.int32))
+    def comp(value):
+      return intrinsics.federated_aggregate(value, 0, add_int, subtract_int,
+                                            identity)
+
+    straggler = executor_test_utils.DelayingExecutor(
+        _create_worker_stack(), delay_seconds=0.5)
+    executor = _create_middle_stack([straggler, _create_worker_stack()],
+                                    max_in_flight_children=2)
+
+    result = _invoke(executor, comp, [1, 2, 3, 4])
+
+    # Note: `merge` is not commutative, and the partial aggregate of the first
+    # child (1 + 2) completes after that of the second child (3 + 4), so the
+    # result is (3 + 4) - (1 + 2) rather than (1 + 2) - (3 + 4).
+    self.assertEqual(result, 4)
+
+  def test_as_completed_cancels_calls_in_flight_when_closed(self):
+    strategies = []
+
+    def factory(executor):
+      strategy = federated_composing_strategy.FederatedComposingStrategy(
+          executor,
+          _create_bottom_stack(),
+          [_create_worker_stack() for _ in range(3)],
+          max_in_flight_children=2)
+      strategies.append(strategy)
+      return strategy
+
+    federating_executor.FederatingExecutor(factory, _create_bottom_stack())
+    started = []
+    cancelled = []
+
+    async def _fn(delay):
+      started.append(delay)
+      try:
+        await asyncio.sleep(delay)
+      except asyncio.CancelledError:
+        cancelled.append(delay)
+        raise
+      return delay
+
+    async def _get_first_result():
+      results = strategies[0]._as_completed(  # pylint: disable=protected-access
+          _fn, [(0.0,), (60.0,), (60.0,)])
+      try:
+        async for result in results:
+          return result
+      finally:
+        await results.aclose()
+
+    result = asyncio.get_event_loop().run_until_complete(_get_first_result())
+
+    self.assertEqual(result, 0.0)
+    self.assertEqual(started, [0.0, 60.0])
+    self.assertEqual(cancelled, [60.0])
+
+  def test_raises_value_error_with_non_positive_max_in_flight_children(self):
+    with self.assertRaises(ValueError):
+      _create_middle_stack([_create_worker_stack()], max_in_flight_children=0)
+
+  def test_federated_aggregate_drops_straggler(self):
+
+    @computations.tf_computation(tf.int32, tf.int32)
+    def add_int(x, y):
+      return x + y
+
+    @computations.tf_computation(tf.int32)
+    def add_five(x):
+      return x + 5
+
+    @computations.federated_computation(type_factory.at_clients(tf.int32))
+    def comp(value):
+      return intrinsics.federated_aggregate(value, 0, add_int, add_int,
+                                            add_five)
+
+    straggler = executor_test_utils.DelayingExecutor(
+        _create_worker_stack(), delay_seconds=0.0)
+    strategies = []
+
+    def factory(executor):
+      strategy = federated_composing_strategy.FederatedComposingStrategy(
+          executor,
+          _create_bottom_stack(),
+          [_create_worker_stack(), _create_worker_stack(), straggler],
+          aggregation_deadline_seconds=1.0)
+      strategies.append(strategy)
+      return strategy
+
+    executor = reference_resolving_executor.ReferenceResolvingExecutor(
+        federating_executor.FederatingExecutor(factory, _create_bottom_stack()))
+    arg = [1, 2, 3, 4, 5, 6]
+    # Note: The first invocation computes the cardinalities of the children.
+    self.assertEqual(_invoke(executor, comp, arg), 21 + 5)
+    self.assertEqual(strategies[0].num_dropped_clients, 0)
+
+    straggler.delay_seconds = 60.0
+    result = _invoke(executor, comp, arg)
+
+    self.assertEqual(result, 10 + 5)
+    self.assertEqual(strategies[0].num_dropped_clients, 2)
+
+  def test_federated_sum_does_not_drop_stragglers_in_children(self):
+
+    @computations.tf_computation(tf.int32, tf.int32)
+    def add_int(x, y):
+      return x + y
+
+    @computations.tf_computation(tf.int32)
+    def identity(x):
+      return x
+
+    @computations.federated_computation(type_factory.at_clients(tf.int32))
+    def sum_comp(value):
+      return intrinsics.federated_sum(value)
+
+    @computations.federated_computation(type_factory.at_clients(tf.int32))
+    def aggregate_comp(value):
+      return intrinsics.federated_aggregate(value, 0, add_int, add_int,
+                                            identity)
+
+    def _create_straggling_worker_stack():
+      factory = federated_resolving_strategy.FederatedResolvingStrategy.factory(
+          {
+              placement_literals.SERVER:
+                  _create_bottom_stack(),
+              placement_literals.CLIENTS: [
+                  _create_bottom_stack(),
+                  executor_test_utils.DelayingExecutor(
+                      _create_bottom_stack(), delay_seconds=0.5),
+              ],
+          },
+          aggregation_quorum=0.5)
+      return federating_executor.FederatingExecutor(factory,
+                                                    _create_bottom_stack())
+
+    executor = _create_middle_stack(
+        [_create_straggling_worker_stack(),
+         _create_straggling_worker_stack()])
+    arg = [1, 2, 3, 4]
+
+    # Note: The children drop their second, slow client from a
+    # `federated_aggregate`, but not from a `federated_sum`.
+    self.assertEqual(_invoke(executor, aggregate_comp, arg), 1 + 3)
+    self.assertEqual(_invoke(executor, sum_comp, arg), 1 + 2 + 3 + 4)
+
+  def test_raises_value_error_with_max_in_flight_children_and_deadline(self):
+    with self.assertRaises(ValueError):
+      _create_middle_stack([_create_worker_stack()],
+                           max_in_flight_children=1,
+                           aggregation_deadline_seconds=1.0)
+
+  def test_federated_value_at_clients_with_target_cardinalities(self):
+    children = [
+        executor_test_utils.TracingExecutor(_create_worker_stack())
+        for _ in range(3)
+    ]
+    executor = _create_middle_stack(children, target_cardinalities=[2, 2, 2])
+    loop = asyncio.get_event_loop()
+
+    value = loop.run_until_complete(
+        executor.create_value([1, 2, 3, 4, 5, 6],
+                              type_factory.at_clients(tf.int32)))
+    result = loop.run_until_complete(value.compute())
+
+    self.assertEqual(result, [1, 2, 3, 4, 5, 6])
+    for child in children:
+      # Note: Without `target_cardinalities`, the number of clients of each
+      # child would be discovered by calling a `federated_sum` in it.
+      self.assertNotIn('create_call', [entry[0] for entry in child.trace])
+
+  def test_raises_value_error_with_mismatched_target_cardinalities(self):
+    with self.assertRaises(ValueError):
+      _create_middle_stack([_create_worker_stack()],
+                           target_cardinalities=[2, 2])
+
   def test_federated_aggregate_of_nested_tuple(self):
     test_type = computation_types.StructType([
         ('a', (tf.int32, tf.float32)),
@@ -354,6 +570,17 @@ class FederatedComposingStrategyTest(absltest.TestCase):
     result = _invoke(executor, comp, arg)
     self.assertEqual(result, 6.5)
 
+  def test_federated_mean_with_max_in_flight_children(self):
+
+    @computations.federated_computation(type_factory.at_clients(tf.float32))
+    def comp(x):
+      return intrinsics.federated_mean(x)
+
+    executor, num_clients = _create_test_executor(max_in_flight_children=1)
+    arg = [float(x + 1) for x in range(num_clients)]
+    result = _invoke(executor, comp, arg)
+    self.assertEqual(result, 6.5)
+
   def test_federated_weighted_mean(self):
 
     @computations.federated_computation(
@@ -42,7 +42,7 @@
 """
 
 import asyncio
-from typing import Any, Dict
+from typing import Any, Dict, List, Optional
 
 import absl.logging as logging
 import tensorflow as tf
@@ -61,6 +61,14 @@ from tensorflow_federated.python.core.impl.types import type_analysis
 from tensorflow_federated.python.core.impl.types import type_factory
 
 
+def _is_stackable_type(type_spec: computation_types.Type) -> bool:
+  """Returns `True` if values of `type_spec` can be stacked and summed."""
+  return type_analysis.contains_only(
+      type_spec, lambda t: t.is_struct() or
+      (t.is_tensor() and t.shape.is_fully_defined() and
+       type_analysis.is_numeric_dtype(t.dtype)))
+
+
 class FederatedResolvingStrategyValue(executor_value_base.ExecutorValue):
   """A value embedded in a `FederatedExecutor`."""
 
@@ -134,15 +142,34 @@ class FederatedResolvingStrategy(federating_executor.FederatingStrategy):
   * `tff.CLIENTS`
 
   Note that this strategy does not have a built-in concept of intermediate
-  aggregation, partitioning placements, clustering clients, etc.
+  aggregation, partitioning placements, clustering clients, etc. The one
+  exception is `federated_aggregate`, which can optionally be computed by
+  accumulating contiguous partitions of clients in parallel on the client
+  executors and combining the partial accumulators with `merge` in a balanced
+  tree (see `aggregation_partition_size`), and which can optionally aggregate
+  only the clients whose values are computed before a deadline or quorum (see
+  `aggregation_deadline_seconds` and `aggregation_quorum`).
   """
 
   @classmethod
-  def factory(cls, target_executors: Dict[str, executor_base.Executor]):
-    return lambda executor: cls(executor, target_executors)
-
-  def __init__(self, executor: federating_executor.FederatingExecutor,
-               target_executors: Dict[str, executor_base.Executor]):
+  def factory(cls,
+              target_executors: Dict[str, executor_base.Executor],
+              aggregation_partition_size: Optional[int] = None,
+              aggregation_deadline_seconds: Optional[float] = None,
+              aggregation_quorum: Optional[float] = None):
+    return lambda executor: cls(
+        executor,
+        target_executors,
+        aggregation_partition_size=aggregation_partition_size,
+        aggregation_deadline_seconds=aggregation_deadline_seconds,
+        aggregation_quorum=aggregation_quorum)
+
+  def __init__(self,
+               executor: federating_executor.FederatingExecutor,
+               target_executors: Dict[str, executor_base.Executor],
+               aggregation_partition_size: Optional[int] = None,
+               aggregation_deadline_seconds: Optional[float] = None,
+               aggregation_quorum: Optional[float] = None):
     """Creates a `FederatedResolvingStrategy`.
 
     Args:
@@ -153,6 +180,33 @@ class FederatedResolvingStrategy(federating_executor.FederatingStrategy):
         dictionary are placement literals. The values can be either single
         executors (if there only is a single participant associated with that
         placement, e.g. `tff.SERVER`) or lists of executors.
+      aggregation_partition_size: An optional positive integer. If `None` (the
+        default), `federated_aggregate` is computed by folding every client
+        value into the accumulator sequentially on the server. Otherwise, the
+        clients are split into contiguous partitions of at most this many
+        clients, each partition is accumulated on the executor of its first
+        client, and the partial accumulators are combined pairwise with
+        `merge`, such that the length of the critical path is on the order of
+        `aggregation_partition_size + log(num_clients /
+        aggregation_partition_size)`. Since every partition is accumulated
+        starting from `zero`, this requires `zero` to be an identity of
+        `merge` (as the zero in the algebra of `tff.federated_aggregate`);
+        otherwise `zero` is counted once for each partition.
+      aggregation_deadline_seconds: An optional positive number of seconds. If
+        specified, `federated_aggregate` only aggregates the clients whose
+        values are computed within this many seconds (but at least one
+        client, or the `aggregation_quorum`), and drops the rest.
+      aggregation_quorum: An optional fraction in the interval `(0, 1]`. If
+        specified, `federated_aggregate` only waits for the values of this
+        fraction of the clients (or, if `aggregation_deadline_seconds` is also
+        specified, for any clients whose values are computed before the
+        deadline), and drops the rest.
+
+    Note: `aggregation_deadline_seconds` and `aggregation_quorum` only apply to
+    `federated_aggregate`. All other intrinsics, including `federated_map`,
+    `federated_reduce`, `federated_sum` and `federated_mean`, still wait for
+    every client, since dropping clients would change the cardinality of their
+    results or bias them.
 
     Raises:
       TypeError: If `target_executors` is not a `dict`, where each key is a
@@ -160,9 +214,23 @@ class FederatedResolvingStrategy(federating_executor.FederatingStrategy):
         `executor_base.Executor` or a list of `executor_base.Executor`s.
       ValueError: If `target_executors` contains a
         `placement_literals.PlacementLiteral` key that is not a kind supported
-        by the `FederatedResolvingStrategy`.
+        by the `FederatedResolvingStrategy`, if `aggregation_partition_size`
+        or `aggregation_deadline_seconds` is not positive, or if
+        `aggregation_quorum` is not in the interval `(0, 1]`.
     """
     super().__init__(executor)
+    if aggregation_partition_size is not None:
+      py_typecheck.check_type(aggregation_partition_size, int)
+      if aggregation_partition_size < 1:
+        raise ValueError(
+            'Expected a positive `aggregation_partition_size`, found {}.'
+            .format(aggregation_partition_size))
+    self._aggregation_partition_size = aggregation_partition_size
+    executor_utils.check_aggregation_deadline_and_quorum(
+        aggregation_deadline_seconds, aggregation_quorum)
+    self._aggregation_deadline_seconds = aggregation_deadline_seconds
+    self._aggregation_quorum = aggregation_quorum
+    self._num_dropped_clients = 0
     py_typecheck.check_type(target_executors, dict)
     self._target_executors = {}
     for k, v in target_executors.items():
@@ -183,6 +251,11 @@ class FederatedResolvingStrategy(federating_executor.FederatingStrategy):
               'Unsupported cardinality for placement "{}": {}.'.format(
                   pl, pl_cardinality))
 
+  @property
+  def num_dropped_clients(self) -> int:
+    """The number of client values dropped from `federated_aggregate`s."""
+    return self._num_dropped_clients
+
   def close(self):
     for p, v in self._target_executors.items():
       for e in v:
@@ -346,32 +419,158 @@ class FederatedResolvingStrategy(federating_executor.FederatingStrategy):
             placement,
             all_equal=all_equal))
 
+  @tracing.trace
+  async def _tree_aggregate(self, val: List[executor_value_base.ExecutorValue],
+                            children: List[executor_base.Executor], zero: Any,
+                            zero_type: computation_types.Type,
+                            accumulate: pb.Computation,
+                            accumulate_type: computation_types.FunctionType,
+                            merge: pb.Computation,
+                            merge_type: computation_types.FunctionType,
+                            item_type: computation_types.Type):
+    """Aggregates `val` in partitions merged with `merge` in a balanced tree.
+
+    Each contiguous partition of at most `self._aggregation_partition_size`
+    clients is accumulated sequentially on the executor of the first client in
+    that partition, all partitions in parallel. The partial accumulators are
+    then merged pairwise, one level of the tree at a time, on the executor of
+    the left operand, and the final accumulator is moved to the server.
+
+    Note: Every partition is accumulated starting from `zero`, so the result is
+    only equal to folding all of `val` into `zero` if `zero` is an identity of
+    `merge`.
+
+    Args:
+      val: A `list` of client values.
+      children: A `list` of the client executors in which the values in `val`
+        are embedded.
+      zero: The computed value of the zero of the aggregation.
+      zero_type: The type of `zero`.
+      accumulate: The `pb.Computation` of the accumulate function.
+      accumulate_type: The type of `accumulate`.
+      merge: The `pb.Computation` of the merge function.
+      merge_type: The type of `merge`.
+      item_type: The member type of the values in `val`.
+
+    Returns:
+      An instance of `executor_value_base.ExecutorValue` embedded in the server
+      executor, the result of merging all partial accumulators.
+    """
+    server = self._target_executors[placement_literals.SERVER][0]
+    if not val:
+      return await server.create_value(zero, zero_type)
+
+    async def _move(value, source, target, type_spec):
+      if source is target:
+        return value
+      return await target.create_value(await value.compute(), type_spec)
+
+    async def _accumulate_partition(start):
+      stop = min(start + self._aggregation_partition_size, len(val))
+      child = children[start]
+      items = asyncio.gather(*[
+          _move(val[idx], children[idx], child, item_type)
+          for idx in range(start, stop)
+      ])
+      result, accumulate_fn, items = await asyncio.gather(
+          child.create_value(zero, zero_type),
+          child.create_value(accumulate, accumulate_type), items)
+      for item in items:
+        result = await child.create_call(
+            accumulate_fn, await child.create_struct([result, item]))
+      return child, result
+
+    async def _merge_pair(left, right):
+      child, left_value = left
+      merge_fn, right_value = await asyncio.gather(
+          child.create_value(merge, merge_type),
+          _move(right[1], right[0], child, zero_type))
+      return child, await child.create_call(
+          merge_fn, await child.create_struct([left_value, right_value]))
+
+    partials = await asyncio.gather(*[
+        _accumulate_partition(start)
+        for start in range(0, len(val), self._aggregation_partition_size)
+    ])
+    while len(partials) > 1:
+      merged = await asyncio.gather(*[
+          _merge_pair(partials[idx], partials[idx + 1])
+          for idx in range(0, len(partials) - 1, 2)
+      ])
+      if len(partials) % 2:
+        merged.append(partials[-1])
+      partials = merged
+    _, result = partials[0]
+    return await server.create_value(await result.compute(), zero_type)
+
+  @tracing.trace
+  async def _drop_stragglers(self, val: List[executor_value_base.ExecutorValue],
+                             children: List[executor_base.Executor]):
+    """Drops the client values not computed before the deadline or quorum.
+
+    Args:
+      val: A `list` of client values, one for each client executor.
+      children: A `list` of the client executors.
+
+    Returns:
+      A tuple of the `list` of client values in `val` which have been computed
+      and a `list` of the client executors in which they are embedded.
+    """
+    completed = await executor_utils.gather_before_deadline(
+        [v.compute() for v in val],
+        deadline_seconds=self._aggregation_deadline_seconds,
+        quorum=self._aggregation_quorum)
+    num_dropped = len(val) - len(completed)
+    if num_dropped:
+      self._num_dropped_clients += num_dropped
+      logging.warning('Dropped %d of %d clients from `federated_aggregate`.',
+                      num_dropped, len(val))
+    return ([val[idx] for idx, _ in completed],
+            [children[idx] for idx, _ in completed])
+
   @tracing.trace
   async def compute_federated_aggregate(
       self,
       arg: FederatedResolvingStrategyValue) -> FederatedResolvingStrategyValue:
-    val_type, zero_type, accumulate_type, _, report_type = (
+    val_type, zero_type, accumulate_type, merge_type, report_type = (
         executor_utils.parse_federated_aggregate_argument_types(
             arg.type_signature))
     py_typecheck.check_type(arg.internal_representation, structure.Struct)
     py_typecheck.check_len(arg.internal_representation, 5)
 
-    # Note: This is a simple initial implementation that simply forwards this
-    # to `federated_reduce()`. The more complete implementation would be able
-    # to take advantage of the parallelism afforded by `merge` to reduce the
-    # cost from liner (with respect to the number of clients) to sub-linear.
-
-    # TODO(b/134543154): Expand this implementation to take advantage of the
-    # parallelism afforded by `merge`.
-
     val = arg.internal_representation[0]
     zero = arg.internal_representation[1]
     accumulate = arg.internal_representation[2]
-    pre_report = await self.compute_federated_reduce(
-        FederatedResolvingStrategyValue(
-            structure.Struct([(None, val), (None, zero), (None, accumulate)]),
-            computation_types.StructType(
-                (val_type, zero_type, accumulate_type))))
+    children = self._target_executors.get(placement_literals.CLIENTS)
+    if (self._aggregation_deadline_seconds is not None or
+        self._aggregation_quorum is not None):
+      py_typecheck.check_type(val, list)
+      val, children = await self._drop_stragglers(val, children)
+    if self._aggregation_partition_size is None:
+      # Note: Without an `aggregation_partition_size` this simply forwards to
+      # `federated_reduce()`, which is linear with respect to the number of
+      # clients and does not use `merge`.
+      pre_report = await self.compute_federated_reduce(
+          FederatedResolvingStrategyValue(
+              structure.Struct([(None, val), (None, zero),
+                                (None, accumulate)]),
+              computation_types.StructType(
+                  (val_type, zero_type, accumulate_type))))
+    else:
+      py_typecheck.check_type(val, list)
+      self._check_strategy_compatible_with_placement(
+          placement_literals.CLIENTS)
+      zero_value = await (await self._executor.create_selection(
+          arg, index=1)).compute()
+      result = await self._tree_aggregate(val, children, zero_value, zero_type,
+                                          accumulate, accumulate_type,
+                                          arg.internal_representation[3],
+                                          merge_type, val_type.member)
+      pre_report = FederatedResolvingStrategyValue(
+          [result],
+          computation_types.FederatedType(
+              result.type_signature, placement_literals.SERVER,
+              all_equal=True))
 
     py_typecheck.check_type(pre_report.type_signature,
                             computation_types.FederatedType)
@@ -498,7 +697,28 @@ class FederatedResolvingStrategy(federating_executor.FederatingStrategy):
     zero = await child.create_value(
         await (await self._executor.create_selection(arg, index=1)).compute(),
         zero_type)
-    op = await child.create_value(arg.internal_representation[2], op_type)
+    op_proto = arg.internal_representation[2]
+    op = await child.create_value(op_proto, op_type)
+
+    async def _apply(left, right):
+      return await child.create_call(
+          op, await
+          child.create_struct(structure.Struct([(None, left), (None, right)])))
+
+    # Note: An associative operator whose operands have the same type is
+    # applied pairwise in a balanced tree, one level of the tree at a time, and
+    # the result is combined with `zero` last.
+    if (len(items) > 1 and isinstance(op_proto, pb.Computation) and
+        item_type.is_equivalent_to(zero_type) and
+        executor_utils.is_associative(op_proto)):
+      while len(items) > 1:
+        reduced = await asyncio.gather(*[
+            _apply(items[idx], items[idx + 1])
+            for idx in range(0, len(items) - 1, 2)
+        ])
+        if len(items) % 2:
+          reduced.append(items[-1])
+        items = reduced
 
     result = zero
     for item in items:
@@ -517,17 +737,46 @@ class FederatedResolvingStrategy(federating_executor.FederatingStrategy):
       arg: FederatedResolvingStrategyValue) -> FederatedResolvingStrategyValue:
     raise NotImplementedError('The secure sum intrinsic is not implemented.')
 
+  @tracing.trace
+  async def _stacked_sum(
+      self, val: List[executor_value_base.ExecutorValue],
+      member_type: computation_types.Type) -> FederatedResolvingStrategyValue:
+    """Sums all values in `val` on the server with a single TensorFlow call."""
+    child = self._target_executors[placement_literals.SERVER][0]
+
+    async def _move(v):
+      return await child.create_value(await v.compute(), member_type)
+
+    stacked_sum, items = await asyncio.gather(
+        executor_utils.embed_tf_stacked_sum(child, member_type, len(val)),
+        asyncio.gather(*[_move(v) for v in val]))
+    result = await child.create_call(
+        stacked_sum, await child.create_struct(items))
+    return FederatedResolvingStrategyValue([result],
+                                           computation_types.FederatedType(
+                                               result.type_signature,
+                                               placement_literals.SERVER,
+                                               all_equal=True))
+
   @tracing.trace
   async def compute_federated_sum(
       self,
       arg: FederatedResolvingStrategyValue) -> FederatedResolvingStrategyValue:
     py_typecheck.check_type(arg.type_signature, computation_types.FederatedType)
+    val = arg.internal_representation
+    py_typecheck.check_type(val, list)
+    # Note: Values whose tensors all have fully defined shapes are summed in a
+    # single call on the server, rather than one call per client.
+    if val and _is_stackable_type(arg.type_signature.member):
+      return await self._stacked_sum(val, arg.type_signature.member)
     zero, plus = await asyncio.gather(
         executor_utils.embed_tf_scalar_constant(self._executor,
                                                 arg.type_signature.member, 0),
-        executor_utils.embed_tf_binary_operator(self._executor,
-                                                arg.type_signature.member,
-                                                tf.add))
+        executor_utils.embed_tf_binary_operator(
+            self._executor,
+            arg.type_signature.member,
+            tf.add,
+            associative=True))
     return await self.compute_federated_reduce(
         FederatedResolvingStrategyValue(
             structure.Struct([(None, arg.internal_representation),
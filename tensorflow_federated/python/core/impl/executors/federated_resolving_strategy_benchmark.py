@@ -0,0 +1,106 @@
+# Copyright 2020, The TensorFlow Federated Authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Benchmarks `federated_aggregate` in the `FederatedResolvingStrategy`.
+
+Compares the sequential aggregation (which forwards to `federated_reduce`) with
+the partitioned aggregation that combines partial accumulators using `merge`.
+
+To run the benchmarks:
+
+```
+bazel run //tensorflow_federated/python/core/impl/executors:federated_resolving_strategy_benchmark -- --benchmarks=.
+```
+"""
+
+import asyncio
+import time
+
+import numpy as np
+import tensorflow as tf
+
+from tensorflow_federated.python.core.impl.executors import executor_stacks
+from tensorflow_federated.python.core.impl.executors import executor_test_utils
+from tensorflow_federated.python.core.impl.types import placement_literals
+
+_NUM_CLIENTS = [10, 100, 1000]
+_AGGREGATION_PARTITION_SIZES = [None, 1, 8, 32]
+_CLIENTS_PER_THREAD = 16
+_NUM_ITERS = 5
+
+
+class FederatedAggregateBenchmark(tf.test.Benchmark):
+
+  def _benchmark_federated_aggregate(self, num_clients,
+                                     aggregation_partition_size):
+    factory = executor_stacks.FederatingExecutorFactory(
+        clients_per_thread=_CLIENTS_PER_THREAD,
+        unplaced_ex_factory=executor_stacks.UnplacedExecutorFactory(
+            use_caching=False),
+        aggregation_partition_size=aggregation_partition_size)
+    executor = factory.create_executor(
+        {placement_literals.CLIENTS: num_clients})
+    comp, comp_type = executor_test_utils.create_dummy_intrinsic_def_federated_aggregate(
+    )
+    args = [
+        executor_test_utils.create_dummy_value_at_clients(num_clients),
+        executor_test_utils.create_dummy_value_unplaced(),
+        executor_test_utils.create_dummy_computation_tensorflow_add(),
+        executor_test_utils.create_dummy_computation_tensorflow_add(),
+        executor_test_utils.create_dummy_computation_tensorflow_identity(),
+    ]
+
+    async def _aggregate():
+      fn = await executor.create_value(comp, comp_type)
+      elements = await asyncio.gather(
+          *[executor.create_value(*x) for x in args])
+      arg = await executor.create_struct(elements)
+      result = await executor.create_call(fn, arg)
+      return await result.compute()
+
+    loop = asyncio.new_event_loop()
+    try:
+      # Warm up the executors, such that graph import is not measured.
+      loop.run_until_complete(_aggregate())
+      wall_times = []
+      for _ in range(_NUM_ITERS):
+        start_time = time.time()
+        loop.run_until_complete(_aggregate())
+        wall_times.append(time.time() - start_time)
+    finally:
+      executor.close()
+      loop.close()
+
+    if aggregation_partition_size is None:
+      mode = 'sequential'
+    else:
+      mode = 'partition_size_{}'.format(aggregation_partition_size)
+    self.report_benchmark(
+        name='federated_aggregate_{}_clients_{}'.format(num_clients, mode),
+        iters=_NUM_ITERS,
+        wall_time=np.median(wall_times),
+        extras={
+            'num_clients': num_clients,
+            'min_wall_time': np.min(wall_times),
+            'max_wall_time': np.max(wall_times),
+        })
+
+  def benchmark_federated_aggregate(self):
+    for num_clients in _NUM_CLIENTS:
+      for aggregation_partition_size in _AGGREGATION_PARTITION_SIZES:
+        self._benchmark_federated_aggregate(num_clients,
+                                            aggregation_partition_size)
+
+
+if __name__ == '__main__':
+  tf.test.main()
@@ -13,16 +13,42 @@
 # limitations under the License.
 
 from absl.testing import absltest
+from absl.testing import parameterized
 import tensorflow as tf
 
+from tensorflow_federated.proto.v0 import computation_pb2 as pb
 from tensorflow_federated.python.common_libs import structure
 from tensorflow_federated.python.core.api import computation_types
+from tensorflow_federated.python.core.impl.compiler import intrinsic_defs
+from tensorflow_federated.python.core.impl.compiler import tensorflow_computation_factory
 from tensorflow_federated.python.core.impl.executors import eager_tf_executor
 from tensorflow_federated.python.core.impl.executors import executor_test_utils
 from tensorflow_federated.python.core.impl.executors import federated_resolving_strategy
+from tensorflow_federated.python.core.impl.executors import federating_executor
+from tensorflow_federated.python.core.impl.executors import reference_resolving_executor
+from tensorflow_federated.python.core.impl.types import placement_literals
 from tensorflow_federated.python.core.impl.types import type_factory
 
 
+def create_test_executor(number_of_clients: int = 3,
+                         aggregation_partition_size=None):
+
+  def create_bottom_stack():
+    executor = eager_tf_executor.EagerTFExecutor()
+    return reference_resolving_executor.ReferenceResolvingExecutor(executor)
+
+  factory = federated_resolving_strategy.FederatedResolvingStrategy.factory(
+      {
+          placement_literals.SERVER:
+              create_bottom_stack(),
+          placement_literals.CLIENTS: [
+              create_bottom_stack() for _ in range(number_of_clients)
+          ],
+      },
+      aggregation_partition_size=aggregation_partition_size)
+  return federating_executor.FederatingExecutor(factory, create_bottom_stack())
+
+
 class FederatedResolvingStrategyValueComputeTest(
     executor_test_utils.AsyncTestCase):
 
@@ -104,5 +130,283 @@ class FederatedResolvingStrategyValueComputeTest(
       self.run_sync(value.compute())
 
 
+def _create_zero_of_merge():
+  """Returns a zero which is an identity of the dummy `merge` (addition)."""
+  return 0.0, computation_types.TensorType(tf.float32)
+
+
+class FederatedResolvingStrategyAggregateTest(executor_test_utils.AsyncTestCase,
+                                              parameterized.TestCase):
+
+  def _aggregate(self, executor, number_of_clients, zero):
+    comp, comp_type = executor_test_utils.create_dummy_intrinsic_def_federated_aggregate(
+    )
+    args = [
+        executor_test_utils.create_dummy_value_at_clients(number_of_clients),
+        zero,
+        executor_test_utils.create_dummy_computation_tensorflow_add(),
+        executor_test_utils.create_dummy_computation_tensorflow_add(),
+        executor_test_utils.create_dummy_computation_tensorflow_identity(),
+    ]
+    comp = self.run_sync(executor.create_value(comp, comp_type))
+    elements = [self.run_sync(executor.create_value(*x)) for x in args]
+    arg = self.run_sync(executor.create_struct(elements))
+    result = self.run_sync(executor.create_call(comp, arg))
+    self.assertEqual(result.type_signature.compact_representation(),
+                     comp_type.result.compact_representation())
+    return self.run_sync(result.compute())
+
+  # pyformat: disable
+  @parameterized.named_parameters([
+      ('sequential', 5, None),
+      ('one_client_per_partition', 5, 1),
+      ('two_clients_per_partition', 5, 2),
+      ('one_partition', 5, 5),
+      ('partition_larger_than_clients', 5, 10),
+      ('one_client', 1, 2),
+      ('many_clients', 17, 3),
+  ])
+  # pyformat: enable
+  def test_returns_value_with_aggregation_partition_size(
+      self, number_of_clients, aggregation_partition_size):
+    executor = create_test_executor(
+        number_of_clients=number_of_clients,
+        aggregation_partition_size=aggregation_partition_size)
+
+    actual_result = self._aggregate(executor, number_of_clients,
+                                    _create_zero_of_merge())
+
+    client_values, _ = executor_test_utils.create_dummy_value_at_clients(
+        number_of_clients)
+    zero, _ = _create_zero_of_merge()
+    self.assertEqual(actual_result, zero + sum(client_values))
+
+  def test_accumulates_each_partition_starting_from_zero(self):
+    executor = create_test_executor(
+        number_of_clients=5, aggregation_partition_size=2)
+
+    actual_result = self._aggregate(
+        executor, 5, executor_test_utils.create_dummy_value_unplaced())
+
+    client_values, _ = executor_test_utils.create_dummy_value_at_clients(5)
+    zero, _ = executor_test_utils.create_dummy_value_unplaced()
+    # Note: `zero` is not an identity of `merge`, so it is counted once for
+    # each of the three partitions.
+    self.assertEqual(actual_result, 3 * zero + sum(client_values))
+
+  def test_partitions_on_shared_client_executors(self):
+
+    def create_bottom_stack():
+      executor = eager_tf_executor.EagerTFExecutor()
+      return reference_resolving_executor.ReferenceResolvingExecutor(executor)
+
+    client_stacks = [create_bottom_stack() for _ in range(2)]
+    factory = federated_resolving_strategy.FederatedResolvingStrategy.factory(
+        {
+            placement_literals.SERVER: create_bottom_stack(),
+            placement_literals.CLIENTS: [
+                client_stacks[k % 2] for k in range(7)
+            ],
+        },
+        aggregation_partition_size=2)
+    executor = federating_executor.FederatingExecutor(factory,
+                                                      create_bottom_stack())
+
+    actual_result = self._aggregate(executor, 7, _create_zero_of_merge())
+
+    client_values, _ = executor_test_utils.create_dummy_value_at_clients(7)
+    zero, _ = _create_zero_of_merge()
+    self.assertEqual(actual_result, zero + sum(client_values))
+
+  def test_raises_value_error_with_non_positive_aggregation_partition_size(
+      self):
+    with self.assertRaises(ValueError):
+      create_test_executor(aggregation_partition_size=0)
+
+
+class FederatedResolvingStrategyStragglerTest(executor_test_utils.AsyncTestCase,
+                                              parameterized.TestCase):
+
+  def _create_executor_with_straggler(self, **kwargs):
+
+    def create_bottom_stack():
+      executor = eager_tf_executor.EagerTFExecutor()
+      return reference_resolving_executor.ReferenceResolvingExecutor(executor)
+
+    client_stacks = [create_bottom_stack() for _ in range(3)]
+    client_stacks.append(
+        executor_test_utils.DelayingExecutor(
+            create_bottom_stack(), delay_seconds=60.0))
+    strategies = []
+
+    def factory(executor):
+      strategy = federated_resolving_strategy.FederatedResolvingStrategy(
+          executor, {
+              placement_literals.SERVER: create_bottom_stack(),
+              placement_literals.CLIENTS: client_stacks,
+          }, **kwargs)
+      strategies.append(strategy)
+      return strategy
+
+    executor = federating_executor.FederatingExecutor(factory,
+                                                      create_bottom_stack())
+    return executor, strategies[0]
+
+  def _aggregate(self, executor):
+    comp, comp_type = executor_test_utils.create_dummy_intrinsic_def_federated_aggregate(
+    )
+    args = [
+        ([1.0, 2.0, 3.0, 4.0], type_factory.at_clients(tf.float32)),
+        _create_zero_of_merge(),
+        executor_test_utils.create_dummy_computation_tensorflow_add(),
+        executor_test_utils.create_dummy_computation_tensorflow_add(),
+        executor_test_utils.create_dummy_computation_tensorflow_identity(),
+    ]
+    comp = self.run_sync(executor.create_value(comp, comp_type))
+    elements = [self.run_sync(executor.create_value(*x)) for x in args]
+    arg = self.run_sync(executor.create_struct(elements))
+    result = self.run_sync(executor.create_call(comp, arg))
+    return self.run_sync(result.compute())
+
+  # pyformat: disable
+  @parameterized.named_parameters([
+      ('deadline', dict(aggregation_deadline_seconds=0.5)),
+      ('quorum', dict(aggregation_quorum=0.75)),
+      ('deadline_and_quorum',
+       dict(aggregation_deadline_seconds=0.5, aggregation_quorum=0.5)),
+      ('deadline_and_partitions',
+       dict(aggregation_deadline_seconds=0.5, aggregation_partition_size=2)),
+  ])
+  # pyformat: enable
+  def test_drops_straggler(self, kwargs):
+    executor, strategy = self._create_executor_with_straggler(**kwargs)
+
+    actual_result = self._aggregate(executor)
+
+    zero, _ = _create_zero_of_merge()
+    self.assertEqual(actual_result, zero + 1.0 + 2.0 + 3.0)
+    self.assertEqual(strategy.num_dropped_clients, 1)
+
+  # pyformat: disable
+  @parameterized.named_parameters([
+      ('deadline', dict(aggregation_deadline_seconds=0.0)),
+      ('quorum', dict(aggregation_quorum=1.5)),
+  ])
+  # pyformat: enable
+  def test_raises_value_error_with_invalid_arguments(self, kwargs):
+    factory = federated_resolving_strategy.FederatedResolvingStrategy.factory(
+        {placement_literals.SERVER: eager_tf_executor.EagerTFExecutor()},
+        **kwargs)
+    with self.assertRaises(ValueError):
+      federating_executor.FederatingExecutor(
+          factory, eager_tf_executor.EagerTFExecutor())
+
+
+class FederatedResolvingStrategyReduceTest(executor_test_utils.AsyncTestCase,
+                                           parameterized.TestCase):
+
+  def _reduce(self, executor, value, op, op_type):
+    comp, comp_type = executor_test_utils.create_dummy_intrinsic_def_federated_reduce(
+    )
+    args = [
+        (value, type_factory.at_clients(tf.float32)),
+        executor_test_utils.create_dummy_value_unplaced(),
+        (op, op_type),
+    ]
+    comp = self.run_sync(executor.create_value(comp, comp_type))
+    elements = [self.run_sync(executor.create_value(*x)) for x in args]
+    arg = self.run_sync(executor.create_struct(elements))
+    result = self.run_sync(executor.create_call(comp, arg))
+    self.assertEqual(result.type_signature.compact_representation(),
+                     comp_type.result.compact_representation())
+    return self.run_sync(result.compute())
+
+  @parameterized.named_parameters(
+      ('one_client', 1),
+      ('two_clients', 2),
+      ('odd_number_of_clients', 7),
+      ('many_clients', 16),
+  )
+  def test_returns_value_with_associative_op(self, number_of_clients):
+    executor = create_test_executor(number_of_clients=number_of_clients)
+    value = [float(x) for x in range(number_of_clients)]
+    op, op_type = executor_test_utils.create_dummy_computation_tensorflow_add()
+    op.tensorflow.associative = True
+
+    actual_result = self._reduce(executor, value, op, op_type)
+
+    zero, _ = executor_test_utils.create_dummy_value_unplaced()
+    self.assertEqual(actual_result, zero + sum(value))
+
+  def test_applies_op_marked_associative_in_tree(self):
+    executor = create_test_executor(number_of_clients=4)
+    op, op_type = tensorflow_computation_factory.create_binary_operator(
+        tf.subtract, computation_types.TensorType(tf.float32))
+    value = [1.0, 2.0, 3.0, 4.0]
+    sequential_result = self._reduce(executor, value, op, op_type)
+    # Note: `tf.subtract` is not associative, so marking it shows in which
+    # order the values are combined. The mark is carried by the copy of `op`,
+    # so `op` itself is not marked.
+    marked_op = pb.Computation()
+    marked_op.CopyFrom(op)
+    marked_op.tensorflow.associative = True
+
+    tree_result = self._reduce(executor, value, marked_op, op_type)
+
+    zero, _ = executor_test_utils.create_dummy_value_unplaced()
+    self.assertEqual(sequential_result, zero - 1.0 - 2.0 - 3.0 - 4.0)
+    self.assertEqual(tree_result, zero - ((1.0 - 2.0) - (3.0 - 4.0)))
+
+
+class FederatedResolvingStrategySumTest(executor_test_utils.AsyncTestCase,
+                                        parameterized.TestCase):
+
+  # pyformat: disable
+  @parameterized.named_parameters(
+      ('float', tf.float32, [1.0, 2.0, 3.5], 6.5),
+      ('vector', computation_types.TensorType(tf.int32, [2]),
+       [[1, 2], [3, 4], [5, 6]], [9, 12]),
+      ('named_tuple',
+       computation_types.StructType([('a', tf.int32), ('b', tf.float32)]),
+       [structure.Struct([('a', x), ('b', float(x))]) for x in range(3)],
+       structure.Struct([('a', 3), ('b', 3.0)])),
+  )
+  # pyformat: enable
+  def test_returns_value_with_federated_sum(self, member_type, value,
+                                            expected_result):
+    executor = create_test_executor(number_of_clients=len(value))
+    comp_type = computation_types.FunctionType(
+        type_factory.at_clients(member_type),
+        type_factory.at_server(member_type))
+
+    comp = self.run_sync(
+        executor.create_value(intrinsic_defs.FEDERATED_SUM, comp_type))
+    arg = self.run_sync(
+        executor.create_value(value, type_factory.at_clients(member_type)))
+    result = self.run_sync(executor.create_call(comp, arg))
+
+    self.assertEqual(result.type_signature.compact_representation(),
+                     comp_type.result.compact_representation())
+    actual_result = self.run_sync(result.compute())
+    if isinstance(expected_result, list):
+      self.assertCountEqual(actual_result, expected_result)
+    else:
+      self.assertEqual(actual_result, expected_result)
+
+  def test_returns_value_with_federated_mean(self):
+    executor = create_test_executor(number_of_clients=4)
+    comp_type = computation_types.FunctionType(
+        type_factory.at_clients(tf.float32), type_factory.at_server(tf.float32))
+
+    comp = self.run_sync(
+        executor.create_value(intrinsic_defs.FEDERATED_MEAN, comp_type))
+    arg = self.run_sync(
+        executor.create_value([1.0, 2.0, 3.0, 6.0],
+                              type_factory.at_clients(tf.float32)))
+    result = self.run_sync(executor.create_call(comp, arg))
+
+    self.assertEqual(self.run_sync(result.compute()), 3.0)
+
+
 if __name__ == '__main__':
   absltest.main()
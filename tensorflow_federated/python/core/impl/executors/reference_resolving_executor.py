@@ -61,8 +61,13 @@ class _UnboundRefChecker:
       return evaluated
     tree = building_blocks.ComputationBuildingBlock.from_proto(proto)
     unbound_ref_map = transformation_utils.get_map_of_unbound_references(tree)
-    self._evaluated_comps.update(
-        {_hash_proto(k.proto): v for k, v in unbound_ref_map.items()})
+    # Only lambdas are later checked on their own (as `ScopedLambda`s), so only
+    # their results are cached, rather than serializing every subtree.
+    self._evaluated_comps.update({
+        _hash_proto(k.proto): v
+        for k, v in unbound_ref_map.items()
+        if k is tree or k.is_lambda()
+    })
     return unbound_ref_map[tree]
 
 
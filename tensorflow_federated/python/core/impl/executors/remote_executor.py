@@ -21,6 +21,7 @@ import weakref
 
 import absl.logging as logging
 import grpc
+from grpc.experimental import aio as grpc_aio
 
 from tensorflow_federated.proto.v0 import executor_pb2
 from tensorflow_federated.proto.v0 import executor_pb2_grpc
@@ -34,6 +35,7 @@ from tensorflow_federated.python.core.impl.executors import executor_service_uti
 from tensorflow_federated.python.core.impl.executors import executor_value_base
 
 _STREAM_CLOSE_WAIT_SECONDS = 10
+_DEFAULT_MAX_IN_FLIGHT_REQUESTS = 1000
 
 
 class RemoteValue(executor_value_base.ExecutorValue):
@@ -176,6 +178,151 @@ class _BidiStream:
     self._is_initialized = False
 
 
+class _AsyncBidiStream:
+  """An asyncio bidi stream connection to the Executor service's Execute method.
+
+  Unlike `_BidiStream`, no threads are blocked while waiting for responses: the
+  responses are read from the stream by a single task, which resolves the
+  future of the corresponding request. The number of requests in flight is
+  bounded by a window, such that the remote executor service is not flooded.
+
+  The stream is bound to the event loop that it was initialized on, and is
+  reinitialized on that loop after an error. It is only rebound to another
+  event loop once the loop it is bound to has been closed; using it from
+  another event loop while that loop is still open raises a `RuntimeError`.
+  Requests can be sent from other threads with `send_request_threadsafe`.
+  """
+
+  def __init__(self, stub, max_in_flight_requests):
+    self._stub = stub
+    self._max_in_flight_requests = max_in_flight_requests
+    self._call = None
+    self._loop = None
+
+  def _lazy_init(self):
+    """Lazily initialize the underlying gRPC stream on the running loop."""
+    loop = asyncio.get_event_loop()
+    if self._loop is not loop:
+      if self._loop is not None and not self._loop.is_closed():
+        raise RuntimeError(
+            'The async bidi stream is bound to an event loop that is still '
+            'open, and cannot be used from another event loop.')
+      self.close()
+      self._loop = loop
+    elif self._call is not None:
+      return
+
+    logging.debug('Initializing async bidi stream')
+    self._call = self._stub.Execute()
+    self._window = asyncio.Semaphore(self._max_in_flight_requests)
+    self._write_lock = asyncio.Lock()
+    self._response_futures = {}
+    self._sequence_numbers = itertools.count()
+    self._response_task = loop.create_task(
+        self._dispatch_responses(self._call, self._response_futures))
+
+  async def _dispatch_responses(self, call, response_futures):
+    """Resolves the futures of the requests as their responses arrive."""
+    error = None
+    try:
+      while True:
+        response = await call.read()
+        if response is grpc_aio.EOF:
+          break
+        logging.debug('Processing response of type %s, seq_no %s',
+                      response.WhichOneof('response'),
+                      response.sequence_number)
+        future = response_futures.pop(response.sequence_number, None)
+        if future is not None and not future.done():
+          future.set_result(response)
+    except grpc.RpcError as e:
+      logging.exception('Error calling remote executor: %s', e)
+      if _is_retryable_grpc_error(e):
+        error = execution_context.RetryableError(e)
+      else:
+        error = e
+    finally:
+      if call is self._call:
+        self._call = None
+      if error is None:
+        error = execution_context.RetryableError(
+            'The stream was closed before a response was received.')
+      for future in response_futures.values():
+        if not future.done():
+          future.set_exception(error)
+      response_futures.clear()
+
+  @tracing.trace(span=True)
+  async def send_request(self, request):
+    """Send a request on the bidi stream."""
+    self._lazy_init()
+
+    py_typecheck.check_type(request, executor_pb2.ExecuteRequest)
+    request_type = request.WhichOneof('request')
+    async with self._window:
+      # The stream may have been closed while waiting for the window.
+      self._lazy_init()
+      call = self._call
+      response_futures = self._response_futures
+      seq = next(self._sequence_numbers)
+      request.sequence_number = seq
+      response_future = self._loop.create_future()
+      response_futures[seq] = response_future
+      try:
+        async with self._write_lock:
+          await call.write(request)
+      except grpc.RpcError as e:
+        response_futures.pop(seq, None)
+        if _is_retryable_grpc_error(e):
+          raise execution_context.RetryableError(e)
+        raise
+      response = await response_future
+    py_typecheck.check_type(response, executor_pb2.ExecuteResponse)
+    response_type = response.WhichOneof('response')
+    if response_type != request_type:
+      raise ValueError('Request had type: {} but response had type: {}'.format(
+          request_type, response_type))
+    return response
+
+  def send_request_threadsafe(self, request) -> bool:
+    """Schedules `request` on the stream's event loop from any thread.
+
+    The response of the request is discarded.
+
+    Args:
+      request: An `executor_pb2.ExecuteRequest` to send.
+
+    Returns:
+      `True` if the request was scheduled, or `False` if the stream is not
+      bound to an open event loop, in which case the request is dropped.
+    """
+    loop = self._loop
+    if loop is None or loop.is_closed():
+      return False
+
+    def create_send_request_task():
+      loop.create_task(self.send_request(request))
+
+    try:
+      loop.call_soon_threadsafe(create_send_request_task)
+    except RuntimeError:
+      # The event loop was closed concurrently.
+      return False
+    return True
+
+  def close(self):
+    if self._call is not None:
+      logging.debug('Closing async bidi stream')
+      call = self._call
+      self._call = None
+      # The call cannot be cancelled once its event loop has been closed, in
+      # which case it has already been torn down.
+      if not self._loop.is_closed():
+        call.cancel()
+    else:
+      logging.debug('Closing unused async bidi stream')
+
+
 def _request(rpc_func, request):
   with tracing.wrap_rpc_in_trace_context():
     try:
@@ -188,6 +335,18 @@ def _request(rpc_func, request):
         raise
 
 
+async def _request_async(rpc_func, request):
+  with tracing.wrap_rpc_in_trace_context():
+    try:
+      return await rpc_func(request)
+    except grpc.RpcError as e:
+      if _is_retryable_grpc_error(e):
+        logging.info('Received retryable gRPC error: %s', e)
+        raise execution_context.RetryableError(e)
+      else:
+        raise
+
+
 def _is_retryable_grpc_error(error):
   """Predicate defining what is a retryable gRPC error."""
   non_retryable_errors = {
@@ -209,36 +368,65 @@ def _is_retryable_grpc_error(error):
 class RemoteExecutor(executor_base.Executor):
   """The remote executor is a local proxy for a remote executor instance."""
 
-  # TODO(b/134543154): Switch to using an asynchronous gRPC client so we don't
-  # have to block on all those calls.
-
   def __init__(self,
                channel,
                rpc_mode='REQUEST_REPLY',
                thread_pool_executor=None,
-               dispose_batch_size=20):
+               dispose_batch_size=20,
+               value_chunk_size_bytes=None,
+               max_in_flight_requests=_DEFAULT_MAX_IN_FLIGHT_REQUESTS):
     """Creates a remote executor.
 
     Args:
-      channel: An instance of `grpc.Channel` to use for communication with the
-        remote executor service.
+      channel: An instance of `grpc.Channel` or `grpc.experimental.aio.Channel`
+        to use for communication with the remote executor service. If an
+        asyncio channel is given, `rpc_mode` must be 'STREAMING', and the
+        responses are awaited on the event loop rather than on threads, such
+        that the number of requests in flight is bounded only by
+        `max_in_flight_requests`. An asyncio channel must only be used from the
+        event loop it was created on.
       rpc_mode: Optional mode of calling the remote executor. Must be either
         'REQUEST_REPLY' or 'STREAMING' (defaults to 'REQUEST_REPLY'). This
         option will be removed after the request-reply interface is deprecated.
       thread_pool_executor: Optional concurrent.futures.Executor used to wait
         for the reply to a streaming RPC message. Uses the default Executor if
-        not specified.
+        not specified. Unused with an asyncio channel.
       dispose_batch_size: The batch size for requests to dispose of remote
         worker values. Lower values will result in more requests to the remote
         worker, but will result in values being cleaned up sooner and therefore
         may result in lower memory usage on the remote worker.
+      value_chunk_size_bytes: Optional maximum size in bytes of the tensor
+        content sent in a single message. If specified, values are sent to the
+        remote executor service in chunks with the `CreateValueStream` RPC
+        (regardless of `rpc_mode`), such that values larger than the maximum
+        gRPC message size can be created. If unspecified, each value is sent in
+        a single message.
+      max_in_flight_requests: The maximum number of requests awaiting a
+        response on the stream of an asyncio channel. Unused with a
+        `grpc.Channel`.
     """
 
-    py_typecheck.check_type(channel, grpc.Channel)
+    py_typecheck.check_type(channel, (grpc.Channel, grpc_aio.Channel))
     py_typecheck.check_type(rpc_mode, str)
     py_typecheck.check_type(dispose_batch_size, int)
+    py_typecheck.check_type(max_in_flight_requests, int)
     if rpc_mode not in ['REQUEST_REPLY', 'STREAMING']:
       raise ValueError('Invalid rpc_mode: {}'.format(rpc_mode))
+    is_async = isinstance(channel, grpc_aio.Channel)
+    if is_async and rpc_mode != 'STREAMING':
+      raise ValueError(
+          'An asyncio channel requires the \'STREAMING\' rpc_mode, found '
+          '\'{}\'.'.format(rpc_mode))
+    if max_in_flight_requests < 1:
+      raise ValueError(
+          'Expected a positive `max_in_flight_requests`, found {}.'.format(
+              max_in_flight_requests))
+    if value_chunk_size_bytes is not None:
+      py_typecheck.check_type(value_chunk_size_bytes, int)
+      if value_chunk_size_bytes < 1:
+        raise ValueError(
+            'Expected a positive `value_chunk_size_bytes`, found {}.'.format(
+                value_chunk_size_bytes))
 
     logging.debug('Creating new ExecutorStub with RPC_MODE=%s', rpc_mode)
 
@@ -246,7 +434,12 @@ class RemoteExecutor(executor_base.Executor):
     self._bidi_stream = None
     self._dispose_batch_size = dispose_batch_size
     self._dispose_request = executor_pb2.DisposeRequest()
-    if rpc_mode == 'STREAMING':
+    self._value_chunk_size_bytes = value_chunk_size_bytes
+    self._is_async = is_async
+    if is_async:
+      logging.debug('Creating async Bidi stream')
+      self._bidi_stream = _AsyncBidiStream(self._stub, max_in_flight_requests)
+    elif rpc_mode == 'STREAMING':
       logging.debug('Creating Bidi stream')
       self._bidi_stream = _BidiStream(self._stub, thread_pool_executor)
 
@@ -264,6 +457,12 @@ class RemoteExecutor(executor_base.Executor):
     self._dispose_request = executor_pb2.DisposeRequest()
     if self._bidi_stream is None:
       _request(self._stub.Dispose, dispose_request)
+    elif self._is_async:
+      # This may be called by the garbage collector on any thread, so the
+      # request is scheduled on the event loop that the stream is bound to.
+      request = executor_pb2.ExecuteRequest(dispose=dispose_request)
+      if not self._bidi_stream.send_request_threadsafe(request):
+        logging.debug('Dropping dispose request of a closed event loop')
     else:
       send_request_fut = self._bidi_stream.send_request(
           executor_pb2.ExecuteRequest(dispose=dispose_request))
@@ -273,6 +472,8 @@ class RemoteExecutor(executor_base.Executor):
 
   @tracing.trace(span=True)
   async def create_value(self, value, type_spec=None):
+    if self._value_chunk_size_bytes is not None:
+      return await self._create_value_stream(value, type_spec)
 
     @tracing.trace
     def serialize_value():
@@ -289,6 +490,18 @@ class RemoteExecutor(executor_base.Executor):
     py_typecheck.check_type(response, executor_pb2.CreateValueResponse)
     return RemoteValue(response.value_ref, type_spec, self)
 
+  async def _create_value_stream(self, value, type_spec=None):
+    """Creates a value by sending it to the service in chunks."""
+    # The chunks are serialized lazily as gRPC sends them.
+    chunks, type_spec = executor_service_utils.serialize_value_chunks(
+        value, type_spec, self._value_chunk_size_bytes)
+    if self._is_async:
+      response = await _request_async(self._stub.CreateValueStream, chunks)
+    else:
+      response = _request(self._stub.CreateValueStream, chunks)
+    py_typecheck.check_type(response, executor_pb2.CreateValueResponse)
+    return RemoteValue(response.value_ref, type_spec, self)
+
   @tracing.trace(span=True)
   async def create_call(self, comp, arg=None):
     py_typecheck.check_type(comp, RemoteValue)
@@ -20,7 +20,9 @@ from unittest import mock
 from absl.testing import absltest
 from absl.testing import parameterized
 import grpc
+from grpc.experimental import aio as grpc_aio
 from grpc.framework.foundation import logging_pool
+import numpy as np
 import portpicker
 import tensorflow as tf
 
@@ -46,7 +48,9 @@ def create_remote_executor():
 
 
 @contextlib.contextmanager
-def test_context(rpc_mode='REQUEST_REPLY'):
+def test_context(rpc_mode='REQUEST_REPLY',
+                 value_chunk_size_bytes=None,
+                 use_aio_channel=False):
   port = portpicker.pick_unused_port()
   server_pool = logging_pool.pool(max_workers=1)
   server = grpc.server(server_pool)
@@ -57,8 +61,12 @@ def test_context(rpc_mode='REQUEST_REPLY'):
   service = executor_service.ExecutorService(tracer)
   executor_pb2_grpc.add_ExecutorServicer_to_server(service, server)
   server.start()
-  channel = grpc.insecure_channel('localhost:{}'.format(port))
-  remote_exec = remote_executor.RemoteExecutor(channel, rpc_mode)
+  if use_aio_channel:
+    channel = grpc_aio.insecure_channel('localhost:{}'.format(port))
+  else:
+    channel = grpc.insecure_channel('localhost:{}'.format(port))
+  remote_exec = remote_executor.RemoteExecutor(
+      channel, rpc_mode, value_chunk_size_bytes=value_chunk_size_bytes)
   executor = reference_resolving_executor.ReferenceResolvingExecutor(
       remote_exec)
   try:
@@ -67,7 +75,10 @@ def test_context(rpc_mode='REQUEST_REPLY'):
     executor.close()
     tracer.close()
     try:
-      channel.close()
+      if use_aio_channel:
+        asyncio.get_event_loop().run_until_complete(channel.close())
+      else:
+        channel.close()
     except AttributeError:
       pass  # Public gRPC channel doesn't support close()
     finally:
@@ -386,6 +397,47 @@ class RemoteExecutorTest(absltest.TestCase):
       loop.run_until_complete(executor.create_selection(source, index=0))
 
 
+class AsyncBidiStreamTest(absltest.TestCase):
+
+  def _create_bound_stream(self):
+    stream = remote_executor._AsyncBidiStream(mock.MagicMock(), 1)
+    loop = asyncio.new_event_loop()
+    self.addCleanup(loop.close)
+    self.addCleanup(stream.close)
+    asyncio.set_event_loop(loop)
+    self.addCleanup(asyncio.set_event_loop, None)
+    stream._lazy_init()
+    return stream, loop
+
+  def test_lazy_init_raises_runtime_error_on_another_open_event_loop(self):
+    stream, _ = self._create_bound_stream()
+    other_loop = asyncio.new_event_loop()
+    self.addCleanup(other_loop.close)
+    asyncio.set_event_loop(other_loop)
+
+    with self.assertRaises(RuntimeError):
+      stream._lazy_init()
+
+  def test_send_request_threadsafe_schedules_request_on_bound_loop(self):
+    stream, loop = self._create_bound_stream()
+    request = executor_pb2.ExecuteRequest(
+        dispose=executor_pb2.DisposeRequest())
+
+    with mock.patch.object(loop, 'call_soon_threadsafe') as mock_call_soon:
+      self.assertTrue(stream.send_request_threadsafe(request))
+
+    mock_call_soon.assert_called_once()
+
+  def test_send_request_threadsafe_drops_request_on_closed_loop(self):
+    stream, loop = self._create_bound_stream()
+    stream.close()
+    loop.close()
+    request = executor_pb2.ExecuteRequest(
+        dispose=executor_pb2.DisposeRequest())
+
+    self.assertFalse(stream.send_request_threadsafe(request))
+
+
 class RemoteExecutorIntegrationTest(parameterized.TestCase):
 
   def test_no_arg_tf_computation(self):
@@ -418,6 +470,24 @@ class RemoteExecutorIntegrationTest(parameterized.TestCase):
       result = _invoke(context.executor, comp, (10, 20))
       self.assertEqual(result, 30)
 
+  @parameterized.named_parameters(
+      ('request_reply', 'REQUEST_REPLY'),
+      ('streaming', 'STREAMING'),
+  )
+  def test_with_chunked_values(self, rpc_mode):
+
+    @computations.tf_computation(
+        computation_types.TensorType(tf.float32, [1000]), tf.float32)
+    def comp(x, y):
+      return tf.reduce_sum(x) + y
+
+    with test_context(
+        rpc_mode=rpc_mode, value_chunk_size_bytes=256) as context:
+      result = _invoke(context.executor, comp, (np.ones([1000], np.float32),
+                                                 np.float32(2.0)))
+
+    self.assertEqual(result, 1002.0)
+
   def test_with_selection(self):
     with test_context() as context:
       self._test_with_selection(context)
@@ -448,20 +518,49 @@ class RemoteExecutorIntegrationTest(parameterized.TestCase):
     self.assertLen(seletions, 2)
 
   @parameterized.named_parameters(
-      ('request_reply', 'REQUEST_REPLY'),
-      ('streaming', 'STREAMING'),
+      ('request_reply', 'REQUEST_REPLY', False),
+      ('streaming', 'STREAMING', False),
+      ('aio_streaming', 'STREAMING', True),
   )
-  def test_execution_of_tensorflow(self, rpc_mode):
+  def test_execution_of_tensorflow(self, rpc_mode, use_aio_channel):
 
     @computations.tf_computation
     def comp():
       return tf.math.add(5, 5)
 
-    with test_context(rpc_mode=rpc_mode) as context:
+    with test_context(
+        rpc_mode=rpc_mode, use_aio_channel=use_aio_channel) as context:
       result = _invoke(context.executor, comp)
 
     self.assertEqual(result, 10)
 
+  def test_with_concurrent_requests_over_aio_channel(self):
+
+    @computations.tf_computation(tf.int32)
+    def add_one(x):
+      return x + 1
+
+    async def _invoke_many(ex, num_calls):
+      fn = await ex.create_value(add_one)
+      args = await asyncio.gather(
+          *[ex.create_value(i, tf.int32) for i in range(num_calls)])
+      results = await asyncio.gather(
+          *[ex.create_call(fn, arg) for arg in args])
+      return await asyncio.gather(*[result.compute() for result in results])
+
+    with test_context(rpc_mode='STREAMING', use_aio_channel=True) as context:
+      results = asyncio.get_event_loop().run_until_complete(
+          _invoke_many(context.executor, 50))
+
+    self.assertEqual(results, list(range(1, 51)))
+
+  def test_aio_channel_requires_streaming(self):
+    channel = grpc_aio.insecure_channel('localhost:{}'.format(
+        portpicker.pick_unused_port()))
+    with self.assertRaises(ValueError):
+      remote_executor.RemoteExecutor(channel, 'REQUEST_REPLY')
+    asyncio.get_event_loop().run_until_complete(channel.close())
+
   def test_with_federated_computations(self):
     with test_context() as context:
 
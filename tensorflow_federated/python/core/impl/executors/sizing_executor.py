@@ -14,15 +14,17 @@
 """Utils for testing executors."""
 
 import collections
-from typing import List, Tuple
+from typing import List, Mapping, Optional, Tuple
 
 import tensorflow as tf
 
 from tensorflow_federated.python.common_libs import py_typecheck
 from tensorflow_federated.python.common_libs import structure
+from tensorflow_federated.python.core.api import computation_types
 from tensorflow_federated.python.core.api import typed_object
 from tensorflow_federated.python.core.impl.executors import executor_base
 from tensorflow_federated.python.core.impl.executors import executor_value_base
+from tensorflow_federated.python.core.impl.types import placement_literals
 
 # This type is used to pass around information related to tensors. The int
 # describes the number of elements of a tensor, the DType is the same tensor's
@@ -75,6 +77,52 @@ def get_type_information(value, type_spec):
     return []
 
 
+def get_type_size_in_bytes(
+    type_spec: computation_types.Type,
+    cardinalities: Optional[Mapping[placement_literals.PlacementLiteral,
+                                    int]] = None
+) -> int:
+  """Returns an estimate of the size in bytes of a value of type `type_spec`.
+
+  Like `get_type_information`, this function considers type_specs which are of
+  TensorType or StructType, and additionally FederatedType; the size of a
+  tensor is its number of elements times the size of its dtype, and values of
+  other types (such as sequences and functions) have a size of 0. As the size
+  is estimated from `type_spec` alone, dimensions of unknown size are counted
+  as a single element, and the elements of a string tensor are counted as the
+  size of a pointer rather than the lengths of the strings.
+
+  The size of a federated value is the size of its member times the number of
+  its members, which is one if the value is all equal, and the cardinality of
+  its placement in `cardinalities` otherwise (or one, if unknown).
+
+  Args:
+    type_spec: An instance of `tff.Type`.
+    cardinalities: An optional mapping from placements to the number of
+      participants at each placement.
+
+  Returns:
+    The estimated size in bytes as an integer.
+  """
+  py_typecheck.check_type(type_spec, computation_types.Type)
+  if type_spec.is_tensor():
+    num_elements = 1
+    if type_spec.shape.rank is not None:
+      for dim in type_spec.shape.as_list():
+        if dim is not None:
+          num_elements *= dim
+    return num_elements * type_spec.dtype.size
+  elif type_spec.is_struct():
+    return sum(get_type_size_in_bytes(t, cardinalities) for t in type_spec)
+  elif type_spec.is_federated():
+    member_size = get_type_size_in_bytes(type_spec.member, cardinalities)
+    if type_spec.all_equal or cardinalities is None:
+      return member_size
+    return member_size * cardinalities.get(type_spec.placement, 1)
+  else:
+    return 0
+
+
 class SizingExecutor(executor_base.Executor):
   """Tracing executor keeps a log of all calls for use in testing."""
 
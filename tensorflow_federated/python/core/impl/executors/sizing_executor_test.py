@@ -26,6 +26,7 @@ from tensorflow_federated.python.core.impl.executors import caching_executor
 from tensorflow_federated.python.core.impl.executors import eager_tf_executor
 from tensorflow_federated.python.core.impl.executors import reference_resolving_executor
 from tensorflow_federated.python.core.impl.executors import sizing_executor
+from tensorflow_federated.python.core.impl.types import placement_literals
 
 
 class SizingExecutorTest(parameterized.TestCase):
@@ -236,5 +237,58 @@ class SizingExecutorTest(parameterized.TestCase):
                            [4, tf.int32], [2, tf.bool], [6, tf.int64]])
 
 
+class GetTypeSizeInBytesTest(parameterized.TestCase):
+
+  # pyformat: disable
+  @parameterized.named_parameters(
+      ('scalar', computation_types.TensorType(tf.int32), 4),
+      ('vector', computation_types.TensorType(tf.float64, [10]), 80),
+      ('matrix', computation_types.TensorType(tf.int64, [2, 3]), 48),
+      ('unknown_dim', computation_types.TensorType(tf.int32, [None, 3]), 12),
+      ('unknown_rank', computation_types.TensorType(tf.int32, None), 4),
+      ('struct', computation_types.StructType([
+          ('a', computation_types.TensorType(tf.int32, [4])),
+          ('b', computation_types.StructType([
+              computation_types.TensorType(tf.bool, [2])]))]), 18),
+      ('function', computation_types.FunctionType(tf.int32, tf.int32), 0),
+  )
+  # pyformat: enable
+  def test_returns_size(self, type_spec, expected_size):
+    self.assertEqual(
+        sizing_executor.get_type_size_in_bytes(type_spec), expected_size)
+
+  # pyformat: disable
+  @parameterized.named_parameters(
+      ('clients', computation_types.FederatedType(
+          computation_types.TensorType(tf.int32, [10]),
+          placement_literals.CLIENTS), 400),
+      ('clients_all_equal', computation_types.FederatedType(
+          computation_types.TensorType(tf.int32, [10]),
+          placement_literals.CLIENTS, all_equal=True), 40),
+      ('server', computation_types.FederatedType(
+          computation_types.TensorType(tf.int32, [10]),
+          placement_literals.SERVER), 40),
+      ('struct_of_clients', computation_types.StructType([
+          computation_types.FederatedType(tf.int32, placement_literals.CLIENTS),
+          computation_types.FederatedType(tf.int64, placement_literals.CLIENTS)
+      ]), 120),
+  )
+  # pyformat: enable
+  def test_returns_size_with_cardinalities(self, type_spec, expected_size):
+    cardinalities = {
+        placement_literals.CLIENTS: 10,
+        placement_literals.SERVER: 1,
+    }
+    self.assertEqual(
+        sizing_executor.get_type_size_in_bytes(type_spec, cardinalities),
+        expected_size)
+
+  def test_returns_member_size_of_federated_type_without_cardinalities(self):
+    type_spec = computation_types.FederatedType(
+        computation_types.TensorType(tf.int32, [10]),
+        placement_literals.CLIENTS)
+    self.assertEqual(sizing_executor.get_type_size_in_bytes(type_spec), 40)
+
+
 if __name__ == '__main__':
   absltest.main()
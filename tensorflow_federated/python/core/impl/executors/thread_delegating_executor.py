@@ -15,7 +15,9 @@
 
 import asyncio
 import functools
+import os
 import threading
+import time
 from typing import Optional
 import weakref
 
@@ -34,12 +36,150 @@ def _delegate_with_trace_ctx(coro, event_loop):
       asyncio.run_coroutine_threadsafe(coro_with_trace_ctx, event_loop))
 
 
+def _start_event_loop_thread():
+  """Returns a new event loop running forever in a new daemon thread."""
+  event_loop = asyncio.new_event_loop()
+  event_loop.set_task_factory(tracing.propagate_trace_context_task_factory)
+
+  def run_loop(loop):
+    loop.run_forever()
+    loop.close()
+
+  thread = threading.Thread(
+      target=functools.partial(run_loop, event_loop), daemon=True)
+  thread.start()
+  return event_loop, thread
+
+
+def _stop_event_loop_threads(event_loops, threads):
+  logging.debug('Finalizing, joining threads.')
+  for loop in event_loops:
+    loop.call_soon_threadsafe(loop.stop)
+  for thread in threads:
+    thread.join()
+  logging.debug('Threads joined.')
+
+
+class WorkerPool(object):
+  """A fixed-size pool of threads, each running an event loop.
+
+  `ThreadDelegatingExecutor`s constructed with a `WorkerPool` share its threads,
+  rather than each starting a thread and event loop of its own. Each executor is
+  assigned to the thread with the fewest executors assigned to it, and the work
+  delegated to a thread is started in the order it was submitted.
+
+  The pool tracks the number of delegated coroutines which have been submitted
+  but not yet started (the queue depth), and the time they wait to be started.
+  """
+
+  def __init__(self, num_threads: Optional[int] = None):
+    """Creates a `WorkerPool`.
+
+    Args:
+      num_threads: The number of threads in the pool. Defaults to the number of
+        CPUs.
+
+    Raises:
+      TypeError: If `num_threads` is not an `int`.
+      ValueError: If `num_threads` is not positive.
+    """
+    if num_threads is None:
+      num_threads = os.cpu_count() or 1
+    py_typecheck.check_type(num_threads, int)
+    if num_threads < 1:
+      raise ValueError(
+          'Expected a positive `num_threads`, found {}.'.format(num_threads))
+    self._lock = threading.Lock()
+    self._event_loops = []
+    self._threads = []
+    for _ in range(num_threads):
+      event_loop, thread = _start_event_loop_thread()
+      self._event_loops.append(event_loop)
+      self._threads.append(thread)
+    self._num_assigned_executors = [0] * num_threads
+    self._queue_depth = 0
+    self._max_queue_depth = 0
+    self._num_started = 0
+    self._total_wait_seconds = 0.0
+    self._max_wait_seconds = 0.0
+    weakref.finalize(self, _stop_event_loop_threads, self._event_loops,
+                     self._threads)
+
+  @property
+  def num_threads(self) -> int:
+    return len(self._threads)
+
+  @property
+  def queue_depth(self) -> int:
+    """The number of coroutines submitted to the pool but not yet started."""
+    return self._queue_depth
+
+  @property
+  def max_queue_depth(self) -> int:
+    return self._max_queue_depth
+
+  @property
+  def num_started(self) -> int:
+    return self._num_started
+
+  @property
+  def total_wait_seconds(self) -> float:
+    return self._total_wait_seconds
+
+  @property
+  def max_wait_seconds(self) -> float:
+    return self._max_wait_seconds
+
+  @property
+  def mean_wait_seconds(self) -> float:
+    with self._lock:
+      if not self._num_started:
+        return 0.0
+      return self._total_wait_seconds / self._num_started
+
+  def _assign_event_loop(self):
+    """Returns the index and event loop of the least loaded thread."""
+    with self._lock:
+      index = min(
+          range(len(self._event_loops)),
+          key=lambda i: self._num_assigned_executors[i])
+      self._num_assigned_executors[index] += 1
+    return index, self._event_loops[index]
+
+  def _release_event_loop(self, index):
+    with self._lock:
+      self._num_assigned_executors[index] -= 1
+
+  def _record_start(self, wait_seconds):
+    with self._lock:
+      self._queue_depth -= 1
+      self._num_started += 1
+      self._total_wait_seconds += wait_seconds
+      self._max_wait_seconds = max(self._max_wait_seconds, wait_seconds)
+
+  def _submit(self, coro, event_loop, on_start=None):
+    """Delegates `coro` to `event_loop`, recording the time it waits."""
+    with self._lock:
+      self._queue_depth += 1
+      self._max_queue_depth = max(self._max_queue_depth, self._queue_depth)
+    submit_time = time.monotonic()
+
+    async def _run():
+      wait_seconds = time.monotonic() - submit_time
+      self._record_start(wait_seconds)
+      if on_start is not None:
+        on_start(wait_seconds)
+      return await coro
+
+    return _delegate_with_trace_ctx(_run(), event_loop)
+
+
 class ThreadDelegatingExecutorValue(evb.ExecutorValue):
   """An ExecutorValue which delegates `compute` to an external event loop."""
 
-  def __init__(self, value: evb.ExecutorValue, event_loop):
+  def __init__(self, value: evb.ExecutorValue, executor):
     self._value = value
-    self._event_loop = event_loop
+    self._executor = executor
 
   @property
   def internal_representation(self) -> evb.ExecutorValue:
@@ -50,8 +190,7 @@ class ThreadDelegatingExecutorValue(evb.ExecutorValue):
     return self.internal_representation.type_signature
 
   async def compute(self):
-    return await _delegate_with_trace_ctx(self._value.compute(),
-                                          self._event_loop)
+    return await self._executor._delegate_coro(self._value.compute())  # pylint: disable=protected-access
 
 
 class ThreadDelegatingExecutor(eb.Executor):
@@ -59,38 +198,52 @@ class ThreadDelegatingExecutor(eb.Executor):
 
   This executor only handles threading. It delegates all execution to an
   underlying pool of target executors.
-  """
 
-  # TODO(b/134543154): Upgrade this to a threadpool with multiple workers,
-  # possibly one that could be shared among multiple of these executors.
+  By default, each `ThreadDelegatingExecutor` starts a thread and event loop of
+  its own. If a `WorkerPool` is given, the executor instead delegates its work
+  to one of the threads of the pool, which is shared with other executors.
+  """
 
-  def __init__(self, target_executor: eb.Executor):
+  def __init__(self,
+               target_executor: eb.Executor,
+               worker_pool: Optional[WorkerPool] = None):
     """Creates a concurrent executor backed by a target executor.
 
     Args:
       target_executor: The executor that does all the work.
+      worker_pool: An optional `WorkerPool` whose threads to delegate the work
+        to.
     """
     py_typecheck.check_type(target_executor, eb.Executor)
+    if worker_pool is not None:
+      py_typecheck.check_type(worker_pool, WorkerPool)
     self._target_executor = target_executor
-    self._event_loop = asyncio.new_event_loop()
-    self._event_loop.set_task_factory(
-        tracing.propagate_trace_context_task_factory)
-
-    def run_loop(loop):
-      loop.run_forever()
-      loop.close()
+    self._worker_pool = worker_pool
+    self._lock = threading.Lock()
+    self._num_delegated = 0
+    self._total_wait_seconds = 0.0
+    if worker_pool is not None:
+      index, self._event_loop = worker_pool._assign_event_loop()  # pylint: disable=protected-access
+      weakref.finalize(self, worker_pool._release_event_loop, index)  # pylint: disable=protected-access
+    else:
+      self._event_loop, thread = _start_event_loop_thread()
+      weakref.finalize(self, _stop_event_loop_threads, [self._event_loop],
+                       [thread])
 
-    self._thread = threading.Thread(
-        target=functools.partial(run_loop, self._event_loop), daemon=True)
-    self._thread.start()
+  @property
+  def num_delegated(self) -> int:
+    """The number of coroutines delegated to a `WorkerPool` and started."""
+    return self._num_delegated
 
-    def finalizer(loop, thread):
-      logging.debug('Finalizing, joining thread.')
-      loop.call_soon_threadsafe(loop.stop)
-      thread.join()
-      logging.debug('Thread joined.')
+  @property
+  def total_wait_seconds(self) -> float:
+    """The total time coroutines delegated to a `WorkerPool` waited to start."""
+    return self._total_wait_seconds
 
-    weakref.finalize(self, finalizer, self._event_loop, self._thread)
+  def _record_start(self, wait_seconds):
+    with self._lock:
+      self._num_delegated += 1
+      self._total_wait_seconds += wait_seconds
 
   def close(self):
     # Close does not clean up the event loop or thread.
@@ -100,10 +253,17 @@ class ThreadDelegatingExecutor(eb.Executor):
     # loops"). See the closed bug b/148288711 for more information.
     self._target_executor.close()
 
+  def _delegate_coro(self, coro):
+    """Returns an awaitable running `coro` on the event loop."""
+    if self._worker_pool is not None:
+      return self._worker_pool._submit(  # pylint: disable=protected-access
+          coro, self._event_loop, on_start=self._record_start)
+    return _delegate_with_trace_ctx(coro, self._event_loop)
+
   async def _delegate(self, coro):
     """Runs a coroutine which returns an executor value on the event loop."""
-    result_value = await _delegate_with_trace_ctx(coro, self._event_loop)
-    return ThreadDelegatingExecutorValue(result_value, self._event_loop)
+    result_value = await self._delegate_coro(coro)
+    return ThreadDelegatingExecutorValue(result_value, self)
 
   @tracing.trace
   async def create_value(self, value, type_spec=None) -> evb.ExecutorValue:
@@ -207,5 +207,49 @@ class ThreadDelegatingExecutorTest(absltest.TestCase):
     self.assertEqual(result, 9)
 
 
+class WorkerPoolTest(absltest.TestCase):
+
+  def test_raises_with_nonpositive_num_threads(self):
+    with self.assertRaises(ValueError):
+      thread_delegating_executor.WorkerPool(num_threads=0)
+
+  def test_executors_are_assigned_to_least_loaded_threads(self):
+    worker_pool = thread_delegating_executor.WorkerPool(num_threads=2)
+    executors = [
+        thread_delegating_executor.ThreadDelegatingExecutor(
+            eager_tf_executor.EagerTFExecutor(), worker_pool=worker_pool)
+        for _ in range(4)
+    ]
+    event_loops = [ex._event_loop for ex in executors]
+    self.assertLen(set(event_loops), 2)
+    self.assertEqual(event_loops.count(event_loops[0]), 2)
+
+  def test_end_to_end_with_shared_worker_pool(self):
+
+    @computations.tf_computation(tf.int32)
+    def add_one(x):
+      return tf.add(x, 1)
+
+    worker_pool = thread_delegating_executor.WorkerPool(num_threads=2)
+    executors = [
+        thread_delegating_executor.ThreadDelegatingExecutor(
+            eager_tf_executor.EagerTFExecutor(), worker_pool=worker_pool)
+        for _ in range(10)
+    ]
+
+    for i, ex in enumerate(executors):
+      self.assertEqual(_invoke(ex, add_one, i), i + 1)
+
+    self.assertEqual(worker_pool.queue_depth, 0)
+    # `create_value` twice, `create_call` and `compute` for each executor.
+    self.assertEqual(worker_pool.num_started, 40)
+    self.assertGreaterEqual(worker_pool.max_queue_depth, 1)
+    self.assertGreaterEqual(worker_pool.total_wait_seconds, 0.0)
+    for ex in executors:
+      self.assertEqual(ex.num_delegated, 4)
+      self.assertLessEqual(ex.total_wait_seconds,
+                           worker_pool.total_wait_seconds)
+
+
 if __name__ == '__main__':
   absltest.main()
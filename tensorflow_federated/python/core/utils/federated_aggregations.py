@@ -24,6 +24,7 @@ from tensorflow_federated.python.core.api import computations
 from tensorflow_federated.python.core.api import intrinsics
 from tensorflow_federated.python.core.api import placements
 from tensorflow_federated.python.core.api import value_base
+from tensorflow_federated.python.core.impl import computation_impl
 
 
 def _validate_value_on_clients(value):
@@ -49,9 +50,9 @@ def _federated_reduce_with_func(value, tf_func, zeros):
   Args:
     value: A `tff.Value` placed on the `tff.CLIENTS`, that is a `tf.int32` or
       `tf.float32`.
-    tf_func: A function to be applied to the accumulated values. Must be a
-      binary operation where both parameters are of type `U` and the return type
-      is also `U`.
+    tf_func: A function to be applied to the accumulated values. Must be an
+      associative binary operation where both parameters are of type `U` and the
+      return type is also `U`.
     zeros: The zero of the same type as `value` in the algebra of reduction
       operators.
 
@@ -72,6 +73,10 @@ def _federated_reduce_with_func(value, tf_func, zeros):
   def report(value):
     return value
 
+  # Note: `tf_func` is applied pointwise, so `accumulate` and `merge` are
+  # associative whenever `tf_func` is (as are `tf.minimum` and `tf.maximum`).
+  accumulate = computation_impl.mark_associative(accumulate)
+  merge = computation_impl.mark_associative(merge)
   return intrinsics.federated_aggregate(value, zeros, accumulate, merge, report)
 
 